@@ -27,6 +27,8 @@ except ImportError:
 
 from transformers import pipeline
 
+from ai_detector import MAX_TOKENS, MIN_CHUNK_CHARS, char_chunks, token_chunks
+
 
 class AIDetector:
     """Wrapper for AI detection using best available model."""
@@ -68,12 +70,10 @@ class AIDetector:
             return ai_prob
         else:
             # RoBERTa detector - process in chunks
-            chunks = self._chunk_text(text, 400)
+            chunks = [c for c in self._chunk_text(text, 400)
+                      if len(c.strip()) >= MIN_CHUNK_CHARS]
             scores = []
-            for chunk in chunks:
-                if len(chunk.strip()) < 50:
-                    continue
-                result = self.detector(chunk)[0]
+            for result in (self.detector(chunks, truncation=True) if chunks else []):
                 if result['label'] == 'LABEL_0':
                     scores.append(1 - result['score'])
                 else:
@@ -81,22 +81,12 @@ class AIDetector:
             return sum(scores) / len(scores) if scores else 0.5
 
     def _chunk_text(self, text: str, max_len: int) -> List[str]:
-        words = text.split()
-        chunks = []
-        current = []
-        length = 0
-        for word in words:
-            if length + len(word) > max_len:
-                if current:
-                    chunks.append(' '.join(current))
-                current = [word]
-                length = len(word)
-            else:
-                current.append(word)
-                length += len(word) + 1
-        if current:
-            chunks.append(' '.join(current))
-        return chunks
+        """Full token windows via the fast tokenizer; max_len characters otherwise."""
+        tokenizer = self.detector.tokenizer
+        if getattr(tokenizer, 'is_fast', False):
+            max_tokens = min(MAX_TOKENS, tokenizer.model_max_length)
+            return [c.text for c in token_chunks(text, tokenizer, max_tokens)]
+        return [c.text for c in char_chunks(text, max_len)]
 
 
 # More aggressive word replacements
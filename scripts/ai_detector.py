@@ -7,144 +7,441 @@ which is trained to distinguish GPT-2 generated text from human text.
 
 Note: This detector was trained on GPT-2 outputs and may be less accurate
 on newer models like GPT-4 or Claude. For research purposes only.
+
+DetectorService loads the model once, scores chunks in batches and
+memoizes each chunk's score by its hash, so scanning many files (or
+re-scanning a draft after small edits) only runs the model on chunks it
+has not seen. Pass --cache to keep those scores between runs.
+
+Text is split into paragraphs (blank-line separated; one too short to
+classify, such as a heading, is joined to the paragraph after it), and a
+paragraph is only split further, with the model's fast tokenizer into
+512-token windows (optionally overlapping, see --overlap), when it does
+not fit in one. Chunk boundaries therefore depend only on each
+paragraph's own text, so editing one paragraph changes only that
+paragraph's chunks and re-scanning the draft re-scores just those;
+--self-check verifies this. Each chunk keeps its character span in the
+source so scores can be mapped back to the text they came from.
+
+Usage:
+    python ai_detector.py draft.md
+    python ai_detector.py ../drafts --cache ../output/ai_detector_cache.json
+    python ai_detector.py --self-check
 """
 
 import argparse
+import hashlib
+import json
+import re
 import sys
+from dataclasses import dataclass
 from pathlib import Path
-from transformers import pipeline, AutoModelForSequenceClassification, AutoTokenizer
+from typing import Callable, Dict, List, Optional, Tuple
+from transformers import pipeline, AutoTokenizer
 import torch
 
+from atomic_write import write_atomic
+
+
+DEFAULT_MODEL = "roberta-base-openai-detector"
+
+# Chunks shorter than this are skipped as too short to classify
+MIN_CHUNK_CHARS = 50
+
+# Model context window, including the special tokens the pipeline adds
+MAX_TOKENS = 512
+
+# Character budget per chunk when no fast tokenizer is available
+FALLBACK_CHUNK_CHARS = 400
+
+# File types scanned when a directory is given on the command line
+SCAN_SUFFIXES = ('.md', '.txt', '.tex')
+
+PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n')
+
+
+@dataclass
+class Chunk:
+    text: str
+    start: int                   # Character offsets of text in the source
+    end: int
+
+
+def paragraphs(text: str, min_chars: int = MIN_CHUNK_CHARS) -> List[Tuple[int, int]]:
+    """
+    Character spans of text's blank-line separated paragraphs, trimmed of
+    surrounding whitespace. A paragraph shorter than min_chars is joined to
+    the one after it, so headings are scored with the text they introduce.
+    """
+    spans, pos = [], 0
+    for brk in list(PARAGRAPH_BREAK.finditer(text)) + [None]:
+        stop = brk.start() if brk else len(text)
+        block = text[pos:stop]
+        if block.strip():
+            start = pos + len(block) - len(block.lstrip())
+            spans.append((start, pos + len(block.rstrip())))
+        if brk:
+            pos = brk.end()
+
+    units, pending = [], None
+    for start, end in spans:
+        start = start if pending is None else pending
+        pending = start if len(text[start:end]) < min_chars else None
+        if pending is None:
+            units.append((start, end))
+    if pending is not None:
+        units.append((pending, spans[-1][1]))
+    return units
+
+
+def _pack_words(text: str, lo: int, hi: int, max_length: int) -> List[Chunk]:
+    """Chunks of at most max_length characters from text[lo:hi], split on whitespace."""
+    chunks = []
+    start = end = None
+    for word in re.compile(r'\S+').finditer(text, lo, hi):
+        if start is not None and word.end() - start > max_length:
+            chunks.append(Chunk(text[start:end], start, end))
+            start = None
+        if start is None:
+            start = word.start()
+        end = word.end()
+    if start is not None:
+        chunks.append(Chunk(text[start:end], start, end))
+    return chunks
+
+
+def char_chunks(text: str, max_length: int = 500) -> List[Chunk]:
+    """
+    One chunk per paragraph; a paragraph longer than max_length characters
+    is split on whitespace into chunks of at most max_length.
+    """
+    return [chunk for lo, hi in paragraphs(text) for chunk in _pack_words(text, lo, hi, max_length)]
+
 
 def chunk_text(text: str, max_length: int = 500) -> list:
     """Split text into chunks that fit the model's context window."""
-    words = text.split()
-    chunks = []
-    current_chunk = []
-    current_length = 0
-
-    for word in words:
-        if current_length + len(word) + 1 > max_length:
-            if current_chunk:
-                chunks.append(' '.join(current_chunk))
-            current_chunk = [word]
-            current_length = len(word)
-        else:
-            current_chunk.append(word)
-            current_length += len(word) + 1
+    return [chunk.text for chunk in char_chunks(text, max_length)]
 
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
 
+def token_chunks(text: str, tokenizer, max_tokens: int = MAX_TOKENS,
+                 overlap: int = 0) -> List[Chunk]:
+    """
+    One chunk per paragraph, using a fast tokenizer to split any paragraph
+    longer than max_tokens tokens into windows.
+
+    Room is left for the special tokens the model adds, so every window of
+    a split paragraph but its last is packed full. Consecutive windows of a
+    paragraph share overlap tokens. Each paragraph is tokenized on its own,
+    so its windows do not depend on the text around it.
+    """
+    window = max_tokens - tokenizer.num_special_tokens_to_add()
+    if not 0 <= overlap < window:
+        raise ValueError(f"overlap must be in [0, {window}), got {overlap}")
+
+    units = paragraphs(text)
+    if not units:
+        return []
+    encoding = tokenizer([text[lo:hi] for lo, hi in units], add_special_tokens=False,
+                         return_offsets_mapping=True)
+
+    chunks = []
+    for (lo, hi), mapping in zip(units, encoding['offset_mapping']):
+        offsets = [(lo + s, lo + e) for s, e in mapping if e > s]
+        if len(offsets) <= window:
+            chunks.append(Chunk(text[lo:hi], lo, hi))
+            continue
+        for first in range(0, len(offsets), window - overlap):
+            start, end = offsets[first][0], offsets[min(first + window, len(offsets)) - 1][1]
+            chunks.append(Chunk(text[start:end], start, end))
+            if first + window >= len(offsets):
+                break
     return chunks
 
 
-def detect_ai_text(text: str, model_name: str = "roberta-base-openai-detector") -> dict:
+def check_edit_locality(chunker: Callable[[str], List[Chunk]] = char_chunks) -> bool:
+    """
+    Check that editing one paragraph of a draft changes only that
+    paragraph's chunks, i.e. that a re-scan re-scores only what changed.
     """
-    Detect if text is AI-generated.
+    sentence = "Measured inflation depends on which prices are sampled and how they are weighted. "
+    draft = [f"## Section {i}\n\n" + sentence * (3 + 5 * (i % 3)) for i in range(12)]
+    edited = list(draft)
+    edited[2] = draft[2].replace("sampled", "sampled each month", 1)
+
+    before = {c.text for c in chunker('\n\n'.join(draft))}
+    after = [c.text for c in chunker('\n\n'.join(edited))]
+    rescored = [c for c in after if c not in before]
+    return bool(rescored) and all(c in edited[2] for c in rescored)
 
-    Returns dict with:
-        - ai_score: probability text is AI-generated (0-1)
-        - human_score: probability text is human-written (0-1)
-        - label: "AI" or "Human"
-        - chunk_scores: individual scores for each chunk
+
+class DetectorService:
     """
-    print(f"Loading model {model_name}...")
-
-    # Load the detector
-    try:
-        classifier = pipeline(
-            "text-classification",
-            model=f"openai-community/{model_name}",
-            device=0 if torch.cuda.is_available() else -1
-        )
-    except Exception:
-        # Fallback to CPU
-        classifier = pipeline(
-            "text-classification",
-            model=f"openai-community/{model_name}",
-            device=-1
-        )
-
-    # Process in chunks
-    chunks = chunk_text(text, max_length=400)
-    print(f"Processing {len(chunks)} chunks...")
-
-    chunk_scores = []
-    for i, chunk in enumerate(chunks):
-        if len(chunk.strip()) < 50:  # Skip very short chunks
-            continue
-        result = classifier(chunk)[0]
+    RoBERTa detector loaded once, with batched inference and per-chunk memo.
+
+    Scores are AI probabilities (0-1) keyed by the SHA-256 of the chunk
+    text. With cache_path set, the memo is loaded from and saved to a JSON
+    file so later runs skip chunks scored before.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, batch_size: int = 16,
+                 cache_path: Optional[str] = None, overlap: int = 0):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.overlap = overlap
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._classifier = None
+        self._tokenizer = None
+        self.scores: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_path and self.cache_path.exists():
+            try:
+                cached = json.loads(self.cache_path.read_text())
+                self.scores = cached.get(model_name, {})
+            except (OSError, json.JSONDecodeError):
+                pass  # Unreadable cache: start empty
+
+    @property
+    def classifier(self):
+        """The transformers pipeline, loaded on first use."""
+        if self._classifier is None:
+            print(f"Loading model {self.model_name}...")
+            try:
+                self._classifier = pipeline(
+                    "text-classification",
+                    model=f"openai-community/{self.model_name}",
+                    device=0 if torch.cuda.is_available() else -1
+                )
+            except Exception:
+                # Fallback to CPU
+                self._classifier = pipeline(
+                    "text-classification",
+                    model=f"openai-community/{self.model_name}",
+                    device=-1
+                )
+        return self._classifier
+
+    @property
+    def tokenizer(self):
+        """
+        The model's tokenizer, loaded on first use.
+
+        Loaded separately from the pipeline so chunking a fully cached
+        draft does not load the model weights.
+        """
+        if self._tokenizer is None:
+            if self._classifier is not None:
+                self._tokenizer = self._classifier.tokenizer
+            else:
+                self._tokenizer = AutoTokenizer.from_pretrained(
+                    f"openai-community/{self.model_name}", use_fast=True)
+        return self._tokenizer
+
+    def chunk(self, text: str) -> List[Chunk]:
+        """Token windows of text, or character chunks without a fast tokenizer."""
+        if getattr(self.tokenizer, 'is_fast', False):
+            max_tokens = min(MAX_TOKENS, self.tokenizer.model_max_length)
+            return token_chunks(text, self.tokenizer, max_tokens, self.overlap)
+        return char_chunks(text, FALLBACK_CHUNK_CHARS)
+
+    @staticmethod
+    def chunk_key(chunk: str) -> str:
+        return hashlib.sha256(chunk.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _ai_probability(result: dict) -> float:
         # The model outputs "LABEL_0" for Real/Human and "LABEL_1" for Fake/AI
         if result['label'] == 'LABEL_0':  # Human/Real
-            score = 1 - result['score']  # Convert to AI probability
-        else:  # AI/Fake
-            score = result['score']
-        chunk_scores.append(score)
+            return 1 - result['score']  # Convert to AI probability
+        return result['score']  # AI/Fake
+
+    def score_chunks(self, chunks: List[str]) -> List[float]:
+        """AI probability of each chunk, running the model only on unseen chunks."""
+        keys = [self.chunk_key(c) for c in chunks]
+        pending = {}
+        for key, chunk in zip(keys, chunks):
+            if key not in self.scores:
+                pending.setdefault(key, chunk)
+        self.hits += len(chunks) - len(pending)
+        self.misses += len(pending)
+
+        if pending:
+            todo = list(pending.items())
+            for start in range(0, len(todo), self.batch_size):
+                batch = todo[start:start + self.batch_size]
+                results = self.classifier([chunk for _, chunk in batch],
+                                          batch_size=self.batch_size, truncation=True)
+                for (key, _), result in zip(batch, results):
+                    self.scores[key] = self._ai_probability(result)
+                if len(todo) > self.batch_size:
+                    done = min(start + self.batch_size, len(todo))
+                    print(f"  Scored {done}/{len(todo)} new chunks...")
 
-        if (i + 1) % 10 == 0:
-            print(f"  Processed {i+1}/{len(chunks)} chunks...")
+        return [self.scores[key] for key in keys]
+
+    def detect(self, text: str) -> dict:
+        """
+        Detect if text is AI-generated.
+
+        Returns dict with:
+            - ai_score: probability text is AI-generated (0-1)
+            - human_score: probability text is human-written (0-1)
+            - label: "AI" or "Human"
+            - chunk_scores: individual scores for each chunk
+            - chunk_spans: (start, end) character offsets of each chunk
+        """
+        # Process in chunks, skipping very short ones
+        chunks = [c for c in self.chunk(text) if len(c.text.strip()) >= MIN_CHUNK_CHARS]
+        print(f"Processing {len(chunks)} chunks...")
+
+        chunk_scores = self.score_chunks([c.text for c in chunks])
+
+        if not chunk_scores:
+            return {
+                'ai_score': 0.5,
+                'human_score': 0.5,
+                'label': 'Unknown',
+                'chunk_scores': [],
+                'chunk_spans': [],
+                'num_chunks': 0
+            }
+
+        # Average across chunks
+        avg_ai_score = sum(chunk_scores) / len(chunk_scores)
 
-    if not chunk_scores:
         return {
-            'ai_score': 0.5,
-            'human_score': 0.5,
-            'label': 'Unknown',
-            'chunk_scores': []
+            'ai_score': avg_ai_score,
+            'human_score': 1 - avg_ai_score,
+            'label': 'AI' if avg_ai_score > 0.5 else 'Human',
+            'chunk_scores': chunk_scores,
+            'chunk_spans': [(c.start, c.end) for c in chunks],
+            'num_chunks': len(chunk_scores)
         }
 
-    # Average across chunks
-    avg_ai_score = sum(chunk_scores) / len(chunk_scores)
+    def save(self):
+        """Write the score memo to cache_path (merged with other models' scores)."""
+        if not self.cache_path:
+            return
+        cached = {}
+        if self.cache_path.exists():
+            try:
+                cached = json.loads(self.cache_path.read_text())
+            except (OSError, json.JSONDecodeError):
+                cached = {}
+        cached[self.model_name] = self.scores
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.cache_path, json.dumps(cached))
+
 
-    return {
-        'ai_score': avg_ai_score,
-        'human_score': 1 - avg_ai_score,
-        'label': 'AI' if avg_ai_score > 0.5 else 'Human',
-        'chunk_scores': chunk_scores,
-        'num_chunks': len(chunk_scores)
-    }
+# One service per model, shared by every detect_ai_text() call in the process
+_services: Dict[str, DetectorService] = {}
+
+
+def get_detector(model_name: str = DEFAULT_MODEL) -> DetectorService:
+    if model_name not in _services:
+        _services[model_name] = DetectorService(model_name)
+    return _services[model_name]
+
+
+def detect_ai_text(text: str, model_name: str = DEFAULT_MODEL) -> dict:
+    """
+    Detect if text is AI-generated (see DetectorService.detect).
+
+    The model is loaded on the first call and reused afterwards.
+    """
+    return get_detector(model_name).detect(text)
+
+
+def input_files(paths: List[str]) -> List[Path]:
+    """Expand directories into the text files they contain."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob('*') if p.suffix in SCAN_SUFFIXES))
+        else:
+            files.append(path)
+    return files
+
+
+def print_result(result: dict, verbose: bool = False):
+    print(f"\n{'='*50}")
+    print(f"AI Detection Results")
+    print(f"{'='*50}")
+    print(f"Overall AI Score: {result['ai_score']:.1%}")
+    print(f"Overall Human Score: {result['human_score']:.1%}")
+    print(f"Classification: {result['label']}")
+    print(f"Chunks analyzed: {result['num_chunks']}")
+
+    if verbose and result['chunk_scores']:
+        print(f"\nChunk scores (AI probability):")
+        for i, (score, (start, end)) in enumerate(zip(result['chunk_scores'],
+                                                      result['chunk_spans'])):
+            bar = '█' * int(score * 20) + '░' * (20 - int(score * 20))
+            print(f"  Chunk {i+1:3d} [chars {start}-{end}]: {score:.1%} {bar}")
 
 
 def main():
     parser = argparse.ArgumentParser(
         description='Detect AI-generated text using RoBERTa-based detector.'
     )
-    parser.add_argument('input', help='Input file path')
-    parser.add_argument('--model', default='roberta-base-openai-detector',
-                        help='Model name (default: roberta-base-openai-detector)')
+    parser.add_argument('input', nargs='*',
+                        help='Input file path(s); directories are scanned for .md/.txt/.tex files')
+    parser.add_argument('--model', default=DEFAULT_MODEL,
+                        help=f'Model name (default: {DEFAULT_MODEL})')
+    parser.add_argument('--batch-size', type=int, default=16,
+                        help='Chunks per inference batch (default: 16)')
+    parser.add_argument('--overlap', type=int, default=0,
+                        help='Tokens shared by consecutive chunks (default: 0)')
+    parser.add_argument('--cache', metavar='PATH',
+                        help='JSON file to load/save chunk scores across runs')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Show detailed chunk scores')
+    parser.add_argument('--self-check', action='store_true',
+                        help='Check that editing one paragraph re-scores only its chunks, then exit')
 
     args = parser.parse_args()
 
+    if args.self_check:
+        service = DetectorService(args.model, overlap=args.overlap)
+        ok = check_edit_locality(service.chunk)
+        print(f"Edit locality: {'ok' if ok else 'FAILED'}")
+        sys.exit(0 if ok else 1)
+    if not args.input:
+        parser.error('at least one input path is required')
+
     # Read input
-    input_path = Path(args.input)
-    if not input_path.exists():
-        print(f"Error: File not found: {args.input}", file=sys.stderr)
+    files = input_files(args.input)
+    missing = [f for f in files if not f.exists()]
+    if missing:
+        print(f"Error: File not found: {missing[0]}", file=sys.stderr)
         sys.exit(1)
 
-    text = input_path.read_text()
+    service = DetectorService(args.model, batch_size=args.batch_size,
+                              cache_path=args.cache, overlap=args.overlap)
 
     # Detect
-    result = detect_ai_text(text, args.model)
+    results = {}
+    for path in files:
+        if len(files) > 1:
+            print(f"\n{path}")
+        results[path] = service.detect(path.read_text())
+    service.save()
 
     # Output
-    print(f"\n{'='*50}")
-    print(f"AI Detection Results")
-    print(f"{'='*50}")
-    print(f"Overall AI Score: {result['ai_score']:.1%}")
-    print(f"Overall Human Score: {result['human_score']:.1%}")
-    print(f"Classification: {result['label']}")
-    print(f"Chunks analyzed: {result['num_chunks']}")
-
-    if args.verbose and result['chunk_scores']:
-        print(f"\nChunk scores (AI probability):")
-        for i, score in enumerate(result['chunk_scores']):
-            bar = '█' * int(score * 20) + '░' * (20 - int(score * 20))
-            print(f"  Chunk {i+1:3d}: {score:.1%} {bar}")
+    if len(files) == 1:
+        result = results[files[0]]
+        print_result(result, args.verbose)
+        # Return score for programmatic use
+        return result['ai_score']
 
-    # Return score for programmatic use
-    return result['ai_score']
+    print(f"\n{'='*60}")
+    print(f"{'File':<40} {'AI Score':>9} {'Chunks':>7}  Label")
+    print(f"{'='*60}")
+    for path, result in results.items():
+        print(f"{str(path):<40} {result['ai_score']:>9.1%} {result['num_chunks']:>7}  {result['label']}")
+    print(f"\nChunks scored: {service.misses} new, {service.hits} cached")
+    return {str(path): result['ai_score'] for path, result in results.items()}
 
 
 if __name__ == '__main__':
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Atomic file replacement for the caches, manifests and stores.
+
+Readers of a cache or manifest must never see it half-written, and two
+processes (e.g. pool workers, or a build run while another is saving)
+must not write into the same temporary file. write_atomic() writes the
+new contents to <name>.<pid>.tmp next to the target, on the same
+filesystem, and renames it over the target with os.replace, which is
+atomic on POSIX and Windows.
+
+Usage:
+    write_atomic('figures/.figure_cache.json', json.dumps(manifest))
+    write_atomic(state_path, pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+"""
+
+import os
+from pathlib import Path
+from typing import Union
+
+
+def write_atomic(path: Union[str, Path], data: Union[str, bytes]):
+    """Replace path with data (text is written without newline translation)."""
+    path = Path(path)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    if isinstance(data, bytes):
+        tmp.write_bytes(data)
+    else:
+        with open(tmp, 'w', newline='') as f:
+            f.write(data)
+    os.replace(tmp, path)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Indexed, cached store of the entries in references.bib.
+
+Parsing a .bib is cheap for the 60 entries this paper cites but not for
+bibliographies with tens of thousands, and several scripts need the same
+lookups. BibStore parses the file once into BibEntry records and three
+indexes:
+
+    by key              - store[key]
+    by surname and year - store.find('Cavallo', '2016')
+    by title token      - store.search_title('billion prices')
+
+The parsed store is pickled next to the .bib (references.bib.pickle) with
+the hash of the file it was built from; BibStore.load() reuses the pickle
+until the .bib changes.
+
+Usage:
+    python bibtex_store.py                          # summary of references.bib
+    python bibtex_store.py --find Cavallo 2016
+    python bibtex_store.py --unused inflation_final_humanized.tex
+"""
+
+import argparse
+import hashlib
+import pickle
+import re
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+from atomic_write import write_atomic
+
+
+# Pickled stores written under another version (e.g. before a BibEntry change) are re-parsed
+CACHE_VERSION = 1
+
+BIB_PATH = 'references.bib'
+TEX_PATH = 'inflation_final_humanized.tex'
+
+ENTRY_START = re.compile(r'@(\w+)\s*\{\s*([^,\s]+)\s*,')
+FIELD_START = re.compile(r'\s*,?\s*(\w+)\s*=\s*')
+BARE_VALUE = re.compile(r'[^,}\s]+')
+TITLE_TOKEN = re.compile(r'\w+')
+CITE_COMMAND = re.compile(r'\\(?:no)?cite[a-zA-Z]*\*?(?:\[[^\]]*\]){0,2}\{([^}]*)\}')
+
+# LaTeX accent commands -> Unicode combining marks / letters
+ACCENT_MARKS = {"'": '\u0301', '`': '\u0300', '^': '\u0302', '"': '\u0308',
+                '~': '\u0303', '=': '\u0304', '.': '\u0307', 'c': '\u0327',
+                'v': '\u030c', 'u': '\u0306', 'H': '\u030b'}
+ACCENT_LETTERS = {'aa': 'å', 'AA': 'Å', 'o': 'ø', 'O': 'Ø', 'ss': 'ß',
+                  'ae': 'æ', 'AE': 'Æ', 'oe': 'œ', 'OE': 'Œ', 'l': 'ł', 'L': 'Ł'}
+ACCENT_MARK = re.compile(r'''\\(['`^"~=.]|[cvuH](?=[\s{]))\s*\{?([A-Za-z])\}?''')
+ACCENT_LETTER = re.compile(r'\\(aa|AA|ss|ae|AE|oe|OE|o|O|l|L)(?![A-Za-z])\s*')
+
+
+# =============================================================================
+# Parsing
+# =============================================================================
+
+def _read_value(text: str, pos: int) -> Tuple[str, int]:
+    """Read a braced, quoted or bare field value starting at pos."""
+    if text[pos] == '{':
+        depth, start = 0, pos
+        while pos < len(text):
+            if text[pos] == '{':
+                depth += 1
+            elif text[pos] == '}':
+                depth -= 1
+                if depth == 0:
+                    return text[start + 1:pos], pos + 1
+            pos += 1
+        raise ValueError(f"Unbalanced braces in field starting at offset {start}")
+    if text[pos] == '"':
+        end = text.index('"', pos + 1)
+        return text[pos + 1:end], end + 1
+    match = BARE_VALUE.match(text, pos)
+    return match.group(0), match.end()
+
+
+def read_bib_entries(text: str) -> Dict[str, Dict[str, str]]:
+    """Parse .bib source into {key: {field: raw value, 'ENTRYTYPE': type}}."""
+    entries = {}
+    for match in ENTRY_START.finditer(text):
+        fields = {'ENTRYTYPE': match.group(1).lower()}
+        pos = match.end()
+        while True:
+            field = FIELD_START.match(text, pos)
+            if not field:
+                break
+            value, pos = _read_value(text, field.end())
+            fields[field.group(1).lower()] = value
+        entries[match.group(2)] = fields
+    return entries
+
+
+def delatex(text: str) -> str:
+    """Turn LaTeX accents into Unicode and drop grouping braces."""
+    text = ACCENT_LETTER.sub(lambda m: ACCENT_LETTERS[m.group(1)], text)
+    text = ACCENT_MARK.sub(lambda m: m.group(2) + ACCENT_MARKS[m.group(1)], text)
+    text = text.replace('\\&', '&').replace('{', '').replace('}', '')
+    return unicodedata.normalize('NFC', text)
+
+
+def ascii_fold(text: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def canonical_name(name: str) -> str:
+    """Lookup form of a surname: accents stripped, lower case."""
+    return ascii_fold(name).lower()
+
+
+def split_authors(field: str) -> List[str]:
+    """Split a BibTeX author field on top-level ' and '."""
+    authors, depth, start = [], 0, 0
+    for match in re.finditer(r'[{}]|\s+and\s+', field):
+        token = match.group(0)
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+        elif depth == 0:
+            authors.append(field[start:match.start()])
+            start = match.end()
+    authors.append(field[start:])
+    return [a.strip() for a in authors if a.strip()]
+
+
+def surname(author: str) -> str:
+    """Surname of one BibTeX name ('Last, First', 'First Last' or '{Corporate}')."""
+    author = author.strip()
+    if author.startswith('{') and author.endswith('}'):
+        return delatex(author)
+    if ',' in author:
+        return delatex(author.split(',', 1)[0]).strip()
+    return delatex(author).split()[-1]
+
+
+def cited_keys(tex: str) -> Set[str]:
+    """Keys referenced by \\cite-family commands in LaTeX source."""
+    keys = set()
+    for match in CITE_COMMAND.finditer(tex):
+        keys.update(k.strip() for k in match.group(1).split(',') if k.strip())
+    return keys
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+@dataclass
+class BibEntry:
+    key: str
+    entry_type: str
+    fields: Dict[str, str]       # Raw field values as written in the .bib
+    surnames: Tuple[str, ...]    # Author surnames, accents resolved
+    others: bool                 # Author list ends in 'and others'
+    year: str
+    title: str
+
+    @classmethod
+    def from_fields(cls, key: str, fields: Dict[str, str]) -> 'BibEntry':
+        names = split_authors(fields.get('author', ''))
+        others = bool(names) and names[-1] == 'others'
+        return cls(key=key,
+                   entry_type=fields['ENTRYTYPE'],
+                   fields=fields,
+                   surnames=tuple(surname(n) for n in names if n != 'others'),
+                   others=others,
+                   year=delatex(fields.get('year', '')).strip(),
+                   title=delatex(fields.get('title', '')).strip())
+
+
+class BibStore:
+    """BibTeX entries indexed by key, by (surname, year) and by title token."""
+
+    def __init__(self, entries: Iterable[BibEntry], source_hash: str = ''):
+        self.source_hash = source_hash
+        self.entries: Dict[str, BibEntry] = {}
+        self.by_author_year: Dict[Tuple[str, str], List[str]] = {}
+        self.by_title_token: Dict[str, Set[str]] = {}
+
+        for entry in entries:
+            self.entries[entry.key] = entry
+            for name in set(map(canonical_name, entry.surnames)):
+                self.by_author_year.setdefault((name, entry.year), []).append(entry.key)
+                self.by_author_year.setdefault((name, ''), []).append(entry.key)
+            for token in self._title_tokens(entry.title):
+                self.by_title_token.setdefault(token, set()).add(entry.key)
+
+    @staticmethod
+    def _title_tokens(title: str) -> Set[str]:
+        return {canonical_name(t) for t in TITLE_TOKEN.findall(title)}
+
+    @classmethod
+    def parse(cls, text: str, source_hash: str = '') -> 'BibStore':
+        return cls((BibEntry.from_fields(key, fields)
+                    for key, fields in read_bib_entries(text).items()), source_hash)
+
+    @classmethod
+    def load(cls, path: str = BIB_PATH, cache: bool = True) -> 'BibStore':
+        """
+        Load path, reusing its pickle if it was built from the same bytes.
+
+        The pickle is rewritten whenever the .bib has changed.
+        """
+        data = Path(path).read_bytes()
+        source_hash = hashlib.sha256(data).hexdigest()
+        cache_path = Path(f'{path}.pickle')
+
+        if cache and cache_path.exists():
+            try:
+                with open(cache_path, 'rb') as f:
+                    version, cached_hash, store = pickle.load(f)
+                if version == CACHE_VERSION and cached_hash == source_hash:
+                    return store
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError,
+                    AttributeError, ImportError):
+                pass  # Unreadable or stale pickle: rebuild below
+
+        store = cls.parse(data.decode('utf-8'), source_hash)
+        if cache:
+            write_atomic(cache_path, pickle.dumps((CACHE_VERSION, source_hash, store),
+                                                  protocol=pickle.HIGHEST_PROTOCOL))
+        return store
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __getitem__(self, key: str) -> BibEntry:
+        return self.entries[key]
+
+    def __iter__(self):
+        return iter(self.entries.values())
+
+    def find(self, name: str, year: str = '') -> List[BibEntry]:
+        """Entries with an author of this surname (and year, if given)."""
+        keys = self.by_author_year.get((canonical_name(name), year), [])
+        return [self.entries[k] for k in keys]
+
+    def search_title(self, words: str) -> List[BibEntry]:
+        """Entries whose title contains every word in words."""
+        tokens = self._title_tokens(words)
+        if not tokens:
+            return []
+        keys = set.intersection(*(self.by_title_token.get(t, set()) for t in tokens))
+        return [self.entries[k] for k in sorted(keys)]
+
+    def unused(self, keys: Iterable[str]) -> List[str]:
+        """Entries not among keys (e.g. the keys a document cites)."""
+        cited = set(keys)
+        return [k for k in self.entries if k not in cited]
+
+    def missing(self, keys: Iterable[str]) -> List[str]:
+        """Keys that have no entry in the store."""
+        return sorted(k for k in set(keys) if k not in self.entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the indexed references.bib.')
+    parser.add_argument('--bib', default=BIB_PATH, help=f'BibTeX file (default: {BIB_PATH})')
+    parser.add_argument('--find', nargs='+', metavar=('SURNAME', 'YEAR'),
+                        help='List entries by author surname and optional year')
+    parser.add_argument('--title', help='List entries whose title contains these words')
+    parser.add_argument('--unused', nargs='?', const=TEX_PATH, metavar='TEX',
+                        help=f'List entries not cited in TEX (default: {TEX_PATH})')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not write the pickle')
+    args = parser.parse_args()
+
+    store = BibStore.load(args.bib, cache=not args.no_cache)
+
+    if args.find:
+        year = args.find[1] if len(args.find) > 1 else ''
+        for entry in store.find(args.find[0], year):
+            print(f"{entry.key:<30} {entry.year}  {entry.title}")
+    elif args.title:
+        for entry in store.search_title(args.title):
+            print(f"{entry.key:<30} {entry.year}  {entry.title}")
+    elif args.unused:
+        cited = cited_keys(Path(args.unused).read_text())
+        unused = store.unused(cited)
+        print(f"{len(unused)} of {len(store)} entries not cited in {args.unused}:")
+        for key in unused:
+            print(f"  {key}")
+        missing = store.missing(cited)
+        if missing:
+            print(f"\nCited keys missing from {args.bib}: {', '.join(missing)}")
+    else:
+        print(f"{args.bib}: {len(store)} entries, "
+              f"{len(store.by_title_token)} title tokens")
+
+
+if __name__ == '__main__':
+    # Run through the importable module so pickled stores reference
+    # bibtex_store.BibStore rather than __main__.BibStore
+    import bibtex_store
+    bibtex_store.main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Single-scan author-year citation matcher generated from references.bib.
+
+convert_citations.py used to run one re.sub per hand-written (pattern, key)
+pair over the whole document, rescanning it once per reference. The
+matcher instead takes the surnames of every .bib entry from the indexed
+store (bibtex_store.py), compiles them into one regular expression
+(surnames are merged into a prefix trie, so each position is tried in time
+proportional to the longest name, not the number of names) and resolves
+each match to its bibkey with a (surname, year) index lookup.
+
+Recognised forms, where A, B and C are surnames from the .bib:
+    A (2019), A~(2019), A and B (2019), A \\& B (2019),
+    A, B, and C (2019), A et al. (2019), A (1975, 1980)   -> \\citet{...}
+    (A, 2019), (A et al., 2019; B and C, 2020)            -> \\citep{...}
+    A, 2019                                               -> \\citet{...}
+
+Citations that do not resolve to exactly one entry are left as written and
+listed in CitationMatcher.unresolved after each convert().
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bibtex_store import BIB_PATH, BibEntry, BibStore, ascii_fold, canonical_name
+
+
+ET_AL = 'et al.'
+
+
+# =============================================================================
+# Matcher
+# =============================================================================
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex matching any of words, factored into a prefix trie."""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        optional = '' in node
+        if not branches:
+            return ''
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if optional else group
+
+    return build(trie)
+
+
+class CitationMatcher:
+    """Resolve author-year citations to bibkeys in a single scan of the text."""
+
+    def __init__(self, store: BibStore,
+                 abbreviations: Optional[Dict[str, str]] = None,
+                 overrides: Optional[Dict[str, str]] = None):
+        """
+        store:         the indexed .bib (bibtex_store.BibStore)
+        abbreviations: short forms used in the text for a surname,
+                       e.g. {'BLS': 'Bureau of Labor Statistics'}
+        overrides:     citations whose key cannot be derived from the .bib,
+                       written as 'Authors, year', e.g. {'BLS, 2024a': ...}
+        """
+        self.store = store
+        self.canonical: Dict[str, str] = {}     # surname variant -> canonical form
+        self.unresolved: List[str] = []
+
+        for entry in store:
+            for name in entry.surnames:
+                self.canonical[name] = self.canonical[ascii_fold(name)] = canonical_name(name)
+        for short, full in (abbreviations or {}).items():
+            self.canonical[short] = canonical_name(full)
+
+        self._compile()
+
+        self.overrides: Dict[Tuple[Tuple[str, ...], str], str] = {}
+        for text, key in (overrides or {}).items():
+            match = self._cite.fullmatch(text)
+            if not match:
+                raise ValueError(f"Override {text!r} is not an 'Authors, year' citation")
+            self.overrides[(self._phrase(match.group('authors')), match.group('years'))] = key
+
+    @classmethod
+    def from_bib(cls, path: str = BIB_PATH, **kwargs) -> 'CitationMatcher':
+        return cls(BibStore.load(path), **kwargs)
+
+    def _compile(self):
+        name = rf'(?<![\w\\])(?:{_trie_pattern(self.canonical)})(?!\w)'
+        conj = r'(?:,?\s+and\s+|,?\s+\\?&\s+)'
+        authors = rf'{name}(?:\s+et\s+al\.|(?:,\s+{name})*{conj}{name})?'
+        year = r'\d{4}[a-z]?(?![\w])'
+        years = rf'{year}(?:,\s*{year})*'
+        cite = rf'{authors},\s*{years}'
+
+        self._name = re.compile(name)
+        self._cite = re.compile(rf'(?P<authors>{authors}),\s*(?P<years>{years})')
+        self._scan = re.compile(
+            rf'\((?P<paren>{cite}(?:;\s*{cite})*)\)'
+            rf'|(?P<t_authors>{authors})~?\s*\((?P<t_years>{years})\)'
+            rf'|(?P<b_authors>{authors}),\s*(?P<b_year>{year})')
+
+    def _phrase(self, authors: str) -> Tuple[str, ...]:
+        names = tuple(self.canonical[n] for n in self._name.findall(authors))
+        if re.search(r'\bet\s+al\.', authors):
+            return (names[0], ET_AL)
+        return names
+
+    def resolve(self, authors: str, year: str) -> Optional[str]:
+        """Bibkey for one author phrase and year, or None if not unique."""
+        phrase = self._phrase(authors)
+        if (phrase, year) in self.overrides:
+            return self.overrides[(phrase, year)]
+        keys = self._lookup(phrase, year)
+        if not keys and year[-1].isalpha():
+            keys = self._lookup(phrase, year[:-1])
+        if len(keys) == 1:
+            return keys[0]
+        return None
+
+    def _lookup(self, phrase: Tuple[str, ...], year: str) -> List[str]:
+        return [entry.key for entry in self.store.find(phrase[0], year)
+                if self._matches(entry, phrase)]
+
+    @staticmethod
+    def _matches(entry: BibEntry, phrase: Tuple[str, ...]) -> bool:
+        """Whether phrase is how the text would name entry's authors."""
+        names = tuple(map(canonical_name, entry.surnames))
+        if phrase[-1] == ET_AL:
+            return names[:1] == phrase[:1] and (len(names) >= 3 or entry.others)
+        return names == phrase and not entry.others
+
+    def _resolve_all(self, authors: str, years: str) -> Optional[List[str]]:
+        keys = [self.resolve(authors, y.strip()) for y in years.split(',')]
+        return None if None in keys else keys
+
+    def _replace(self, match: re.Match) -> str:
+        if match.group('paren') is not None:
+            keys = []
+            for cite in self._cite.finditer(match.group('paren')):
+                resolved = self._resolve_all(cite.group('authors'), cite.group('years'))
+                if resolved is None:
+                    self.unresolved.append(cite.group(0))
+                    return match.group(0)
+                keys.extend(resolved)
+            return f"\\citep{{{','.join(keys)}}}"
+
+        if match.group('t_authors') is not None:
+            keys = self._resolve_all(match.group('t_authors'), match.group('t_years'))
+        else:
+            keys = self._resolve_all(match.group('b_authors'), match.group('b_year'))
+        if keys is None:
+            self.unresolved.append(match.group(0))
+            return match.group(0)
+        return f"\\citet{{{','.join(keys)}}}"
+
+    def convert(self, text: str) -> Tuple[str, int]:
+        """Replace every resolvable citation in text; return (text, count)."""
+        self.unresolved = []
+        count = 0
+
+        def replace(match: re.Match) -> str:
+            nonlocal count
+            new = self._replace(match)
+            count += new != match.group(0)
+            return new
+
+        return self._scan.sub(replace, text), count
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Distributional CPI: every household's (or group's) inflation path at once.
+
+fig2 and fig4 plot published quintile and race/ethnicity gaps. Those
+gaps come from reweighting category price changes by each household's
+own expenditure shares, which is a matrix product:
+
+    index[h, t] = base * sum_c share[h, c] * price[c, t] / price[c, 0]
+
+(a fixed-basket Laspeyres index per household). With chained=True the
+shares instead weight each month's category relatives and the links are
+cumulated, i.e. a share-weighted chained index per household.
+
+Shares are households x categories (rows are normalized to sum to one,
+so raw expenditures work too); prices are categories x months. Rows are
+processed in blocks of block_rows households, so a CE-survey-scale input
+(hundreds of thousands of households) never needs more than one block's
+households x months result in memory unless the full result is asked
+for. With jobs > 1 the blocks are spread across a process pool, which
+holds at most two blocks per worker (queued or finished but not yet
+consumed) at a time.
+
+group_indices() reduces household paths to group paths (income quintile,
+race/ethnicity) inside the same blocked pass, weighting households by
+survey weight if given.
+
+Usage:
+    idx = household_indices(shares, prices, jobs=0)                  # H x T
+    quintiles = group_indices(shares, prices, quintile, weights=wt)  # IndexPanel
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from index_series import IndexPanel
+
+
+BLOCK_ROWS = 65536
+
+# Per-worker copy of the category relatives (set by _init_worker)
+_relatives: Optional[np.ndarray] = None
+_chained = False
+
+
+# =============================================================================
+# Blocked product
+# =============================================================================
+
+def category_relatives(prices: np.ndarray, chained: bool = False) -> np.ndarray:
+    """
+    Categories x months relatives: price / base-month price, or with
+    chained=True month-over-month relatives (first month = 1).
+    """
+    prices = np.asarray(prices, dtype=float)
+    if chained:
+        return np.concatenate([np.ones((prices.shape[0], 1)),
+                               prices[:, 1:] / prices[:, :-1]], axis=1)
+    return prices / prices[:, :1]
+
+
+def _block_indices(shares: np.ndarray, relatives: np.ndarray, chained: bool) -> np.ndarray:
+    shares = np.asarray(shares, dtype=float)
+    totals = shares.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weights = shares / totals
+    product = weights @ relatives
+    return np.cumprod(product, axis=1) if chained else product
+
+
+def _group_totals(block: np.ndarray, groups: np.ndarray, weights: np.ndarray,
+                  n_groups: int) -> np.ndarray:
+    """
+    Survey-weighted sum of a block's household rows per group, and the
+    weight those sums cover (2 x groups x months). Non-finite entries (a
+    household with no expenditure) count toward neither.
+    """
+    # One-hot membership: (groups x block) @ (block x months)
+    member = np.zeros((n_groups, groups.size))
+    member[groups, np.arange(groups.size)] = weights
+    finite = np.isfinite(block)
+    return np.stack([member @ np.where(finite, block, 0.0), member @ finite])
+
+
+def _init_worker(relatives: np.ndarray, chained: bool):
+    global _relatives, _chained
+    _relatives, _chained = relatives, chained
+
+
+def _worker_block(shares: np.ndarray) -> np.ndarray:
+    return _block_indices(shares, _relatives, _chained)
+
+
+def _worker_group_block(args) -> np.ndarray:
+    shares, groups, weights, n_groups = args
+    return _group_totals(_block_indices(shares, _relatives, _chained), groups, weights, n_groups)
+
+
+def _blocks(n: int, block_rows: int) -> List[Tuple[int, int]]:
+    return [(lo, min(lo + block_rows, n)) for lo in range(0, n, block_rows)]
+
+
+def _workers(jobs: int, n_blocks: int) -> int:
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return max(1, min(jobs, n_blocks))
+
+
+def _bounded_map(pool: ProcessPoolExecutor, fn: Callable, args: Iterable,
+                 in_flight: int) -> Iterator:
+    """
+    pool.map(fn, args) in order, but with at most in_flight calls
+    submitted and not yet consumed. pool.map submits every argument up
+    front, which would slice (and pickle) every block of shares at once.
+    """
+    pending: deque = deque()
+    for arg in args:
+        if len(pending) >= in_flight:
+            yield pending.popleft().result()
+        pending.append(pool.submit(fn, arg))
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_household_blocks(shares: np.ndarray, prices: np.ndarray, chained: bool = False,
+                          block_rows: int = BLOCK_ROWS,
+                          jobs: int = 1) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Yield (first row, stop row, block of indices / base) over shares' rows.
+
+    jobs > 1 computes blocks in a process pool (jobs <= 0: one worker per
+    core), with at most 2 * jobs blocks in flight; blocks are still
+    yielded in row order. Shipping every result
+    block back from the workers costs about as much as the product itself,
+    so the pool pays off for wide category sets or with group_indices(),
+    whose workers return only per-group sums.
+    """
+    relatives = category_relatives(prices, chained)
+    spans = _blocks(shares.shape[0], block_rows)
+    jobs = _workers(jobs, len(spans))
+
+    if jobs == 1:
+        for lo, hi in spans:
+            yield lo, hi, _block_indices(shares[lo:hi], relatives, chained)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(relatives, chained)) as pool:
+        blocks = _bounded_map(pool, _worker_block,
+                              (np.asarray(shares[lo:hi]) for lo, hi in spans), 2 * jobs)
+        for (lo, hi), block in zip(spans, blocks):
+            yield lo, hi, block
+
+
+def household_indices(shares: np.ndarray, prices: np.ndarray, base: float = 100.0,
+                      chained: bool = False, block_rows: int = BLOCK_ROWS, jobs: int = 1,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Households x months index for every household.
+
+    out may be a preallocated (e.g. memory-mapped) households x months
+    array to write into when the result is too large for RAM.
+    """
+    shape = (shares.shape[0], np.shape(prices)[1])
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError(f"out has shape {out.shape}, expected {shape}")
+    for lo, hi, block in iter_household_blocks(shares, prices, chained, block_rows, jobs):
+        out[lo:hi] = base * block
+    return out
+
+
+def group_indices(shares: np.ndarray, prices: np.ndarray, groups: np.ndarray,
+                  labels: Optional[Sequence[str]] = None, weights: Optional[np.ndarray] = None,
+                  months: Optional[Sequence] = None, base: float = 100.0,
+                  chained: bool = False, block_rows: int = BLOCK_ROWS,
+                  jobs: int = 1) -> IndexPanel:
+    """
+    Weighted mean household index per group (groups x months).
+
+    groups holds each household's group number (0 .. n_groups - 1);
+    labels names the groups and months the columns (default 0 .. T - 1).
+    Households are weighted by weights (survey weights), equally if None.
+    A group with no households (or no households at all) is NaN.
+    """
+    groups = np.asarray(groups, dtype=int)
+    if labels is not None:
+        n_groups = len(labels)
+    else:
+        n_groups = int(groups.max()) + 1 if groups.size else 0
+    weights = np.ones(groups.size) if weights is None else np.asarray(weights, dtype=float)
+    n_months = np.shape(prices)[1]
+    relatives = category_relatives(prices, chained)
+    spans = _blocks(groups.size, block_rows)
+    jobs = _workers(jobs, len(spans))
+    totals = np.zeros((2, n_groups, n_months))
+    if jobs == 1:
+        for lo, hi in spans:
+            totals += _group_totals(_block_indices(shares[lo:hi], relatives, chained),
+                                    groups[lo:hi], weights[lo:hi], n_groups)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(relatives, chained)) as pool:
+            for block_totals in _bounded_map(pool, _worker_group_block,
+                                             ((np.asarray(shares[lo:hi]), groups[lo:hi],
+                                               weights[lo:hi], n_groups) for lo, hi in spans),
+                                             2 * jobs):
+                totals += block_totals
+    totals, mass = totals
+    with np.errstate(invalid='ignore', divide='ignore'):
+        values = base * totals / mass
+
+    labels = list(labels) if labels is not None else [str(g) for g in range(n_groups)]
+    return IndexPanel(labels, np.arange(n_months) if months is None else months, values)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for rendered figures.
+
+A figure only needs re-rendering when something that feeds into it has
+changed: its input data, the matplotlib style settings, or the code that
+draws it. This module hashes those three inputs into a cache key and keeps
+a manifest (figures/.figure_cache.json) mapping each output file to the key
+it was rendered from and the hash of the file that was written. A render
+is skipped when the key matches and the file on disk is still the one the
+manifest recorded.
+
+Usage:
+    cache = FigureCache()
+    key = cache.key(data=result, code=plot_function)
+    if not cache.is_current(path, key):
+        plot_function(result, path)
+        cache.record(path, key)
+    cache.save()
+"""
+
+import hashlib
+import inspect
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from atomic_write import write_atomic
+
+
+# Manifest format; entries from another version (e.g. keys built differently) are dropped
+CACHE_VERSION = 1
+
+MANIFEST_PATH = 'figures/.figure_cache.json'
+
+# rcParams that do not change the rendered file
+_IGNORED_RCPARAMS = {'backend', 'backend_fallback', 'interactive', 'timezone'}
+
+
+def _update(h, obj: Any):
+    """Feed a canonical encoding of obj into hash h."""
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        h.update(f'{type(obj).__name__}:{obj!r};'.encode())
+    elif isinstance(obj, bytes):
+        h.update(b'bytes:' + obj + b';')
+    elif isinstance(obj, np.ndarray):
+        arr = np.ascontiguousarray(obj)
+        h.update(f'ndarray:{arr.dtype.str}:{arr.shape};'.encode())
+        h.update(arr.tobytes())
+    elif isinstance(obj, np.generic):
+        _update(h, obj.item())
+    elif isinstance(obj, dict):
+        h.update(f'dict:{len(obj)};'.encode())
+        for k in sorted(obj, key=repr):
+            _update(h, k)
+            _update(h, obj[k])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f'{type(obj).__name__}:{len(obj)};'.encode())
+        for item in obj:
+            _update(h, item)
+    elif callable(obj):
+        _update(h, inspect.getsource(obj))
+    elif hasattr(obj, '__slots__'):
+        # IndexSeries / IndexPanel and similar array containers
+        h.update(f'{type(obj).__name__};'.encode())
+        for slot in obj.__slots__:
+            if not slot.startswith('_'):
+                _update(h, getattr(obj, slot))
+    elif hasattr(obj, '__dict__'):
+        h.update(f'{type(obj).__name__};'.encode())
+        _update(h, vars(obj))
+    else:
+        h.update(f'{type(obj).__name__}:{obj!r};'.encode())
+
+
+def fingerprint(obj: Any) -> str:
+    """Stable SHA-256 of nested data (dicts, lists, arrays, series, functions)."""
+    h = hashlib.sha256()
+    _update(h, obj)
+    return h.hexdigest()
+
+
+def style_fingerprint() -> str:
+    """Hash of the active matplotlib rcParams and matplotlib version."""
+    import matplotlib
+    params = {k: repr(v) for k, v in matplotlib.rcParams.items()
+              if k not in _IGNORED_RCPARAMS}
+    return fingerprint({'matplotlib': matplotlib.__version__, 'rcParams': params})
+
+
+def file_hash(path: str) -> Optional[str]:
+    """SHA-256 of a file's contents, or None if it does not exist."""
+    h = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+    except FileNotFoundError:
+        return None
+    return h.hexdigest()
+
+
+class FigureCache:
+    """Manifest of rendered figures keyed by data, style and code hashes."""
+
+    def __init__(self, manifest_path: str = MANIFEST_PATH, enabled: bool = True):
+        self.manifest_path = Path(manifest_path)
+        self.enabled = enabled
+        self.entries = self._load()
+        self._recorded = {}
+        self._style = None
+
+    def _load(self) -> dict:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            data = json.loads(self.manifest_path.read_text())
+        except (json.JSONDecodeError, OSError):
+            return {}
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        return data.get('figures', {})
+
+    def key(self, data: Any = None, code: Any = None, style: Optional[str] = None) -> str:
+        """
+        Cache key for one figure.
+
+        data is the figure's input (any structure fingerprint() accepts),
+        code is the function (or source string) that renders it, and style
+        defaults to the current rcParams fingerprint.
+        """
+        if style is None:
+            if self._style is None:
+                self._style = style_fingerprint()
+            style = self._style
+        return fingerprint({
+            'version': CACHE_VERSION,
+            'data': fingerprint(data),
+            'code': fingerprint(code),
+            'style': style,
+        })
+
+    def is_current(self, output: str, key: str) -> bool:
+        """True if output was rendered from key and has not changed since."""
+        if not self.enabled:
+            return False
+        entry = self.entries.get(str(output))
+        if not entry or entry.get('key') != key:
+            return False
+        return file_hash(output) == entry.get('output_hash')
+
+    def record(self, output: str, key: str):
+        """Record that output has just been rendered from key."""
+        entry = {
+            'key': key,
+            'output_hash': file_hash(output),
+            'rendered_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        self.entries[str(output)] = entry
+        self._recorded[str(output)] = entry
+
+    def rewritten(self, output: str, previous_hash: str):
+        """
+        Accept output rewritten in place by a post-processing step (e.g.
+        png_optimize.py) if it was current as previous_hash, so the figure
+        is not re-rendered because its file changed.
+        """
+        entry = self.entries.get(str(output))
+        if entry and entry.get('output_hash') == previous_hash:
+            self.record(output, entry['key'])
+
+    def save(self):
+        """
+        Write the manifest atomically.
+
+        Entries recorded by this process are merged into whatever is on
+        disk, so scripts that share figures/ do not drop each other's entries.
+        """
+        if not self._recorded:
+            return
+        entries = self._load()
+        entries.update(self._recorded)
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.manifest_path, json.dumps({'version': CACHE_VERSION, 'figures': entries},
+                                                    indent=2, sort_keys=True))
+        self.entries = entries
+        self._recorded = {}
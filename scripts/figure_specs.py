@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Declarative figure specs and a batch renderer.
+
+A FigureSpec describes one figure as plain data: its panels, the layers
+(plot, bar, fill_between, ...) and annotations (text, annotate, patches)
+drawn on each, axis labels and limits, the style it is drawn in and its
+output file. Every layer is one Axes method call,
+
+    layer('plot', years, values, 'o-', color='#e74c3c', label='CPI')
+        -> ax.plot(years, values, 'o-', color='#e74c3c', label='CPI')
+
+so anything matplotlib can draw can be written as a spec without a new
+layer type. Two values are resolved at render time: patch(...) builds a
+matplotlib.patches object for add_patch layers, and transform='axes' or
+'figure' becomes ax.transAxes or fig.transFigure.
+
+FigureRenderer switches the backend and resolves every style in STYLES
+once, then renders any number of specs in the same process, so a rebuild
+pays for drawing rather than for setup. Because a spec is data, it is
+also its own figure-cache key (with the renderer code and the style): a
+figure is redrawn only when something in its spec changes.
+
+Figures are written in each of the renderer's formats (FORMATS) from a
+single draw. The vector formats are set up for inclusion in the paper:
+PDFs embed fonts as TrueType (Type 42) subsets holding only the glyphs a
+figure uses, rather than Type 3 procedures that viewers rasterize per
+glyph, and SVGs define each glyph once as a path and reuse it. Timestamps
+are left out so an unchanged figure is written byte-for-byte the same.
+Outputs of a figure that already exist in other formats are rewritten
+with it, so an earlier --format pdf run never leaves a PDF (which the
+paper prefers over the PNG) behind a newer PNG.
+
+Usage:
+    spec = FigureSpec('fig_example', [Panel(layers=[layer('plot', x, y)], title='Example')])
+    FigureRenderer().render_all([spec])
+    FigureRenderer(formats=('png', 'pdf')).render_all([spec])
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import matplotlib.patches as mpatches
+import matplotlib.pyplot as plt
+from matplotlib import font_manager
+
+from figure_cache import FigureCache, style_fingerprint
+
+
+BASE_STYLE = 'seaborn-v0_8-whitegrid'
+
+# rcParams on top of BASE_STYLE, by the style name a FigureSpec asks for
+STYLES = {
+    # Report figures (generate_figures.py): larger fonts for the PDF
+    'report': {
+        'figure.figsize': (12, 7),
+        'font.size': 14,
+        'axes.titlesize': 18,
+        'axes.labelsize': 15,
+        'xtick.labelsize': 13,
+        'ytick.labelsize': 13,
+        'legend.fontsize': 13,
+    },
+    # Metric figures (novel_metrics_analysis.py)
+    'analysis': {
+        'figure.figsize': (12, 7),
+        'font.size': 11,
+        'axes.titlesize': 14,
+    },
+}
+
+FORMATS = ('png', 'pdf', 'svg')
+
+# rcParams for the vector backends, shared by every style
+VECTOR_STYLE = {
+    'pdf.fonttype': 42,          # Subset TrueType instead of Type 3
+    'pdf.compression': 9,
+    'svg.fonttype': 'path',      # Glyphs defined once in <defs> and reused
+    'svg.hashsalt': 'figure_specs',
+}
+
+# Drop creation timestamps so output only changes with content
+SAVE_METADATA = {
+    'pdf': {'CreationDate': None},
+    'svg': {'Date': None},
+}
+
+# =============================================================================
+# Spec format
+# =============================================================================
+
+@dataclass
+class Layer:
+    """One Axes method call: getattr(ax, method)(*args, **kwargs)."""
+    method: str
+    args: Tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+def layer(method: str, *args, **kwargs) -> Layer:
+    return Layer(method, args, kwargs)
+
+
+@dataclass
+class Patch:
+    """A matplotlib.patches class by name, built when an add_patch layer is drawn."""
+    kind: str
+    args: Tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+def patch(kind: str, *args, **kwargs) -> Patch:
+    return Patch(kind, args, kwargs)
+
+
+@dataclass
+class Panel:
+    """One Axes: data layers, axis settings, legend and annotations."""
+    layers: List[Layer] = field(default_factory=list)
+    annotations: List[Layer] = field(default_factory=list)
+    title: Optional[str] = None
+    xlabel: Optional[str] = None
+    ylabel: Optional[str] = None
+    title_kw: Dict[str, Any] = field(default_factory=lambda: {'fontweight': 'bold'})
+    label_kw: Dict[str, Any] = field(default_factory=dict)
+    xlim: Optional[Tuple[float, float]] = None
+    ylim: Optional[Tuple[float, float]] = None
+    xticks: Optional[Sequence] = None
+    xticklabels: Optional[Sequence[str]] = None
+    ticklabel_kw: Dict[str, Any] = field(default_factory=dict)
+    yticks: Optional[Sequence] = None
+    legend: Optional[Dict[str, Any]] = None   # legend() kwargs; None draws no legend
+    axis_off: bool = False
+    twin: Optional['Panel'] = None            # Drawn on ax.twinx(); its lines join the legend
+
+
+@dataclass
+class FigureSpec:
+    """A figure: panels on a grid, figure-level text, style and output file."""
+    name: str
+    panels: List[Panel]
+    grid: Tuple[int, int] = (1, 1)
+    figsize: Optional[Tuple[float, float]] = None   # None: the style's figure.figsize
+    suptitle: Optional[str] = None
+    suptitle_kw: Dict[str, Any] = field(default_factory=dict)
+    style: str = 'report'
+    tight_layout: bool = True
+    dpi: int = 150
+    output: Optional[str] = None                    # Path without extension; None: figures/<name>
+
+    def path(self, fmt: str = 'png') -> str:
+        return f"{self.output or 'figures/' + self.name}.{fmt}"
+
+# =============================================================================
+# Renderer
+# =============================================================================
+
+def _resolve(value):
+    if isinstance(value, Patch):
+        return getattr(mpatches, value.kind)(*value.args, **value.kwargs)
+    return value
+
+
+def _draw(fig, ax, layers: Sequence[Layer]):
+    for item in layers:
+        args = [_resolve(a) for a in item.args]
+        kwargs = {k: _resolve(v) for k, v in item.kwargs.items()}
+        if kwargs.get('transform') == 'axes':
+            kwargs['transform'] = ax.transAxes
+        elif kwargs.get('transform') == 'figure':
+            kwargs['transform'] = fig.transFigure
+        getattr(ax, item.method)(*args, **kwargs)
+
+
+class FigureRenderer:
+    """Renders FigureSpecs in one process with backend, styles and fonts set up once."""
+
+    def __init__(self, cache: Optional[FigureCache] = None, backend: str = 'Agg',
+                 formats: Sequence[str] = ('png',)):
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown formats {sorted(unknown)}; choose from {FORMATS}")
+        plt.switch_backend(backend)
+        self.formats = tuple(formats)
+        self.cache = cache if cache is not None else FigureCache()
+        self.rc: Dict[str, dict] = {}
+        self.style_keys: Dict[str, str] = {}
+        for name, params in STYLES.items():
+            with plt.style.context(BASE_STYLE):
+                plt.rcParams.update(VECTOR_STYLE)
+                plt.rcParams.update(params)
+                self.rc[name] = dict(plt.rcParams)
+                self.style_keys[name] = style_fingerprint()
+                # Load the font cache and resolve the style's font now,
+                # not inside the first figure's render
+                font_manager.findfont(font_manager.FontProperties(
+                    family=plt.rcParams['font.family']))
+        self._active: Optional[str] = None
+
+    def _use_style(self, style: str):
+        if style != self._active:
+            plt.rcParams.update(self.rc[style])
+            self._active = style
+
+    def formats_for(self, spec: FigureSpec) -> Tuple[str, ...]:
+        """The renderer's formats plus any other format spec already has a file in."""
+        return self.formats + tuple(fmt for fmt in FORMATS if fmt not in self.formats
+                                    and os.path.exists(spec.path(fmt)))
+
+    def key(self, spec: FigureSpec, fmt: str = 'png') -> str:
+        """Cache key: the spec itself, the output format, the drawing code and the style."""
+        return self.cache.key(data={'spec': spec, 'format': fmt},
+                              code=[FigureRenderer, _draw, _resolve],
+                              style=self.style_keys[spec.style])
+
+    def _draw_panel(self, fig, ax, panel: Panel):
+        _draw(fig, ax, panel.layers)
+        twin = None
+        if panel.twin is not None:
+            twin = ax.twinx()
+            self._draw_panel(fig, twin, panel.twin)
+
+        if panel.title is not None:
+            ax.set_title(panel.title, **panel.title_kw)
+        if panel.xlabel is not None:
+            ax.set_xlabel(panel.xlabel, **panel.label_kw)
+        if panel.ylabel is not None:
+            ax.set_ylabel(panel.ylabel, **panel.label_kw)
+        if panel.xticks is not None:
+            ax.set_xticks(panel.xticks)
+        if panel.xticklabels is not None:
+            ax.set_xticklabels(panel.xticklabels, **panel.ticklabel_kw)
+        if panel.yticks is not None:
+            ax.set_yticks(panel.yticks)
+        if panel.xlim is not None:
+            ax.set_xlim(*panel.xlim)
+        if panel.ylim is not None:
+            ax.set_ylim(*panel.ylim)
+        if panel.axis_off:
+            ax.axis('off')
+
+        if panel.legend is not None:
+            handles, labels = ax.get_legend_handles_labels()
+            if twin is not None:
+                more_handles, more_labels = twin.get_legend_handles_labels()
+                handles, labels = handles + more_handles, labels + more_labels
+            ax.legend(handles, labels, **panel.legend)
+
+        _draw(fig, ax, panel.annotations)
+
+    def render(self, spec: FigureSpec, formats: Optional[Sequence[str]] = None) -> float:
+        """
+        Draw one spec and save it in every format (default: formats_for(spec));
+        return the wall seconds it took.
+        """
+        start = time.perf_counter()
+        self._use_style(spec.style)
+        fig, axes = plt.subplots(*spec.grid, figsize=spec.figsize, squeeze=False)
+        for ax, panel in zip(axes.flat, spec.panels):
+            self._draw_panel(fig, ax, panel)
+        if spec.suptitle is not None:
+            fig.suptitle(spec.suptitle, **spec.suptitle_kw)
+        if spec.tight_layout:
+            fig.tight_layout()
+        os.makedirs(os.path.dirname(spec.path()) or '.', exist_ok=True)
+        for fmt in formats or self.formats_for(spec):
+            fig.savefig(spec.path(fmt), dpi=spec.dpi, bbox_inches='tight',
+                        metadata=SAVE_METADATA.get(fmt))
+        plt.close(fig)
+        return time.perf_counter() - start
+
+    def render_all(self, specs: Sequence[FigureSpec], jobs: int = 1,
+                   force: bool = False) -> Dict[str, Optional[float]]:
+        """
+        Render every spec with an output (in any of formats_for(spec)) that
+        is stale; return {name: wall seconds}, None for figures that were
+        already current.
+
+        With jobs > 1 the stale specs are spread across a process pool
+        (matplotlib is not thread-safe, so each worker is a separate
+        interpreter); each worker builds one renderer and reuses it for
+        all the specs it is given. jobs <= 0 uses one worker per CPU core.
+        """
+        enabled, self.cache.enabled = self.cache.enabled, self.cache.enabled and not force
+        formats = {spec.name: self.formats_for(spec) for spec in specs}
+        outputs = {spec.name: {spec.path(fmt): self.key(spec, fmt) for fmt in formats[spec.name]}
+                   for spec in specs}
+        stale = [spec for spec in specs
+                 if not all(self.cache.is_current(path, key)
+                            for path, key in outputs[spec.name].items())]
+        stale_names = {spec.name for spec in stale}
+        self.cache.enabled = enabled
+
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        jobs = max(1, min(jobs, len(stale)))
+
+        timings: Dict[str, Optional[float]] = {spec.name: None for spec in specs}
+        for spec in specs:
+            if spec.name not in stale_names:
+                print(f"  Up to date: {', '.join(outputs[spec.name])}")
+
+        def done(name: str, elapsed: float):
+            timings[name] = elapsed
+            for path, key in outputs[name].items():
+                self.cache.record(path, key)
+            print(f"  Created: {', '.join(outputs[name])}")
+
+        if jobs == 1:
+            for spec in stale:
+                done(spec.name, self.render(spec, formats[spec.name]))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_start_worker,
+                                     initargs=(self.formats,)) as pool:
+                futures = [pool.submit(_render_in_worker, spec, formats[spec.name])
+                           for spec in stale]
+                for future in as_completed(futures):
+                    done(*future.result())
+
+        self.cache.save()
+        return timings
+
+
+_worker_renderer: Optional[FigureRenderer] = None
+
+
+def _start_worker(formats: Sequence[str]):
+    global _worker_renderer
+    _worker_renderer = FigureRenderer(cache=FigureCache(enabled=False), formats=formats)
+
+
+def _render_in_worker(spec: FigureSpec, formats: Sequence[str]) -> Tuple[str, float]:
+    return spec.name, _worker_renderer.render(spec, formats)
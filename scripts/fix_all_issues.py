@@ -5,18 +5,22 @@ Comprehensive fix for LaTeX document:
 2. Fix section labels to match references
 3. Remove duplicate labels
 4. Remove stray manual section number
+
+Registers its fixes as passes of the LaTeX pipeline (latex_pipeline.py);
+running this script applies just these passes.
 """
 
 import re
-from pathlib import Path
 
-tex = Path('inflation_final_humanized.tex').read_text()
+from latex_pipeline import Replacements, latex_pass, run_pipeline
+
+SCRIPT = 'fix_all_issues'
 
 # ============================================================================
 # 1. Fix section labels to match the short reference names used in text
 # ============================================================================
 
-label_renames = [
+label_renames = Replacements([
     # Main sections - change labels to match references
     ('\\label{sec:related-work}', '\\label{sec:related}'),
     ('\\label{sec:official-inflation-m}', '\\label{sec:official}'),
@@ -24,12 +28,14 @@ label_renames = [
     ('\\label{sec:novel-metrics-a-demo}', '\\label{sec:novel}'),
     ('\\label{sec:case-study-argentina}', '\\label{sec:argentina}'),
     ('\\label{sec:machine-intelligence}', '\\label{sec:machine}'),
-]
+])
 
-for old, new in label_renames:
-    tex = tex.replace(old, new)
 
-print("Fixed main section labels")
+@latex_pass(SCRIPT)
+def fix_main_section_labels(tex: str) -> str:
+    tex = label_renames(tex)
+    print("Fixed main section labels")
+    return tex
 
 # ============================================================================
 # 2. Fix duplicate label: sec:alternative-inflatio appears twice
@@ -39,21 +45,18 @@ print("Fixed main section labels")
 
 # The stray "4. Alternative Inflation Measures" section at line 537-538
 # This appears to be a duplicate/leftover from earlier processing
-# Let's check and remove it or rename its label
-
-# First rename the duplicate to something unique
-tex = tex.replace(
-    '\\subsection{4. Alternative Inflation\nMeasures}\\label{sec:alternative-inflatio}',
-    ''  # Remove this entirely - it's a duplicate
-)
+duplicate_sections = Replacements([
+    ('\\subsection{4. Alternative Inflation\nMeasures}\\label{sec:alternative-inflatio}', ''),
+    # Also try without newline
+    ('\\subsection{4. Alternative Inflation Measures}\\label{sec:alternative-inflatio}', ''),
+])
 
-# Also try without newline
-tex = tex.replace(
-    '\\subsection{4. Alternative Inflation Measures}\\label{sec:alternative-inflatio}',
-    ''
-)
 
-print("Removed duplicate alternative inflation section")
+@latex_pass(SCRIPT)
+def remove_duplicate_section(tex: str) -> str:
+    tex = duplicate_sections(tex)
+    print("Removed duplicate alternative inflation section")
+    return tex
 
 # ============================================================================
 # 3. Fix table structure - remove nested table/longtable
@@ -102,54 +105,65 @@ def fix_table_structure(match):
     return new_table
 
 # Match table environments containing longtable
-table_pattern = r'\\begin\{table\}\[H\].*?\\begin\{longtable\}.*?\\end\{longtable\}.*?\\end\{table\}'
-tex = re.sub(table_pattern, fix_table_structure, tex, flags=re.DOTALL)
+NESTED_TABLE = re.compile(
+    r'\\begin\{table\}\[H\].*?\\begin\{longtable\}.*?\\end\{longtable\}.*?\\end\{table\}',
+    re.DOTALL)
 
-print("Fixed table structure (removed nested table/longtable)")
 
-# ============================================================================
-# 4. For standalone longtables, add \captionsetup for proper numbering
-# ============================================================================
-
-# Add longtable caption setup to preamble if not present
-if '\\usepackage{caption}' not in tex:
-    # Add after longtable package
-    tex = tex.replace(
-        '\\usepackage{longtable,booktabs,array}',
-        '\\usepackage{longtable,booktabs,array}\n\\usepackage{caption}'
-    )
-    print("Added caption package")
+@latex_pass(SCRIPT)
+def unnest_longtables(tex: str) -> str:
+    tex = NESTED_TABLE.sub(fix_table_structure, tex)
+    print("Fixed table structure (removed nested table/longtable)")
+    return tex
 
 # ============================================================================
+# 4. For standalone longtables, add \captionsetup for proper numbering
 # 5. Reset table/figure counters properly
 # ============================================================================
 
-# Make sure counters are reset
-if '\\setcounter{table}{0}' not in tex:
-    tex = tex.replace(
-        '\\begin{document}',
-        '\\begin{document}\n\\setcounter{table}{0}\n\\setcounter{figure}{0}'
-    )
-
-print("Ensured counter resets")
+@latex_pass(SCRIPT, scope='preamble')
+def add_caption_package(tex: str) -> str:
+    # Add longtable caption setup to preamble if not present
+    if '\\usepackage{caption}' not in tex:
+        # Add after longtable package
+        tex = tex.replace(
+            '\\usepackage{longtable,booktabs,array}',
+            '\\usepackage{longtable,booktabs,array}\n\\usepackage{caption}'
+        )
+        print("Added caption package")
+    return tex
+
+
+@latex_pass(SCRIPT, scope='document')
+def reset_counters(tex: str) -> str:
+    # Make sure counters are reset
+    if '\\setcounter{table}{0}' not in tex:
+        tex = tex.replace(
+            '\\begin{document}',
+            '\\begin{document}\n\\setcounter{table}{0}\n\\setcounter{figure}{0}'
+        )
+
+    print("Ensured counter resets")
+    return tex
 
 # ============================================================================
 # 6. Clean up any remaining issues
 # ============================================================================
 
-# Remove empty lines that might have been left
-tex = re.sub(r'\n{4,}', '\n\n\n', tex)
+@latex_pass(SCRIPT, scope='document')
+def clean_up_formatting(tex: str) -> str:
+    # Remove empty lines that might have been left
+    tex = re.sub(r'\n{4,}', '\n\n\n', tex)
 
-# Fix any remaining malformed labels (label inside section title)
-tex = re.sub(r'\\(section|subsection)\{([^\\}]+)\\label\{([^}]+)\}',
-             lambda m: f'\\{m.group(1)}{{{m.group(2)}}}\\label{{{m.group(3)}}}',
-             tex)
+    # Fix any remaining malformed labels (label inside section title)
+    tex = re.sub(r'\\(section|subsection)\{([^\\}]+)\\label\{([^}]+)\}',
+                 lambda m: f'\\{m.group(1)}{{{m.group(2)}}}\\label{{{m.group(3)}}}',
+                 tex)
 
-print("Cleaned up formatting")
+    print("Cleaned up formatting")
+    return tex
 
-# ============================================================================
-# Write output
-# ============================================================================
 
-Path('inflation_final_humanized.tex').write_text(tex)
-print("\nAll fixes applied!")
+if __name__ == '__main__':
+    run_pipeline(scripts=[SCRIPT])
+    print("\nAll fixes applied!")
@@ -7,20 +7,26 @@ Fix LaTeX document structure:
 4. Convert \subsection to \section for main sections
 5. Remove manual section numbers from titles
 6. Add proper \label{} to all sections
+
+Registers its fixes as passes of the LaTeX pipeline (latex_pipeline.py);
+running this script applies just these passes.
 """
 
 import re
-from pathlib import Path
 
-tex = Path('inflation_final_humanized.tex').read_text()
+from latex_pipeline import Replacements, latex_pass, run_pipeline
+
+SCRIPT = 'fix_document_structure'
 
 # ============================================================================
 # 1. Enable section numbering
 # ============================================================================
-tex = tex.replace(r'\setcounter{secnumdepth}{-\maxdimen} % remove section numbering',
-                  r'\setcounter{secnumdepth}{3} % enable section numbering')
-
-print("Enabled section numbering")
+@latex_pass(SCRIPT, scope='preamble')
+def enable_section_numbering(tex: str) -> str:
+    tex = tex.replace(r'\setcounter{secnumdepth}{-\maxdimen} % remove section numbering',
+                      r'\setcounter{secnumdepth}{3} % enable section numbering')
+    print("Enabled section numbering")
+    return tex
 
 # ============================================================================
 # 2. Fix title - use \title{} and \maketitle
@@ -44,8 +50,12 @@ new_title = r'''\title{Measuring What Matters: A Comparative Analysis of Officia
 
 \begin{center}\rule{0.5\linewidth}{0.5pt}\end{center}'''
 
-tex = tex.replace(old_title, new_title)
-print("Fixed title")
+
+@latex_pass(SCRIPT)
+def fix_title(tex: str) -> str:
+    tex = tex.replace(old_title, new_title)
+    print("Fixed title")
+    return tex
 
 # ============================================================================
 # 3. Fix abstract - use \begin{abstract}...\end{abstract}
@@ -53,18 +63,23 @@ print("Fixed title")
 
 # Find abstract section and convert it
 abstract_pattern = r'\\hypertarget\{abstract\}\{%\s*\\subsection\{Abstract\}\\label\{abstract\}\}\s*\n\s*(.*?)(?=\\textbf\{Keywords\})'
-abstract_match = re.search(abstract_pattern, tex, re.DOTALL)
 
-if abstract_match:
-    abstract_content = abstract_match.group(1).strip()
-    old_abstract = abstract_match.group(0)
-    new_abstract = f'''\\begin{{abstract}}
+
+@latex_pass(SCRIPT)
+def fix_abstract(tex: str) -> str:
+    abstract_match = re.search(abstract_pattern, tex, re.DOTALL)
+
+    if abstract_match:
+        abstract_content = abstract_match.group(1).strip()
+        old_abstract = abstract_match.group(0)
+        new_abstract = f'''\\begin{{abstract}}
 {abstract_content}
 \\end{{abstract}}
 
 '''
-    tex = tex.replace(old_abstract, new_abstract)
-    print("Fixed abstract")
+        tex = tex.replace(old_abstract, new_abstract)
+        print("Fixed abstract")
+    return tex
 
 # ============================================================================
 # 4. Convert main sections from \subsection to \section
@@ -85,17 +100,22 @@ main_sections = [
     (r'\subsection{10. References}', r'\section{References}', 'sec:references'),
 ]
 
-for old, new, label in main_sections:
-    if old in tex:
-        tex = tex.replace(old, new)
-        print(f"Converted: {old[:30]}...")
+main_section_titles = Replacements([(old, new) for old, new, label in main_sections])
+
+
+@latex_pass(SCRIPT)
+def promote_main_sections(tex: str) -> str:
+    def convert(match):
+        print(f"Converted: {match.group(0)[:30]}...")
+        return main_section_titles.mapping[match.group(0)]
+    return main_section_titles.pattern.sub(convert, tex)
 
 # ============================================================================
 # 5. Fix subsection numbering (convert \subsubsection to \subsection where needed)
 # ============================================================================
 
 # Related Work subsections
-subsections_to_fix = [
+subsections_to_fix = Replacements([
     (r'\hypertarget{cpi-methodology-and-bias}{%\n\subsubsection{2.1 CPI Methodology and',
      r'\subsection{CPI Methodology and'),
     (r'\subsubsection{2.1 CPI Methodology', r'\subsection{CPI Methodology'),
@@ -127,11 +147,12 @@ subsections_to_fix = [
     (r'\subsubsection{6.6 The Saturday', r'\subsection{The Saturday'),
     (r'\subsubsection{6.7 What Maria Found}', r'\subsection{What Maria Found}'),
     (r'\subsubsection{6.8 From Individual', r'\subsection{From Individual'),
-]
+])
 
-for old, new in subsections_to_fix:
-    if old in tex:
-        tex = tex.replace(old, new)
+
+@latex_pass(SCRIPT)
+def promote_subsections(tex: str) -> str:
+    return subsections_to_fix(tex)
 
 # ============================================================================
 # 6. Remove all \hypertarget wrappers and clean up labels
@@ -151,13 +172,17 @@ def clean_hypertarget(match):
 
     return f'\\{section_type}{{{title}}}'
 
-# This is getting complex - let's just remove hypertargets
-tex = re.sub(r'\\hypertarget\{[^}]+\}\{%\s*\n', '', tex)
 
-# Clean up double closing braces from hypertarget removal
-tex = re.sub(r'\}(\s*\\label\{[^}]+\})\}', r'\1', tex)
+@latex_pass(SCRIPT)
+def remove_hypertargets(tex: str) -> str:
+    # This is getting complex - let's just remove hypertargets
+    tex = re.sub(r'\\hypertarget\{[^}]+\}\{%\s*\n', '', tex)
+
+    # Clean up double closing braces from hypertarget removal
+    tex = re.sub(r'\}(\s*\\label\{[^}]+\})\}', r'\1', tex)
 
-print("Removed hypertarget wrappers")
+    print("Removed hypertarget wrappers")
+    return tex
 
 # ============================================================================
 # 7. Add/fix labels for all sections
@@ -185,7 +210,7 @@ section_labels = {
 }
 
 # Update section references in text
-ref_updates = [
+ref_updates = Replacements([
     ('Section~\\ref{related-work}', 'Section~\\ref{sec:related}'),
     ('Section~\\ref{official-inflation-methodology}', 'Section~\\ref{sec:official}'),
     ('Section~\\ref{alternative-inflation-measures-1}', 'Section~\\ref{sec:alternatives}'),
@@ -195,27 +220,30 @@ ref_updates = [
     ('Section~\\ref{machine-intelligence-and-the-democratization-of-measurement}', 'Section~\\ref{sec:machine}'),
     ('Section~\\ref{conclusion}', 'Section~\\ref{sec:conclusion}'),
     ('Section~\\ref{introduction}', 'Section~\\ref{sec:intro}'),
-]
+])
 
-for old, new in ref_updates:
-    tex = tex.replace(old, new)
 
-print("Updated section references")
+@latex_pass(SCRIPT)
+def update_section_references(tex: str) -> str:
+    tex = ref_updates(tex)
+    print("Updated section references")
+    return tex
 
 # ============================================================================
 # 8. Reset table counter if needed
 # ============================================================================
 
-# Add after \begin{document}: \setcounter{table}{0}
-if '\\setcounter{table}{0}' not in tex:
-    tex = tex.replace('\\begin{document}', '\\begin{document}\n\\setcounter{table}{0}\n\\setcounter{figure}{0}')
+@latex_pass(SCRIPT, scope='document')
+def reset_counters(tex: str) -> str:
+    # Add after \begin{document}: \setcounter{table}{0}
+    if '\\setcounter{table}{0}' not in tex:
+        tex = tex.replace('\\begin{document}', '\\begin{document}\n\\setcounter{table}{0}\n\\setcounter{figure}{0}')
 
-print("Reset table and figure counters")
+    print("Reset table and figure counters")
+    return tex
 
-# ============================================================================
-# Write output
-# ============================================================================
 
-Path('inflation_final_humanized.tex').write_text(tex)
-print("\nDocument structure fixed!")
-print("Run pdflatex twice to update cross-references.")
+if __name__ == '__main__':
+    run_pipeline(scripts=[SCRIPT])
+    print("\nDocument structure fixed!")
+    print("Run pdflatex twice to update cross-references.")
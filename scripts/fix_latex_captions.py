@@ -4,12 +4,16 @@ Fix LaTeX figure and table captions:
 1. Combine duplicate figure captions (keep descriptive one inside figure env)
 2. Move table captions underneath tables with proper \caption{}
 3. Add list of tables to appendix
+
+Registers its fixes as passes of the LaTeX pipeline (latex_pipeline.py);
+running this script applies just these passes.
 """
 
 import re
-from pathlib import Path
 
-tex = Path('inflation_final_humanized.tex').read_text()
+from latex_pipeline import latex_pass, run_pipeline
+
+SCRIPT = 'fix_latex_captions'
 
 # ============================================================================
 # FIX FIGURES: Remove short caption, keep only the descriptive \emph paragraph
@@ -65,7 +69,11 @@ def fix_figure(match):
 
 # Find figure blocks followed by \emph{Figure descriptions
 figure_pattern = r'\\begin\{figure\}.*?\\end\{figure\}\s*\\emph\{Figure \d+:.*?\}'
-tex = re.sub(figure_pattern, fix_figure, tex, flags=re.DOTALL)
+
+
+@latex_pass(SCRIPT)
+def fix_figure_captions(tex: str) -> str:
+    return re.sub(figure_pattern, fix_figure, tex, flags=re.DOTALL)
 
 # ============================================================================
 # FIX TABLES: Move \textbf{Table X:} to proper \caption underneath table
@@ -105,33 +113,35 @@ def fix_table(match):
 # Pattern for tables: \textbf{Table X: title} followed by longtable
 # This is tricky because longtable is not inside a table environment
 
-# Let's do a different approach - find each table pattern and fix it
-table_sections = []
-
-# Find all table headers
-table_header_pattern = r'\\textbf\{Table (\d+): ([^}]+)\}\s*\n\s*\\begin\{longtable\}'
-for match in re.finditer(table_header_pattern, tex):
-    table_sections.append({
-        'start': match.start(),
-        'header_end': match.end(),
-        'num': match.group(1),
-        'title': match.group(2)
-    })
-
-# Process tables in reverse order to preserve positions
-for table_info in reversed(table_sections):
-    # Find the end of this longtable
-    start_pos = table_info['header_end']
-    end_match = re.search(r'\\end\{longtable\}', tex[start_pos:])
-    if end_match:
-        end_pos = start_pos + end_match.end()
-
-        # Extract the longtable content (without \begin and \end)
-        longtable_start = tex.find('\\begin{longtable}', table_info['start'])
-        longtable_content = tex[longtable_start:end_pos]
-
-        # Create new table with caption at bottom
-        new_table = f'''\\begin{{table}}[H]
+@latex_pass(SCRIPT)
+def move_table_captions(tex: str) -> str:
+    # Let's do a different approach - find each table pattern and fix it
+    table_sections = []
+
+    # Find all table headers
+    table_header_pattern = r'\\textbf\{Table (\d+): ([^}]+)\}\s*\n\s*\\begin\{longtable\}'
+    for match in re.finditer(table_header_pattern, tex):
+        table_sections.append({
+            'start': match.start(),
+            'header_end': match.end(),
+            'num': match.group(1),
+            'title': match.group(2)
+        })
+
+    # Process tables in reverse order to preserve positions
+    for table_info in reversed(table_sections):
+        # Find the end of this longtable
+        start_pos = table_info['header_end']
+        end_match = re.search(r'\\end\{longtable\}', tex[start_pos:])
+        if end_match:
+            end_pos = start_pos + end_match.end()
+
+            # Extract the longtable content (without \begin and \end)
+            longtable_start = tex.find('\\begin{longtable}', table_info['start'])
+            longtable_content = tex[longtable_start:end_pos]
+
+            # Create new table with caption at bottom
+            new_table = f'''\\begin{{table}}[H]
 \\centering
 \\small
 {longtable_content}
@@ -139,9 +149,10 @@ for table_info in reversed(table_sections):
 \\label{{tab:{table_info['num']}}}
 \\end{{table}}
 '''
-        # Replace the old content
-        old_start = table_info['start']
-        tex = tex[:old_start] + new_table + tex[end_pos:]
+            # Replace the old content
+            old_start = table_info['start']
+            tex = tex[:old_start] + new_table + tex[end_pos:]
+    return tex
 
 # ============================================================================
 # Clean up any remaining duplicate figure descriptions
@@ -149,22 +160,28 @@ for table_info in reversed(table_sections):
 
 # Remove standalone \emph{Figure X: ...} paragraphs that are now orphaned
 orphan_emph_pattern = r'\n\s*\\emph\{Figure \d+: [^}]+\}\s*\n'
-tex = re.sub(orphan_emph_pattern, '\n\n', tex)
+
+
+@latex_pass(SCRIPT)
+def remove_orphan_figure_descriptions(tex: str) -> str:
+    return re.sub(orphan_emph_pattern, '\n\n', tex)
 
 # ============================================================================
 # ADD LIST OF TABLES TO APPENDIX
 # ============================================================================
 
-# Find where to insert list of tables (after Figure List in appendix)
-figure_list_pattern = r'(\\subsection\{Appendix B: Figure List\}.*?)(\\subsection\{Appendix C:)'
-match = re.search(figure_list_pattern, tex, re.DOTALL)
+@latex_pass(SCRIPT)
+def add_table_list(tex: str) -> str:
+    # Find where to insert list of tables (after Figure List in appendix)
+    figure_list_pattern = r'(\\subsection\{Appendix B: Figure List\}.*?)(\\subsection\{Appendix C:)'
+    match = re.search(figure_list_pattern, tex, re.DOTALL)
 
-if match:
-    figure_list_section = match.group(1)
-    next_section = match.group(2)
+    if match:
+        figure_list_section = match.group(1)
+        next_section = match.group(2)
 
-    # Create table list
-    table_list = '''
+        # Create table list
+        table_list = '''
 
 \\subsection{Appendix B.2: Table List}\\label{appendix-b2-table-list}
 
@@ -184,21 +201,30 @@ if match:
 \\end{itemize}
 
 '''
-    tex = tex.replace(figure_list_section + next_section,
-                     figure_list_section + table_list + next_section)
+        tex = tex.replace(figure_list_section + next_section,
+                         figure_list_section + table_list + next_section)
+    return tex
 
 # ============================================================================
 # Fix any remaining issues
 # ============================================================================
 
-# Ensure [H] placement for figures
-tex = re.sub(r'\\begin\{figure\}\s*\n', '\\begin{figure}[H]\n', tex)
-tex = re.sub(r'\\begin\{figure\}\[htbp\]', '\\begin{figure}[H]', tex)
+@latex_pass(SCRIPT)
+def force_figure_placement(tex: str) -> str:
+    # Ensure [H] placement for figures
+    tex = re.sub(r'\\begin\{figure\}\s*\n', '\\begin{figure}[H]\n', tex)
+    tex = re.sub(r'\\begin\{figure\}\[htbp\]', '\\begin{figure}[H]', tex)
+    return tex
+
+
+@latex_pass(SCRIPT, scope='preamble')
+def add_float_package(tex: str) -> str:
+    # Make sure float package is loaded for [H]
+    if '\\usepackage{float}' not in tex:
+        tex = tex.replace('\\usepackage{graphicx}', '\\usepackage{graphicx}\n\\usepackage{float}')
+    return tex
 
-# Make sure float package is loaded for [H]
-if '\\usepackage{float}' not in tex:
-    tex = tex.replace('\\usepackage{graphicx}', '\\usepackage{graphicx}\n\\usepackage{float}')
 
-# Write output
-Path('inflation_final_humanized.tex').write_text(tex)
-print("Fixed LaTeX file written.")
+if __name__ == '__main__':
+    run_pipeline(scripts=[SCRIPT])
+    print("Fixed LaTeX file written.")
@@ -5,12 +5,16 @@ Fix LaTeX cross-references:
 2. Change labels to descriptive names
 3. Add labels to sections
 4. Replace text references with \ref{} commands
+
+Registers its fixes as passes of the LaTeX pipeline (latex_pipeline.py);
+running this script applies just these passes.
 """
 
 import re
-from pathlib import Path
 
-tex = Path('inflation_final_humanized.tex').read_text()
+from latex_pipeline import Replacements, latex_pass, run_pipeline
+
+SCRIPT = 'fix_latex_refs'
 
 # ============================================================================
 # MAPPING: Old labels to new descriptive labels
@@ -45,33 +49,35 @@ TABLE_LABELS = {
 # 1. Remove "Figure X:" and "Table X:" prefixes from captions
 # ============================================================================
 
-# Remove "Figure X: " prefix from captions
-tex = re.sub(r'\\caption\{Figure \d+: ', r'\\caption{', tex)
-
-# Remove "Table X: " prefix from captions
-tex = re.sub(r'\\caption\{Table \d+: ', r'\\caption{', tex)
-
-print("Removed Figure/Table prefixes from captions")
+@latex_pass(SCRIPT)
+def remove_caption_prefixes(tex: str) -> str:
+    # Remove "Figure X: " and "Table X: " prefixes from captions
+    tex = re.sub(r'\\caption\{(?:Figure|Table) \d+: ', r'\\caption{', tex)
+    print("Removed Figure/Table prefixes from captions")
+    return tex
 
 # ============================================================================
 # 2. Replace old labels with descriptive labels
 # ============================================================================
 
-for old, new in FIGURE_LABELS.items():
-    tex = tex.replace(f'\\label{{{old}}}', f'\\label{{{new}}}')
-    tex = tex.replace(f'\\ref{{{old}}}', f'\\ref{{{new}}}')
+label_renames = Replacements([
+    (f'\\{command}{{{old}}}', f'\\{command}{{{new}}}')
+    for old, new in {**FIGURE_LABELS, **TABLE_LABELS}.items()
+    for command in ('label', 'ref')
+])
 
-for old, new in TABLE_LABELS.items():
-    tex = tex.replace(f'\\label{{{old}}}', f'\\label{{{new}}}')
-    tex = tex.replace(f'\\ref{{{old}}}', f'\\ref{{{new}}}')
 
-print("Updated figure and table labels to descriptive names")
+@latex_pass(SCRIPT)
+def rename_float_labels(tex: str) -> str:
+    tex = label_renames(tex)
+    print("Updated figure and table labels to descriptive names")
+    return tex
 
 # ============================================================================
 # 3. Add section labels - using simple string replacement
 # ============================================================================
 
-section_additions = [
+section_additions = Replacements([
     ('\\section{Introduction}\\label{introduction}', '\\section{Introduction}\\label{sec:intro}'),
     ('\\subsection{CPI Methodology and Bias}\\label{cpi-methodology-and-bias}', '\\subsection{CPI Methodology and Bias}\\label{sec:cpi-methodology}'),
     ('\\subsection{Alternative Inflation Measures}\\label{alternative-inflation-measures}', '\\subsection{Alternative Inflation Measures}\\label{sec:alt-measures}'),
@@ -86,12 +92,14 @@ section_additions = [
     ('\\section{Conclusion}\\label{conclusion}', '\\section{Conclusion}\\label{sec:conclusion}'),
     ('\\section{References}\\label{references}', '\\section{References}\\label{sec:references}'),
     ('\\section{Related Work}\\label{related-work}', '\\section{Related Work}\\label{sec:related}'),
-]
+])
 
-for old, new in section_additions:
-    tex = tex.replace(old, new)
 
-print("Updated section labels")
+@latex_pass(SCRIPT)
+def add_section_labels(tex: str) -> str:
+    tex = section_additions(tex)
+    print("Updated section labels")
+    return tex
 
 # ============================================================================
 # 4. Replace text references with \ref{} commands
@@ -144,66 +152,43 @@ section_text_refs = [
     ('section 8.6', 'Section~\\ref{sec:machine-intel}'),
 ]
 
-# Apply replacements (avoiding caption/label contexts)
-# First, let's identify and protect caption contents
-# Simple approach: just do the replacements
-
-for old, new in figure_text_refs:
-    # Don't replace if it's in a caption (figures in appendix list)
-    # Pattern: replace only when not preceded by "item "
-    if '\\item ' + old not in tex:
-        tex = tex.replace(old, new)
-    else:
-        # Replace only non-list occurrences
-        lines = tex.split('\n')
-        new_lines = []
-        for line in lines:
-            if '\\item' in line and old in line:
-                new_lines.append(line)  # Keep as-is in lists
-            else:
-                new_lines.append(line.replace(old, new))
-        tex = '\n'.join(new_lines)
-
-for old, new in table_text_refs:
-    if '\\item ' + old.strip() not in tex:
-        tex = tex.replace(old, new)
-    else:
-        lines = tex.split('\n')
-        new_lines = []
-        for line in lines:
-            if '\\item' in line and old.strip() in line:
-                new_lines.append(line)
-            else:
-                new_lines.append(line.replace(old, new))
-        tex = '\n'.join(new_lines)
-
-for old, new in section_text_refs:
-    tex = tex.replace(old, new)
-
-print("Replaced text references with cross-references")
+# Apply replacements, leaving list items (the appendix figure/table
+# lists) as plain text
+float_refs = Replacements(figure_text_refs + table_text_refs)
+section_refs = Replacements(section_text_refs)
+
+
+@latex_pass(SCRIPT)
+def replace_text_references(tex: str) -> str:
+    lines = tex.split('\n')
+    for i, line in enumerate(lines):
+        if '\\item' not in line:
+            lines[i] = float_refs(line)
+    tex = section_refs('\n'.join(lines))
+    print("Replaced text references with cross-references")
+    return tex
 
 # ============================================================================
 # 5. Clean up duplicate refs in appendix lists
 # ============================================================================
 
 # The appendix figure/table lists should keep simple text, not refs
-# Let's fix them back
-appendix_start = tex.find('Appendix B: Figure List')
-if appendix_start > 0:
-    before_appendix = tex[:appendix_start]
-    after_appendix = tex[appendix_start:]
-
-    # In the appendix lists, replace refs back to plain text
-    for old, new in figure_text_refs:
-        after_appendix = after_appendix.replace(new, old)
-    for old, new in table_text_refs:
-        after_appendix = after_appendix.replace(new, old.strip())
-
-    tex = before_appendix + after_appendix
-
-print("Fixed appendix lists")
-
-# Write output
-Path('inflation_final_humanized.tex').write_text(tex)
-print("\nLaTeX file updated successfully!")
-print("Run pdflatex twice to update cross-references.")
+# In the appendix lists, replace refs back to plain text
+appendix_refs = Replacements(
+    [(new, old) for old, new in figure_text_refs] +
+    [(new, old.strip()) for old, new in table_text_refs])
+
+
+@latex_pass(SCRIPT, scope='document')
+def restore_appendix_lists(tex: str) -> str:
+    appendix_start = tex.find('Appendix B: Figure List')
+    if appendix_start > 0:
+        tex = tex[:appendix_start] + appendix_refs(tex[appendix_start:])
+    print("Fixed appendix lists")
+    return tex
+
+
+if __name__ == '__main__':
+    run_pipeline(scripts=[SCRIPT])
+    print("\nLaTeX file updated successfully!")
+    print("Run pdflatex twice to update cross-references.")
@@ -1,15 +1,17 @@
 #!/usr/bin/env python3
 """
 Fix section references to use actual label names from the document.
+
+Registers its fixes as passes of the LaTeX pipeline (latex_pipeline.py);
+running this script applies just these passes.
 """
 
-import re
-from pathlib import Path
+from latex_pipeline import Replacements, latex_pass, run_pipeline
 
-tex = Path('inflation_final_humanized.tex').read_text()
+SCRIPT = 'fix_section_refs'
 
 # Map my attempted refs to actual labels in document
-ref_fixes = [
+ref_fixes = Replacements([
     ('\\ref{sec:related}', '\\ref{related-work}'),
     ('\\ref{sec:official-methodology}', '\\ref{official-inflation-methodology}'),
     ('\\ref{sec:alternatives}', '\\ref{alternative-inflation-measures-1}'),
@@ -19,26 +21,36 @@ ref_fixes = [
     ('\\ref{sec:machine-intel}', '\\ref{machine-intelligence-and-epistemic-democratization}'),
     ('\\ref{sec:conclusion}', '\\ref{conclusion}'),
     ('\\ref{sec:intro}', '\\ref{introduction}'),
-]
-
-for old, new in ref_fixes:
-    tex = tex.replace(old, new)
+])
 
 # Also need to check for section numbers like "4.3" references
 # These are subsections that need proper labels
 # Let's just fix these to be text for now or find the right labels
+broken_ref_fixes = Replacements([
+    # Fix any remaining broken refs
+    ('Section~\\ref{sec:alternatives}.3', 'Section~4.3'),
+    ('Section~\\ref{sec:machine-intel}.6', 'Section~8.6'),
+    ('Section~\\ref{sec:distributional-analysis}.1', 'Section~5.1'),
+    ('Section~\\ref{sec:argentina}.5', 'Section~7.5'),
+
+    # Fix the broken refs I introduced
+    ('Section~\\ref{alternative-inflation-measures-1}.3', 'Section~4.3'),
+    ('Section~\\ref{machine-intelligence-and-epistemic-democratization}.6', 'Section~8.6'),
+    ('Section~\\ref{distributional-analysis}.1', 'Section~5.1'),
+    ('Section~\\ref{argentina-case-study}.5', 'Section~7.5'),
+])
+
+
+@latex_pass(SCRIPT)
+def fix_section_refs(tex: str) -> str:
+    return ref_fixes(tex)
+
 
-# Fix any remaining broken refs
-tex = tex.replace('Section~\\ref{sec:alternatives}.3', 'Section~4.3')
-tex = tex.replace('Section~\\ref{sec:machine-intel}.6', 'Section~8.6')
-tex = tex.replace('Section~\\ref{sec:distributional-analysis}.1', 'Section~5.1')
-tex = tex.replace('Section~\\ref{sec:argentina}.5', 'Section~7.5')
+@latex_pass(SCRIPT)
+def fix_numbered_subsection_refs(tex: str) -> str:
+    return broken_ref_fixes(tex)
 
-# Fix the broken refs I introduced
-tex = tex.replace('Section~\\ref{alternative-inflation-measures-1}.3', 'Section~4.3')
-tex = tex.replace('Section~\\ref{machine-intelligence-and-epistemic-democratization}.6', 'Section~8.6')
-tex = tex.replace('Section~\\ref{distributional-analysis}.1', 'Section~5.1')
-tex = tex.replace('Section~\\ref{argentina-case-study}.5', 'Section~7.5')
 
-Path('inflation_final_humanized.tex').write_text(tex)
-print("Fixed section references")
+if __name__ == '__main__':
+    run_pipeline(scripts=[SCRIPT])
+    print("Fixed section references")
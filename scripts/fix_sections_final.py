@@ -5,12 +5,16 @@ Final fixes for document structure:
 2. Remove remaining manual section numbers
 3. Convert remaining subsubsections to subsections
 4. Fix all section labels
+
+Registers its fixes as passes of the LaTeX pipeline (latex_pipeline.py);
+running this script applies just these passes.
 """
 
 import re
-from pathlib import Path
 
-tex = Path('inflation_final_humanized.tex').read_text()
+from latex_pipeline import Replacements, latex_pass, run_pipeline
+
+SCRIPT = 'fix_sections_final'
 
 # Fix malformed labels like \section{Title\label{name} -> \section{Title}\label{sec:name}
 def fix_malformed_label(match):
@@ -23,27 +27,33 @@ def fix_malformed_label(match):
 
     return f'\\{sec_type}{{{title}}}\\label{{{new_label}}}'
 
-# Pattern for malformed labels
-tex = re.sub(r'\\(section|subsection|subsubsection)\{([^\\]+)\\label\{([^}]+)\}',
-             fix_malformed_label, tex)
 
-print("Fixed malformed labels")
+@latex_pass(SCRIPT)
+def fix_malformed_labels(tex: str) -> str:
+    # Pattern for malformed labels
+    tex = re.sub(r'\\(section|subsection|subsubsection)\{([^\\]+)\\label\{([^}]+)\}',
+                 fix_malformed_label, tex)
+    print("Fixed malformed labels")
+    return tex
 
-# Remove remaining manual numbers from section titles
-# Pattern: \section{N. Title} -> \section{Title}
-tex = re.sub(r'\\section\{(\d+)\.\s*', r'\\section{', tex)
-tex = re.sub(r'\\subsection\{(\d+)\.(\d+)\s*', r'\\subsection{', tex)
-tex = re.sub(r'\\subsubsection\{(\d+)\.(\d+)\s*', r'\\subsection{', tex)
 
-print("Removed manual section numbers")
+@latex_pass(SCRIPT)
+def remove_manual_section_numbers(tex: str) -> str:
+    # Remove remaining manual numbers from section titles
+    # Pattern: \section{N. Title} -> \section{Title}
+    tex = re.sub(r'\\section\{(\d+)\.\s*', r'\\section{', tex)
+    tex = re.sub(r'\\subsection\{(\d+)\.(\d+)\s*', r'\\subsection{', tex)
+    tex = re.sub(r'\\subsubsection\{(\d+)\.(\d+)\s*', r'\\subsection{', tex)
+    print("Removed manual section numbers")
 
-# Convert subsubsections to subsections for better structure
-tex = tex.replace('\\subsubsection{', '\\subsection{')
+    # Convert subsubsections to subsections for better structure
+    tex = tex.replace('\\subsubsection{', '\\subsection{')
+    print("Converted subsubsections to subsections")
+    return tex
 
-print("Converted subsubsections to subsections")
 
 # Fix specific section labels to use sec: prefix
-label_fixes = [
+label_fixes = Replacements([
     ('\\label{introduction}', '\\label{sec:intro}'),
     ('\\label{related-work}', '\\label{sec:related}'),
     ('\\label{official-inflation}', '\\label{sec:official}'),
@@ -64,15 +74,10 @@ label_fixes = [
     ('\\label{consumer-price-index-cons}', '\\label{sec:cpi-construction}'),
     ('\\label{key-methodological-compon}', '\\label{sec:methodology-components}'),
     ('\\label{cumulative-effect-of-meth}', '\\label{sec:cumulative-effect}'),
-]
-
-for old, new in label_fixes:
-    tex = tex.replace(old, new)
-
-print("Fixed section labels")
+])
 
 # Update cross-references to use new labels
-ref_fixes = [
+ref_fixes = Replacements([
     ('\\ref{related-work}', '\\ref{sec:related}'),
     ('\\ref{official-inflation-methodology}', '\\ref{sec:official}'),
     ('\\ref{alternative-inflation-measures-1}', '\\ref{sec:alternatives}'),
@@ -82,16 +87,26 @@ ref_fixes = [
     ('\\ref{machine-intelligence-and-the-democratization-of-measurement}', '\\ref{sec:machine}'),
     ('\\ref{conclusion}', '\\ref{sec:conclusion}'),
     ('\\ref{introduction}', '\\ref{sec:intro}'),
-]
+])
 
-for old, new in ref_fixes:
-    tex = tex.replace(old, new)
 
-print("Fixed cross-references")
+@latex_pass(SCRIPT)
+def fix_section_labels(tex: str) -> str:
+    tex = label_fixes(tex)
+    print("Fixed section labels")
+    return tex
+
+
+@latex_pass(SCRIPT)
+def fix_cross_references(tex: str) -> str:
+    tex = ref_fixes(tex)
+    print("Fixed cross-references")
+    return tex
 
 # Make sure Keywords and JEL are inside abstract or after it properly
 # (Should already be outside abstract from previous fix)
 
-# Write output
-Path('inflation_final_humanized.tex').write_text(tex)
-print("\nFinal fixes applied!")
+
+if __name__ == '__main__':
+    run_pipeline(scripts=[SCRIPT])
+    print("\nFinal fixes applied!")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Sparse time-dummy hedonic regression for quality-adjustment experiments.
+
+The BLS removes quality change from price change by regressing log price
+on product characteristics. In the time-dummy form used here,
+
+    log p[i] = delta[period(i)] + sum_k beta[k] * x[i, k] + e[i]
+
+the delta coefficients trace a quality-adjusted price index
+(exp(delta[t] - delta[base])), and beta prices each characteristic,
+which gives the adjustment factor when one product replaces another:
+exp(beta . (x_new - x_old)).
+
+Each row of the design matrix has one period dummy, the numeric
+characteristics and one dummy per categorical characteristic (brand,
+size class, ...), so it is stored as a scipy.sparse CSR matrix and solved
+with LSQR; a catalog with millions of products and thousands of
+brands never becomes a dense matrix. The first level seen of each
+categorical is its reference and gets no column.
+
+Columns are assigned in order of first appearance and never move, so
+when a new period of scraped prices arrives, update() appends its rows
+(and any new period or level columns) and restarts LSQR from the
+previous coefficients padded with zeros instead of from scratch.
+
+Usage:
+    model = HedonicModel(numeric=['log_ram_gb', 'screen_in'], categorical=['brand'])
+    model.fit(periods, log_prices, {'log_ram_gb': ram, 'screen_in': screen, 'brand': brand})
+    model.index().to_dict()
+    model.update(new_periods, new_log_prices, new_characteristics)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import lsqr
+
+from index_series import IndexSeries
+
+
+@dataclass
+class Solution:
+    """Outcome of one LSQR solve."""
+    iterations: int
+    stop_reason: int       # LSQR istop code (1 and 2 are converged)
+    residual_norm: float
+    rows: int
+    columns: int
+
+
+class HedonicModel:
+    """Time-dummy hedonic regression on a growing sparse design."""
+
+    def __init__(self, numeric: Sequence[str] = (), categorical: Sequence[str] = (),
+                 atol: float = 1e-10, btol: float = 1e-10, iter_lim: Optional[int] = None):
+        self.numeric = list(numeric)
+        self.categorical = list(categorical)
+        self.atol, self.btol, self.iter_lim = atol, btol, iter_lim
+
+        # Column layout: numeric columns first, then period and level
+        # dummies in order of first appearance
+        self.columns: List[Tuple[str, Hashable]] = [('numeric', name) for name in self.numeric]
+        self.period_columns: Dict[Hashable, int] = {}
+        self.level_columns: Dict[Tuple[str, Hashable], int] = {}
+        self.reference_levels: Dict[str, Hashable] = {}
+
+        self.design: Optional[sparse.csr_matrix] = None
+        self.target = np.empty(0)
+        self.coef = np.empty(0)
+        self.solution: Optional[Solution] = None
+
+    # -------------------------------------------------------------------------
+    # Design matrix
+    # -------------------------------------------------------------------------
+
+    def _dummy_columns(self, labels: np.ndarray, column_of) -> np.ndarray:
+        """Column for every row's label (-1 for none), mapping only unique labels."""
+        levels, inverse = np.unique(labels, return_inverse=True)
+        return np.array([column_of(level) for level in levels.tolist()], dtype=np.int64)[inverse]
+
+    def _period_column(self, period) -> int:
+        if period not in self.period_columns:
+            self.period_columns[period] = len(self.columns)
+            self.columns.append(('period', period))
+        return self.period_columns[period]
+
+    def _level_column(self, name: str, level) -> int:
+        reference = self.reference_levels.setdefault(name, level)
+        if level == reference:
+            return -1
+        key = (name, level)
+        if key not in self.level_columns:
+            self.level_columns[key] = len(self.columns)
+            self.columns.append((name, level))
+        return self.level_columns[key]
+
+    def design_matrix(self, periods: Sequence, characteristics: Mapping[str, Sequence]
+                      ) -> sparse.csr_matrix:
+        """
+        Sparse rows for new observations, adding any new period and level
+        columns. The matrix has as many columns as the model has so far.
+        """
+        periods = np.asarray(periods)
+        n = periods.size
+        rows, cols, data = [], [], []
+
+        for j, name in enumerate(self.numeric):
+            rows.append(np.arange(n))
+            cols.append(np.full(n, j))
+            data.append(np.asarray(characteristics[name], dtype=float))
+
+        rows.append(np.arange(n))
+        cols.append(self._dummy_columns(periods, self._period_column))
+        data.append(np.ones(n))
+
+        for name in self.categorical:
+            column = self._dummy_columns(np.asarray(characteristics[name]),
+                                         lambda level, name=name: self._level_column(name, level))
+            present = column >= 0
+            rows.append(np.arange(n)[present])
+            cols.append(column[present])
+            data.append(np.ones(int(present.sum())))
+
+        return sparse.csr_matrix((np.concatenate(data),
+                                  (np.concatenate(rows), np.concatenate(cols))),
+                                 shape=(n, len(self.columns)))
+
+    # -------------------------------------------------------------------------
+    # Estimation
+    # -------------------------------------------------------------------------
+
+    def _solve(self, x0: Optional[np.ndarray]) -> np.ndarray:
+        result = lsqr(self.design, self.target, atol=self.atol, btol=self.btol,
+                      iter_lim=self.iter_lim, x0=x0)
+        coef, istop, itn, r1norm = result[:4]
+        self.solution = Solution(itn, istop, r1norm, *self.design.shape)
+        self.coef = coef
+        return coef
+
+    def fit(self, periods: Sequence, log_prices: Sequence[float],
+            characteristics: Mapping[str, Sequence]) -> np.ndarray:
+        """Estimate from scratch on these observations."""
+        self.design = self.design_matrix(periods, characteristics)
+        self.target = np.asarray(log_prices, dtype=float)
+        return self._solve(None)
+
+    def update(self, periods: Sequence, log_prices: Sequence[float],
+               characteristics: Mapping[str, Sequence]) -> np.ndarray:
+        """
+        Add observations (typically a new period) and re-estimate, starting
+        LSQR from the current coefficients.
+        """
+        if self.design is None:
+            return self.fit(periods, log_prices, characteristics)
+        new_rows = self.design_matrix(periods, characteristics)
+        old = self.design
+        old.resize((old.shape[0], len(self.columns)))
+        self.design = sparse.vstack([old, new_rows], format='csr')
+        self.target = np.concatenate([self.target, np.asarray(log_prices, dtype=float)])
+        x0 = np.zeros(len(self.columns))
+        x0[:self.coef.size] = self.coef
+        if len(self.period_columns) > 1:
+            # New periods start at the latest estimated period's level
+            known = [c for c in self.period_columns.values() if c < self.coef.size]
+            new = [c for c in self.period_columns.values() if c >= self.coef.size]
+            if known and new:
+                x0[new] = self.coef[max(known)]
+        return self._solve(x0)
+
+    # -------------------------------------------------------------------------
+    # Results
+    # -------------------------------------------------------------------------
+
+    def characteristic_effects(self) -> Dict[str, float]:
+        """Coefficient of every numeric and level column (log points)."""
+        return {name if kind == 'numeric' else f'{kind}={name}': float(self.coef[j])
+                for j, (kind, name) in enumerate(self.columns) if kind != 'period'}
+
+    def index(self, base=None, level: float = 100.0) -> IndexSeries:
+        """Quality-adjusted price index from the period dummies."""
+        periods = sorted(self.period_columns)
+        deltas = self.coef[[self.period_columns[p] for p in periods]]
+        base = periods[0] if base is None else base
+        values = level * np.exp(deltas - self.coef[self.period_columns[base]])
+        return IndexSeries(periods, values, 'Hedonic')
+
+    def quality_adjustment(self, old: Mapping[str, object], new: Mapping[str, object]) -> float:
+        """
+        Factor exp(beta . (x_new - x_old)) by which the replacement item's
+        characteristics are worth more than the old item's.
+        """
+        diff = 0.0
+        for j, name in enumerate(self.numeric):
+            diff += self.coef[j] * (float(new[name]) - float(old[name]))
+        for name in self.categorical:
+            for item, sign in ((new, 1.0), (old, -1.0)):
+                column = self.level_columns.get((name, item[name]))
+                if column is not None:
+                    diff += sign * self.coef[column]
+        return float(np.exp(diff))
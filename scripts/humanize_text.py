@@ -20,13 +20,15 @@ Key findings these transformations address:
 """
 
 import re
+import os
 import random
 import argparse
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Tuple, Dict
-import statistics
+from typing import Iterable, List, Tuple, Dict
 
 
 @dataclass
@@ -190,63 +192,294 @@ def join_paragraphs(paragraphs: List[str]) -> str:
     return '\n\n'.join(paragraphs)
 
 
+# Patterns scanned by MetricsAccumulator, compiled once
+CONJUNCTION_PATTERN = re.compile(r'\b(and|but|or|yet|so|for|nor)\b')
+CONTRACTION_PATTERN = re.compile(r"\b\w+'\w+\b")
+AI_PHRASE_PATTERNS = [re.compile(phrase) for phrase in AI_PHRASES]
+# Any AI phrase; lines without a hit skip the per-phrase scans
+ANY_AI_PHRASE_PATTERN = re.compile('|'.join(f'(?:{phrase})' for phrase in AI_PHRASES))
+
+SENTENCE_END = '.!?'
+SENTENCE_START = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def _exact_ratio(num: int, den: int):
+    """num/den as the statistics module returns it for int data."""
+    return num // den if num % den == 0 else num / den
+
+
+class _Run:
+    """A run of words belonging to one sentence: its length and first two words."""
+    __slots__ = ('length', 'starter')
+
+    def __init__(self, word: str):
+        self.length = 1
+        self.starter = (word,)
+
+    def copy(self) -> '_Run':
+        new = _Run.__new__(_Run)
+        new.length, new.starter = self.length, self.starter
+        return new
+
+    def extend(self, other: '_Run') -> '_Run':
+        self.length += other.length
+        if len(self.starter) < 2:
+            self.starter = (self.starter + other.starter)[:2]
+        return self
+
+
+class MetricsAccumulator:
+    """
+    Single-pass, mergeable computation of TextMetrics.
+
+    Text is fed in pieces (feed, or from_file for a file on disk); only the
+    current line is buffered. Counters are exact integers, so metrics()
+    equals calculate_metrics() on the concatenated text. The only state
+    that grows with input is the set of distinct sentence starters.
+
+    Sentences are split where a word ending in . ! or ? is followed by a
+    word starting with a capital, as in get_sentences(). A sentence can
+    straddle two accumulators, so each keeps its first sentence (head) and
+    its last, unfinished one (tail) open until merged or finished.
+
+    Accumulators for consecutive pieces of a text can be merged with
+    merge() (or +), e.g. after processing them in parallel. Pieces must be
+    split at line breaks: no counted pattern spans a newline.
+    """
+
+    def __init__(self):
+        self.word_count = 0
+        self.conjunctions = 0
+        self.nominalizations = 0
+        self.em_dashes = 0
+        self.ai_words = 0
+        self.contractions = 0
+
+        # Sentences closed on both sides
+        self.sentences = 0
+        self.length_sum = 0
+        self.length_sq_sum = 0
+        self.starters = set()
+
+        self.head = None                # First sentence run (open to the left)
+        self.tail = None                # Last run after a boundary (open to the right)
+        self.first_char = ''
+        self.last_char = ''
+
+        self._buffer = ''
+
+    # -------------------------------------------------------------------------
+    # Feeding text
+    # -------------------------------------------------------------------------
+
+    def feed(self, text: str) -> 'MetricsAccumulator':
+        """Add text; complete lines are processed, the rest buffered."""
+        lines = (self._buffer + text).split('\n')
+        self._buffer = lines.pop()
+        for line in lines:
+            self._feed_line(line)
+        return self
+
+    def flush(self) -> 'MetricsAccumulator':
+        """Process any buffered partial line."""
+        if self._buffer:
+            line, self._buffer = self._buffer, ''
+            self._feed_line(line)
+        return self
+
+    def _feed_line(self, line: str):
+        lower = line.lower()
+        self.conjunctions += len(CONJUNCTION_PATTERN.findall(lower))
+        self.contractions += len(CONTRACTION_PATTERN.findall(line))
+        self.em_dashes += line.count('—') + line.count('--')
+        if ANY_AI_PHRASE_PATTERN.search(lower):
+            for pattern in AI_PHRASE_PATTERNS:
+                self.ai_words += len(pattern.findall(lower))
+
+        for word, word_lower in zip(line.split(), lower.split()):
+            self.word_count += 1
+            if word_lower in NOMINALIZATIONS:
+                self.nominalizations += 1
+            if word_lower in AI_WORDS:
+                self.ai_words += 1
+            self._add_word(word, word_lower)
+
+    def _add_word(self, word: str, word_lower: str):
+        if self.head is None:
+            self.head = _Run(word_lower)
+            self.first_char = word[0]
+        elif self.last_char in SENTENCE_END and word[0] in SENTENCE_START:
+            if self.tail is not None:
+                self._close(self.tail)
+            self.tail = _Run(word_lower)
+        else:
+            run = self.tail if self.tail is not None else self.head
+            run.length += 1
+            if len(run.starter) < 2:
+                run.starter += (word_lower,)
+        self.last_char = word[-1]
+
+    def _close(self, run: _Run):
+        self.sentences += 1
+        self.length_sum += run.length
+        self.length_sq_sum += run.length * run.length
+        self.starters.add(' '.join(run.starter))
+
+    # -------------------------------------------------------------------------
+    # Merging
+    # -------------------------------------------------------------------------
+
+    def merge(self, other: 'MetricsAccumulator') -> 'MetricsAccumulator':
+        """Combine with the accumulator for the text that follows this one."""
+        if self._buffer or other._buffer:
+            raise ValueError("flush() both accumulators before merging")
+        if other.head is None:
+            merged = self.copy()
+            merged._add_counts(other)
+            return merged
+        if self.head is None:
+            merged = other.copy()
+            merged._add_counts(self)
+            return merged
+
+        merged = self.copy()
+        merged._add_counts(other)
+        merged.sentences += other.sentences
+        merged.length_sum += other.length_sum
+        merged.length_sq_sum += other.length_sq_sum
+        merged.starters |= other.starters
+
+        head, tail = other.head.copy(), other.tail and other.tail.copy()
+        if self.last_char in SENTENCE_END and other.first_char in SENTENCE_START:
+            # Boundary between the two pieces: self's last run ends here
+            if merged.tail is not None:
+                merged._close(merged.tail)
+            if tail is not None:
+                merged._close(head)
+                merged.tail = tail
+            else:
+                merged.tail = head
+        else:
+            # self's last run continues into other's first
+            joined = (merged.tail if merged.tail is not None else merged.head).extend(head)
+            if tail is not None:
+                if merged.tail is not None:
+                    merged._close(joined)
+                merged.tail = tail
+        merged.last_char = other.last_char
+        return merged
+
+    __add__ = merge
+
+    def _add_counts(self, other: 'MetricsAccumulator'):
+        self.word_count += other.word_count
+        self.conjunctions += other.conjunctions
+        self.nominalizations += other.nominalizations
+        self.em_dashes += other.em_dashes
+        self.ai_words += other.ai_words
+        self.contractions += other.contractions
+
+    def copy(self) -> 'MetricsAccumulator':
+        new = MetricsAccumulator()
+        new.__dict__.update(self.__dict__)
+        new.starters = set(self.starters)
+        new.head = self.head and self.head.copy()
+        new.tail = self.tail and self.tail.copy()
+        return new
+
+    # -------------------------------------------------------------------------
+    # Results
+    # -------------------------------------------------------------------------
+
+    def metrics(self) -> TextMetrics:
+        """TextMetrics for all text fed so far (including any partial line)."""
+        acc = self.copy().flush()
+        if acc.head is None or acc.word_count == 0:
+            return TextMetrics(0, 0, 0, 0, 0, 0, 0, 0)
+
+        # The open head and tail runs are sentences once the text ends
+        acc._close(acc.head)
+        if acc.tail is not None:
+            acc._close(acc.tail)
+        n = acc.sentences
+
+        # Sentence length variance and mean, exactly as statistics computes them
+        if n > 1:
+            sent_variance = _exact_ratio(n * acc.length_sq_sum - acc.length_sum ** 2,
+                                         n * (n - 1))
+        else:
+            sent_variance = 0
+        avg_sent_length = _exact_ratio(acc.length_sum, n)
+
+        return TextMetrics(
+            sentence_length_variance=sent_variance,
+            avg_sentence_length=avg_sent_length,
+            conjunction_density=acc.conjunctions / acc.word_count,
+            nominalization_density=acc.nominalizations / acc.word_count,
+            em_dash_density=acc.em_dashes / n,
+            ai_word_density=acc.ai_words / acc.word_count,
+            sentence_starter_variety=len(acc.starters) / n,
+            contraction_density=acc.contractions / acc.word_count,
+        )
+
+    @classmethod
+    def from_iterable(cls, pieces: Iterable[str]) -> 'MetricsAccumulator':
+        acc = cls()
+        for piece in pieces:
+            acc.feed(piece)
+        return acc.flush()
+
+    @classmethod
+    def from_file(cls, path: str) -> 'MetricsAccumulator':
+        with open(path) as f:
+            return cls.from_iterable(f)
+
+
+def _file_range_metrics(job: Tuple[str, int, int]) -> MetricsAccumulator:
+    """Accumulate metrics for bytes [start, end) of a UTF-8 file (one worker's share)."""
+    path, start, end = job
+    acc = MetricsAccumulator()
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.readline(min(remaining, 1 << 20))
+            if not block:
+                break
+            remaining -= len(block)
+            # Universal newlines, as open(path) in text mode would give
+            acc.feed(block.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n'))
+    return acc.flush()
+
+
+def calculate_file_metrics(path: str, jobs: int = 1) -> TextMetrics:
+    """
+    TextMetrics for a file, streamed in constant memory.
+
+    With jobs > 1 the file is split at line breaks into one byte range per
+    worker process and the partial results are merged.
+    """
+    if jobs <= 1:
+        return MetricsAccumulator.from_file(path).metrics()
+
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, jobs):
+            f.seek(max(size * i // jobs, bounds[-1]))
+            f.readline()                  # Advance to the next line break
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    ranges = [(path, a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        parts = list(pool.map(_file_range_metrics, ranges))
+    return reduce(MetricsAccumulator.merge, parts, MetricsAccumulator()).metrics()
+
+
 def calculate_metrics(text: str) -> TextMetrics:
     """Calculate linguistic metrics for the text."""
-    sentences = get_sentences(text)
-    words = text.lower().split()
-    word_count = len(words)
-
-    if not sentences or word_count == 0:
-        return TextMetrics(0, 0, 0, 0, 0, 0, 0, 0)
-
-    # Sentence length variance
-    sent_lengths = [len(s.split()) for s in sentences]
-    sent_variance = statistics.variance(sent_lengths) if len(sent_lengths) > 1 else 0
-    avg_sent_length = statistics.mean(sent_lengths)
-
-    # Conjunction density (and, but, or, yet, so, for, nor at sentence level)
-    conjunctions = len(re.findall(r'\b(and|but|or|yet|so|for|nor)\b', text.lower()))
-    conj_density = conjunctions / word_count
-
-    # Nominalization density
-    nom_count = sum(1 for word in words if word in NOMINALIZATIONS)
-    nom_density = nom_count / word_count
-
-    # Em dash density
-    em_dashes = text.count('—') + text.count('--')
-    em_density = em_dashes / (len(sentences) or 1)
-
-    # AI word density
-    ai_count = sum(1 for word in words if word in AI_WORDS)
-    for phrase in AI_PHRASES:
-        ai_count += len(re.findall(phrase, text.lower()))
-    ai_density = ai_count / word_count
-
-    # Sentence starter variety
-    starters = []
-    for sent in sentences:
-        words_in_sent = sent.split()
-        if words_in_sent:
-            # Get first 2-3 words as starter pattern
-            starter = ' '.join(words_in_sent[:min(2, len(words_in_sent))]).lower()
-            starters.append(starter)
-    unique_starters = len(set(starters))
-    starter_variety = unique_starters / len(starters) if starters else 0
-
-    # Contraction density
-    contractions = len(re.findall(r"\b\w+'\w+\b", text))
-    contraction_density = contractions / word_count
-
-    return TextMetrics(
-        sentence_length_variance=sent_variance,
-        avg_sentence_length=avg_sent_length,
-        conjunction_density=conj_density,
-        nominalization_density=nom_density,
-        em_dash_density=em_density,
-        ai_word_density=ai_density,
-        sentence_starter_variety=starter_variety,
-        contraction_density=contraction_density,
-    )
+    return MetricsAccumulator().feed(text).metrics()
 
 
 def vary_sentence_length(text: str, noise: float) -> str:
@@ -544,6 +777,8 @@ Based on research from:
                         help='Suppress progress output')
     parser.add_argument('--metrics-only', action='store_true',
                         help='Only calculate and display metrics, no transformation')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Worker processes for --metrics-only (default: 1)')
 
     args = parser.parse_args()
 
@@ -553,10 +788,9 @@ Based on research from:
         print(f"Error: File not found: {args.input}", file=sys.stderr)
         sys.exit(1)
 
-    text = input_path.read_text()
-
     if args.metrics_only:
-        metrics = calculate_metrics(text)
+        # Streamed from disk, so large files are never loaded whole
+        metrics = calculate_file_metrics(args.input, args.jobs)
         print(f"AI Score: {metrics.ai_score():.3f}")
         print(f"Sentence length variance: {metrics.sentence_length_variance:.1f}")
         print(f"Average sentence length: {metrics.avg_sentence_length:.1f} words")
@@ -568,6 +802,8 @@ Based on research from:
         print(f"Contraction density: {metrics.contraction_density:.4f}")
         return
 
+    text = input_path.read_text()
+
     # Humanize
     result, history = humanize(
         text,
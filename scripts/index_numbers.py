@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Chained index-number formulas as batched NumPy operations.
+
+The paper's substitution-bias discussion compares fixed-basket, superlative
+and geometric formulas. This module computes them from item data:
+
+    Elementary (unweighted) aggregates:
+        jevons   - geometric mean of price relatives (BLS since 1999)
+        dutot    - ratio of average prices
+        carli    - arithmetic mean of price relatives
+    Weighted (need quantities):
+        laspeyres  - base-period basket
+        paasche    - current-period basket
+        fisher     - geometric mean of Laspeyres and Paasche
+        tornqvist  - relatives weighted by average expenditure shares
+
+Each formula is computed as period-to-period links that are chained into
+an index (base = 100 in the first period). Prices and quantities are
+arrays of shape (..., items, periods); any leading axes (regions, strata,
+Monte Carlo draws) are computed in the same vectorized pass, so thousands
+of items x periods x regions cost one array expression per formula. Items
+missing (NaN) in either period of a link are left out of that link, the
+matched-model convention.
+
+The *_index functions take IndexPanels (items x periods) and return
+IndexSeries; the *_links functions work on raw arrays.
+
+Usage:
+    from index_numbers import compare_formulas
+    compare_formulas(goods_prices, quantities).to_dicts()
+"""
+
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from index_series import IndexPanel, IndexSeries
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _pairs(prices: np.ndarray, quantities: Optional[np.ndarray] = None):
+    """Previous/current prices (and quantities) with unmatched items zeroed."""
+    p0, p1 = prices[..., :-1], prices[..., 1:]
+    valid = np.isfinite(p0) & np.isfinite(p1)
+    if quantities is not None:
+        q0, q1 = quantities[..., :-1], quantities[..., 1:]
+        valid &= np.isfinite(q0) & np.isfinite(q1)
+        return (valid, np.where(valid, p0, 0.0), np.where(valid, p1, 0.0),
+                np.where(valid, q0, 0.0), np.where(valid, q1, 0.0))
+    return valid, np.where(valid, p0, 1.0), np.where(valid, p1, 1.0)
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return num / den
+
+
+def chain(links: np.ndarray, base: float = 100.0) -> np.ndarray:
+    """Cumulate (..., periods - 1) links into a (..., periods) index."""
+    links = np.asarray(links, dtype=float)
+    ones = np.ones(links.shape[:-1] + (1,))
+    return base * np.cumprod(np.concatenate([ones, links], axis=-1), axis=-1)
+
+
+# =============================================================================
+# Period-to-period links on arrays of shape (..., items, periods)
+# =============================================================================
+
+def jevons_links(prices: np.ndarray) -> np.ndarray:
+    valid, p0, p1 = _pairs(np.asarray(prices, dtype=float))
+    log_rel = np.where(valid, np.log(p1 / p0), 0.0)
+    return np.exp(_ratio(log_rel.sum(axis=-2), valid.sum(axis=-2)))
+
+
+def dutot_links(prices: np.ndarray) -> np.ndarray:
+    valid, p0, p1 = _pairs(np.asarray(prices, dtype=float))
+    return _ratio((p1 * valid).sum(axis=-2), (p0 * valid).sum(axis=-2))
+
+
+def carli_links(prices: np.ndarray) -> np.ndarray:
+    valid, p0, p1 = _pairs(np.asarray(prices, dtype=float))
+    rel = np.where(valid, p1 / p0, 0.0)
+    return _ratio(rel.sum(axis=-2), valid.sum(axis=-2))
+
+
+def laspeyres_links(prices: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+    _, p0, p1, q0, _ = _pairs(np.asarray(prices, dtype=float),
+                              np.asarray(quantities, dtype=float))
+    return _ratio((p1 * q0).sum(axis=-2), (p0 * q0).sum(axis=-2))
+
+
+def paasche_links(prices: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+    _, p0, p1, _, q1 = _pairs(np.asarray(prices, dtype=float),
+                              np.asarray(quantities, dtype=float))
+    return _ratio((p1 * q1).sum(axis=-2), (p0 * q1).sum(axis=-2))
+
+
+def fisher_links(prices: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+    return np.sqrt(laspeyres_links(prices, quantities) * paasche_links(prices, quantities))
+
+
+def tornqvist_links(prices: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+    valid, p0, p1, q0, q1 = _pairs(np.asarray(prices, dtype=float),
+                                   np.asarray(quantities, dtype=float))
+    s0 = _ratio(p0 * q0, (p0 * q0).sum(axis=-2, keepdims=True))
+    s1 = _ratio(p1 * q1, (p1 * q1).sum(axis=-2, keepdims=True))
+    log_rel = np.log(np.where(valid, p1, 1.0) / np.where(valid, p0, 1.0))
+    return np.exp((0.5 * (s0 + s1) * log_rel).sum(axis=-2))
+
+
+ELEMENTARY: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'Jevons': jevons_links,
+    'Dutot': dutot_links,
+    'Carli': carli_links,
+}
+
+WEIGHTED: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    'Laspeyres': laspeyres_links,
+    'Paasche': paasche_links,
+    'Fisher': fisher_links,
+    'Tornqvist': tornqvist_links,
+}
+
+
+# =============================================================================
+# IndexPanel interface
+# =============================================================================
+
+def _quantity_values(prices: IndexPanel, quantities) -> np.ndarray:
+    """Quantities as an items x periods array aligned with prices."""
+    if isinstance(quantities, IndexPanel):
+        if quantities.labels != prices.labels:
+            raise ValueError("quantity labels do not match price labels")
+        if not np.array_equal(quantities.periods, prices.periods):
+            raise ValueError("quantity periods do not match price periods")
+        return quantities.values
+    if isinstance(quantities, dict):
+        # Fixed basket: {item: quantity}, unlisted items get zero weight
+        fixed = np.array([quantities.get(label, 0.0) for label in prices.labels], dtype=float)
+        return np.broadcast_to(fixed[:, None], prices.values.shape)
+    return np.broadcast_to(np.asarray(quantities, dtype=float), prices.values.shape)
+
+
+def elementary_index(prices: IndexPanel, formula: str = 'Jevons',
+                     base: float = 100.0) -> IndexSeries:
+    """Chained Jevons, Dutot or Carli index of an items x periods panel."""
+    links = ELEMENTARY[formula](prices.values)
+    return IndexSeries(prices.periods, chain(links, base), formula)
+
+
+def weighted_index(prices: IndexPanel, quantities, formula: str = 'Fisher',
+                   base: float = 100.0) -> IndexSeries:
+    """
+    Chained Laspeyres, Paasche, Fisher or Tornqvist index.
+
+    quantities is an IndexPanel on the same items and periods, an array
+    broadcastable to the prices, or a fixed {item: quantity} basket.
+    """
+    links = WEIGHTED[formula](prices.values, _quantity_values(prices, quantities))
+    return IndexSeries(prices.periods, chain(links, base), formula)
+
+
+def compare_formulas(prices: IndexPanel, quantities=None, base: float = 100.0) -> IndexPanel:
+    """
+    Every formula on the same data, one row each.
+
+    Without quantities only the elementary aggregates are computed. The
+    spread between rows is the formula (substitution) effect.
+    """
+    rows = {name: links(prices.values) for name, links in ELEMENTARY.items()}
+    if quantities is not None:
+        q = _quantity_values(prices, quantities)
+        rows.update({name: links(prices.values, q) for name, links in WEIGHTED.items()})
+    return IndexPanel(list(rows), prices.periods,
+                      chain(np.vstack(list(rows.values())), base))
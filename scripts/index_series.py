@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+NumPy-backed series and panel types for index calculations.
+
+The novel metrics are all built from the same handful of operations on
+period-keyed data: divide one series by another (price / wage), rebase to
+a reference period (2000 = 100), take weighted sums of components, and
+compound growth rates forward. These types hold values in contiguous
+arrays on a sorted period axis so those operations run as single NumPy
+expressions instead of per-year dict loops.
+
+Periods can be any sortable numbers: years (1990), fractional years
+(1990.0833 for February) or integer month codes (199002). Two operands on
+different axes are aligned on their common periods before combining.
+
+Types:
+    IndexSeries: one value per period (a wage series, a CPI series)
+    IndexPanel:  labelled rows x periods (many goods, many regions)
+"""
+
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+Number = Union[int, float]
+
+
+def _as_periods(periods) -> np.ndarray:
+    """Return periods as a 1-D array, validating that it is strictly increasing."""
+    arr = np.asarray(periods)
+    if arr.ndim != 1:
+        raise ValueError("periods must be one-dimensional")
+    if arr.size > 1 and not np.all(arr[1:] > arr[:-1]):
+        raise ValueError("periods must be strictly increasing")
+    return arr
+
+
+def align_periods(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Align two period axes.
+
+    Returns (common_periods, index_into_a, index_into_b). When the axes are
+    identical no intersection is computed and the indices are full slices.
+    """
+    if a is b or (a.shape == b.shape and np.array_equal(a, b)):
+        full = np.arange(a.size)
+        return a, full, full
+    common, ia, ib = np.intersect1d(a, b, assume_unique=True, return_indices=True)
+    return common, ia, ib
+
+
+class IndexSeries:
+    """A single series of values on a sorted period axis."""
+
+    __slots__ = ('periods', 'values', 'name')
+
+    def __init__(self, periods, values, name: str = ''):
+        self.periods = _as_periods(periods)
+        self.values = np.asarray(values, dtype=float)
+        if self.values.shape != self.periods.shape:
+            raise ValueError(
+                f"values shape {self.values.shape} does not match periods {self.periods.shape}")
+        self.name = name
+
+    @classmethod
+    def from_dict(cls, data: Dict[Number, Number], name: str = '') -> 'IndexSeries':
+        """Build a series from a {period: value} dict."""
+        periods = sorted(data)
+        return cls(periods, [data[p] for p in periods], name=name)
+
+    def to_dict(self) -> Dict[Number, float]:
+        """Return the series as a {period: value} dict of Python scalars."""
+        return dict(zip(self.periods.tolist(), self.values.tolist()))
+
+    def __len__(self) -> int:
+        return self.periods.size
+
+    def __repr__(self) -> str:
+        return f"IndexSeries({self.name!r}, {len(self)} periods)"
+
+    def _loc(self, period) -> int:
+        i = int(np.searchsorted(self.periods, period))
+        if i >= self.periods.size or self.periods[i] != period:
+            raise KeyError(period)
+        return i
+
+    def __getitem__(self, period) -> float:
+        return float(self.values[self._loc(period)])
+
+    def at(self, periods: Sequence) -> 'IndexSeries':
+        """Select a subset of periods."""
+        idx = np.array([self._loc(p) for p in periods], dtype=int)
+        return IndexSeries(self.periods[idx], self.values[idx], self.name)
+
+    # -------------------------------------------------------------------------
+    # Arithmetic
+    # -------------------------------------------------------------------------
+
+    def _binary(self, other, op) -> 'IndexSeries':
+        if isinstance(other, IndexSeries):
+            periods, ia, ib = align_periods(self.periods, other.periods)
+            return IndexSeries(periods, op(self.values[ia], other.values[ib]), self.name)
+        return IndexSeries(self.periods, op(self.values, other), self.name)
+
+    def __add__(self, other):
+        return self._binary(other, np.add)
+
+    def __radd__(self, other):
+        return self._binary(other, lambda a, b: np.add(b, a))
+
+    def __sub__(self, other):
+        return self._binary(other, np.subtract)
+
+    def __rsub__(self, other):
+        return self._binary(other, lambda a, b: np.subtract(b, a))
+
+    def __mul__(self, other):
+        return self._binary(other, np.multiply)
+
+    def __rmul__(self, other):
+        return self._binary(other, lambda a, b: np.multiply(b, a))
+
+    def __truediv__(self, other):
+        return self._binary(other, np.divide)
+
+    def __rtruediv__(self, other):
+        return self._binary(other, lambda a, b: np.divide(b, a))
+
+    def ratio(self, other: 'IndexSeries', scale: float = 1.0) -> 'IndexSeries':
+        """Return scale * self / other on the common periods."""
+        return (self / other) * scale
+
+    # -------------------------------------------------------------------------
+    # Index operations
+    # -------------------------------------------------------------------------
+
+    def rebase(self, base_period, level: float = 100.0) -> 'IndexSeries':
+        """Normalize so that the value at base_period equals level."""
+        return IndexSeries(self.periods, self.values / self[base_period] * level, self.name)
+
+    def change_since(self, base_period, pct: bool = True) -> 'IndexSeries':
+        """Change relative to base_period (percent by default, else a ratio - 1)."""
+        rel = self.values / self[base_period] - 1.0
+        return IndexSeries(self.periods, rel * 100.0 if pct else rel, self.name)
+
+    def total_change(self, pct: bool = True) -> float:
+        """Change from the first to the last period."""
+        rel = self.values[-1] / self.values[0] - 1.0
+        return float(rel * 100.0 if pct else rel)
+
+
+class IndexPanel:
+    """Labelled rows of values sharing one sorted period axis."""
+
+    __slots__ = ('labels', 'periods', 'values', '_row_index')
+
+    def __init__(self, labels: Sequence[str], periods, values):
+        self.labels = list(labels)
+        self.periods = _as_periods(periods)
+        self.values = np.asarray(values, dtype=float)
+        if self.values.shape != (len(self.labels), self.periods.size):
+            raise ValueError(
+                f"values shape {self.values.shape} does not match "
+                f"{len(self.labels)} labels x {self.periods.size} periods")
+        self._row_index = {label: i for i, label in enumerate(self.labels)}
+
+    @classmethod
+    def from_dicts(cls, rows: Dict[str, Dict[Number, Number]],
+                   periods: Optional[Iterable] = None) -> 'IndexPanel':
+        """
+        Build a panel from {label: {period: value}}.
+
+        If periods is omitted, the panel uses the periods common to every row.
+        """
+        if periods is None:
+            common = None
+            for data in rows.values():
+                common = set(data) if common is None else common & set(data)
+            periods = sorted(common or ())
+        periods = list(periods)
+        values = np.array([[data[p] for p in periods] for data in rows.values()], dtype=float)
+        return cls(list(rows), periods, values.reshape(len(rows), len(periods)))
+
+    @classmethod
+    def from_series(cls, series: Sequence[IndexSeries]) -> 'IndexPanel':
+        """Stack series onto the periods they all share."""
+        periods = series[0].periods
+        for s in series[1:]:
+            periods = align_periods(periods, s.periods)[0]
+        values = np.vstack([s.values[np.searchsorted(s.periods, periods)] for s in series])
+        return cls([s.name for s in series], periods, values)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __repr__(self) -> str:
+        return f"IndexPanel({len(self.labels)} rows x {self.periods.size} periods)"
+
+    def row(self, label: str) -> IndexSeries:
+        """Return one row as an IndexSeries."""
+        return IndexSeries(self.periods, self.values[self._row_index[label]], label)
+
+    def __iter__(self):
+        for label in self.labels:
+            yield self.row(label)
+
+    def to_dicts(self) -> Dict[str, Dict[Number, float]]:
+        """Return the panel as {label: {period: value}}."""
+        periods = self.periods.tolist()
+        return {label: dict(zip(periods, row.tolist()))
+                for label, row in zip(self.labels, self.values)}
+
+    def _column(self, period) -> int:
+        i = int(np.searchsorted(self.periods, period))
+        if i >= self.periods.size or self.periods[i] != period:
+            raise KeyError(period)
+        return i
+
+    # -------------------------------------------------------------------------
+    # Arithmetic (series operands broadcast across rows)
+    # -------------------------------------------------------------------------
+
+    def _binary(self, other, op) -> 'IndexPanel':
+        if isinstance(other, IndexSeries):
+            periods, ia, ib = align_periods(self.periods, other.periods)
+            return IndexPanel(self.labels, periods, op(self.values[:, ia], other.values[ib]))
+        if isinstance(other, IndexPanel):
+            if other.labels != self.labels:
+                raise ValueError("panel labels do not match")
+            periods, ia, ib = align_periods(self.periods, other.periods)
+            return IndexPanel(self.labels, periods, op(self.values[:, ia], other.values[:, ib]))
+        return IndexPanel(self.labels, self.periods, op(self.values, other))
+
+    def __add__(self, other):
+        return self._binary(other, np.add)
+
+    def __sub__(self, other):
+        return self._binary(other, np.subtract)
+
+    def __mul__(self, other):
+        return self._binary(other, np.multiply)
+
+    def __rmul__(self, other):
+        return self._binary(other, lambda a, b: np.multiply(b, a))
+
+    def __truediv__(self, other):
+        return self._binary(other, np.divide)
+
+    def ratio(self, other, scale: float = 1.0) -> 'IndexPanel':
+        """Return scale * self / other, broadcasting series across rows."""
+        return (self / other) * scale
+
+    # -------------------------------------------------------------------------
+    # Index operations
+    # -------------------------------------------------------------------------
+
+    def rebase(self, base_period, level: float = 100.0) -> 'IndexPanel':
+        """Normalize every row so its value at base_period equals level."""
+        base = self.values[:, self._column(base_period)][:, None]
+        return IndexPanel(self.labels, self.periods, self.values / base * level)
+
+    def total_change(self, pct: bool = True) -> np.ndarray:
+        """Per-row change from the first to the last period."""
+        rel = self.values[:, -1] / self.values[:, 0] - 1.0
+        return rel * 100.0 if pct else rel
+
+    def weighted_sum(self, weights, name: str = '') -> IndexSeries:
+        """Collapse rows to one series with the given per-row weights."""
+        if isinstance(weights, dict):
+            weights = [weights[label] for label in self.labels]
+        return IndexSeries(self.periods, np.asarray(weights, dtype=float) @ self.values, name)
+
+
+def compound(breakpoints: Sequence[Number], rates, base: float = 100.0,
+             name: str = '') -> IndexSeries:
+    """
+    Compound annual rates forward from a base level.
+
+    breakpoints has one more entry than rates: rates[i] is the annual rate
+    (as a fraction) applied from breakpoints[i] to breakpoints[i + 1]. rates
+    may also be 2-D (scenarios x intervals), in which case the result values
+    are scenarios x breakpoints and are returned as an IndexPanel.
+    """
+    breakpoints = _as_periods(breakpoints)
+    rates = np.asarray(rates, dtype=float)
+    spans = np.diff(breakpoints).astype(float)
+    if rates.shape[-1] != spans.size:
+        raise ValueError("need exactly one rate per interval between breakpoints")
+    growth = np.cumprod((1.0 + rates) ** spans, axis=-1)
+    ones = np.ones(rates.shape[:-1] + (1,))
+    levels = base * np.concatenate([ones, growth], axis=-1)
+    if levels.ndim == 1:
+        return IndexSeries(breakpoints, levels, name)
+    return IndexPanel([f'{name}{i}' for i in range(levels.shape[0])], breakpoints, levels)
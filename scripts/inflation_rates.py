@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Streaming inflation-rate operators over a live index feed.
+
+fig3 plots year-over-year rates and fig7 cumulative inflation. Both are
+simple transforms of an index level series, but a daily or monthly feed
+should not recompute them over the whole history each time a value
+arrives. Each operator here consumes levels one at a time with push()
+and keeps only the state its formula needs:
+
+    YoY(lag)                 (v[t] / v[t - lag] - 1) * 100      O(lag) window
+    AnnualizedChange(n)      ((v[t] / v[t - 1]) ** n - 1) * 100 O(1)
+    Cumulative()             (v[t] / v[first] - 1) * 100        O(1)
+    Rebase(level)            v[t] / v[first] * level, with relink() to
+                             splice a source that changes base  O(1)
+
+push() returns None until the operator has enough history (a year of
+it for YoY, the first value for AnnualizedChange). YoY is given each
+value's period and looks back lag periods on the calendar, not lag
+observations: ordinal maps a period code to a running count
+(month_ordinal for YYYYMM, day_ordinal for YYYYMMDD), so a feed may skip
+periods. When the period lag back was not observed the rate is None, or
+with carry_forward=True it uses the last value before it (for a level
+that holds between observations, like a daily index over days without a
+snapshot).
+
+yoy_comparison() and cumulative_comparison() run the operators over
+IndexSeries pairs to give the two-line views of fig3 (official CPI vs an
+online index, YoY) and fig7 (official vs independent, cumulative).
+
+Usage:
+    yoy = YoY(12)
+    for month, level in feed:
+        rate = yoy.push(level, month)
+"""
+
+import datetime
+from collections import deque
+from typing import Callable, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from index_series import IndexPanel, IndexSeries
+
+
+def month_ordinal(period: int) -> int:
+    """YYYYMM -> months since year 0."""
+    return period // 100 * 12 + period % 100 - 1
+
+
+def day_ordinal(period: int) -> int:
+    """YYYYMMDD -> proleptic day number."""
+    return datetime.date(period // 10000, period // 100 % 100, period % 100).toordinal()
+
+
+class RateOperator:
+    """Base for operators that turn a stream of levels into a stream of rates."""
+
+    def push(self, value: float, period: Optional[int] = None) -> Optional[float]:
+        raise NotImplementedError
+
+    def extend(self, values: Iterable[float],
+               periods: Optional[Iterable[int]] = None) -> List[Optional[float]]:
+        values = list(values)
+        periods = [None] * len(values) if periods is None else list(periods)
+        return [self.push(v, p) for v, p in zip(values, periods)]
+
+    def series(self, series: IndexSeries) -> IndexSeries:
+        """Push every value of series; return the periods with an output."""
+        out = self.extend(series.values.tolist(), series.periods.tolist())
+        keep = np.array([v is not None for v in out], dtype=bool)
+        values = np.array([v for v in out if v is not None], dtype=float)
+        return IndexSeries(series.periods[keep], values, series.name)
+
+
+class YoY(RateOperator):
+    """Percent change from the value lag periods earlier."""
+
+    def __init__(self, lag: int = 12, ordinal: Callable[[int], int] = month_ordinal,
+                 carry_forward: bool = False):
+        self.lag = lag
+        self.ordinal = ordinal
+        self.carry_forward = carry_forward
+        self.window: deque = deque()      # (ordinal, value), oldest first
+
+    def push(self, value: float, period: Optional[int] = None) -> Optional[float]:
+        if period is None:
+            raise ValueError("YoY.push() needs the value's period")
+        now = self.ordinal(period)
+        if self.window and now <= self.window[-1][0]:
+            raise ValueError(f"period {period} is not after the previous one")
+        target = now - self.lag
+        # Keep only the latest entry at or before target, and everything after
+        while len(self.window) > 1 and self.window[1][0] <= target:
+            self.window.popleft()
+        rate = None
+        if self.window and self.window[0][0] <= target:
+            at, previous = self.window[0]
+            if at == target or self.carry_forward:
+                rate = (value / previous - 1) * 100
+        self.window.append((now, value))
+        return rate
+
+
+class AnnualizedChange(RateOperator):
+    """One-period change compounded over periods_per_year (12: annualized MoM)."""
+
+    def __init__(self, periods_per_year: float = 12):
+        self.periods_per_year = periods_per_year
+        self.previous: Optional[float] = None
+
+    def push(self, value: float, period: Optional[int] = None) -> Optional[float]:
+        previous, self.previous = self.previous, value
+        if previous is None:
+            return None
+        return ((value / previous) ** self.periods_per_year - 1) * 100
+
+
+class Rebase(RateOperator):
+    """
+    Levels rebased so the first value equals level.
+
+    When the source switches to a new base (e.g. CPI moving from
+    1967 = 100 to 1982-84 = 100), call relink(old, new) with one period's
+    value on both bases; later values on the new base continue the chain.
+    """
+
+    def __init__(self, level: float = 100.0):
+        self.level = level
+        self.factor: Optional[float] = None
+
+    def push(self, value: float, period: Optional[int] = None) -> Optional[float]:
+        if self.factor is None:
+            self.factor = self.level / value
+        return value * self.factor
+
+    def relink(self, old_value: float, new_value: float):
+        if self.factor is None:
+            raise ValueError("relink() before any value was pushed")
+        self.factor *= old_value / new_value
+
+
+class Cumulative(Rebase):
+    """Percent change since the first value (chain-linked like Rebase)."""
+
+    def __init__(self):
+        super().__init__(level=1.0)
+
+    def push(self, value: float, period: Optional[int] = None) -> Optional[float]:
+        return (super().push(value) - 1) * 100
+
+
+def _pair(rows: Sequence[str], first: IndexSeries, second: IndexSeries) -> IndexPanel:
+    panel = IndexPanel.from_series([first, second])
+    return IndexPanel(list(rows), panel.periods, panel.values)
+
+
+def yoy_comparison(official: IndexSeries, alternative: IndexSeries, lag: int = 12,
+                   rows: Sequence[str] = ('Official CPI', 'Alternative'),
+                   ordinal: Callable[[int], int] = month_ordinal) -> IndexPanel:
+    """YoY rates of two level series on their common periods (fig3)."""
+    return _pair(rows, YoY(lag, ordinal).series(official), YoY(lag, ordinal).series(alternative))
+
+
+def cumulative_comparison(official: IndexSeries, alternative: IndexSeries,
+                          rows: Sequence[str] = ('Official', 'Alternative')) -> IndexPanel:
+    """Cumulative inflation of two level series from their first common period (fig7)."""
+    common = IndexPanel.from_series([official, alternative])
+    first, second = (IndexSeries(common.periods, values) for values in common.values)
+    return _pair(rows, Cumulative().series(first), Cumulative().series(second))
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Single-parse LaTeX transformation pipeline.
+
+The fix_*.py scripts and convert_citations.py each used to read
+inflation_final_humanized.tex, run their own series of whole-document
+replace passes and write it back. They now register their fixes as passes
+here instead. The runner parses the .tex once into segments, applies the
+selected passes in order and writes the file once, only if it changed.
+
+Segments:
+    preamble  - everything up to and including \\begin{document}
+    text      - editable body text
+    verbatim  - verbatim/lstlisting/minted environments, never edited by
+                'preamble' or 'body' passes
+
+Pass scopes:
+    preamble  - applied to the preamble segment
+    body      - applied once to the body, with verbatim blocks masked out
+    document  - applied to the whole source (for fixes that need absolute
+                positions, e.g. "everything after the appendix heading")
+
+Literal replacement lists are compiled into a Replacements table, which
+applies all of its pairs in one regex scan instead of one str.replace
+per pair.
+
+Usage:
+    python latex_pipeline.py                      # run every fix script's passes
+    python latex_pipeline.py fix_latex_refs fix_section_refs
+    python latex_pipeline.py --list
+    python latex_pipeline.py --dry-run
+"""
+
+import argparse
+import importlib
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+TEX_PATH = 'inflation_final_humanized.tex'
+
+# Scripts whose passes make up the full pipeline, in run order
+DEFAULT_SCRIPTS = [
+    'fix_document_structure',
+    'fix_latex_captions',
+    'fix_latex_refs',
+    'fix_section_refs',
+    'fix_sections_final',
+    'fix_all_issues',
+    'fix_layout_issues',
+    'fix_fig_numbers',
+    'convert_citations',
+]
+
+VERBATIM_PATTERN = re.compile(
+    r'\\begin\{(verbatim|lstlisting|minted)\*?\}.*?\\end\{\1\*?\}', re.DOTALL)
+
+# Stands in for a verbatim segment while a body pass runs
+PLACEHOLDER = '\x00{}\x00'
+PLACEHOLDER_PATTERN = re.compile('\x00(\\d+)\x00')
+
+
+# =============================================================================
+# Document representation
+# =============================================================================
+
+@dataclass
+class Segment:
+    kind: str                    # 'preamble', 'text' or 'verbatim'
+    text: str
+
+
+class TexDocument:
+    """A .tex source split once into preamble, body text and verbatim segments."""
+
+    def __init__(self, segments: List[Segment]):
+        self.segments = segments
+
+    @classmethod
+    def parse(cls, source: str) -> 'TexDocument':
+        segments = []
+        marker = source.find('\\begin{document}')
+        if marker != -1:
+            split = marker + len('\\begin{document}')
+            segments.append(Segment('preamble', source[:split]))
+            body = source[split:]
+        else:
+            segments.append(Segment('preamble', ''))
+            body = source
+
+        pos = 0
+        for match in VERBATIM_PATTERN.finditer(body):
+            if match.start() > pos:
+                segments.append(Segment('text', body[pos:match.start()]))
+            segments.append(Segment('verbatim', match.group(0)))
+            pos = match.end()
+        if pos < len(body) or not body:
+            segments.append(Segment('text', body[pos:]))
+        return cls(segments)
+
+    @classmethod
+    def load(cls, path: str) -> 'TexDocument':
+        return cls.parse(Path(path).read_text())
+
+    def source(self) -> str:
+        return ''.join(seg.text for seg in self.segments)
+
+    def save(self, path: str):
+        Path(path).write_text(self.source())
+
+    @property
+    def preamble(self) -> Segment:
+        return self.segments[0]
+
+    def text_segments(self) -> Iterable[Segment]:
+        return (seg for seg in self.segments if seg.kind == 'text')
+
+    def masked_body(self) -> str:
+        """Body text with each verbatim segment replaced by a placeholder."""
+        return ''.join(seg.text if seg.kind == 'text' else PLACEHOLDER.format(i)
+                       for i, seg in enumerate(self.segments) if i > 0)
+
+    def unmask_body(self, body: str):
+        """Rebuild the body segments from masked_body() output."""
+        segments = [self.preamble]
+        parts = PLACEHOLDER_PATTERN.split(body)
+        for i, part in enumerate(parts):
+            if i % 2:
+                segments.append(self.segments[int(part)])
+            elif part or len(parts) == 1:
+                segments.append(Segment('text', part))
+        if sum(seg.kind == 'verbatim' for seg in segments) != \
+                sum(seg.kind == 'verbatim' for seg in self.segments):
+            raise ValueError("A body pass removed or duplicated a verbatim block")
+        self.segments = segments
+
+    def apply(self, latex_pass: 'LatexPass'):
+        """Run one pass over the segments its scope covers."""
+        if latex_pass.scope == 'preamble':
+            self.preamble.text = latex_pass.func(self.preamble.text)
+        elif latex_pass.scope == 'body':
+            self.unmask_body(latex_pass.func(self.masked_body()))
+        elif latex_pass.scope == 'document':
+            self.segments = TexDocument.parse(latex_pass.func(self.source())).segments
+        else:
+            raise ValueError(f"Unknown pass scope: {latex_pass.scope}")
+
+
+# =============================================================================
+# Replacement tables
+# =============================================================================
+
+class Replacements:
+    """
+    A table of literal (old, new) replacements applied in a single scan.
+
+    All keys are compiled into one alternation, longest first, so where
+    two keys overlap the longer one wins. Replacements are simultaneous:
+    the output of one pair is never rescanned by another. Tables whose
+    pairs must chain (A -> B, then B -> C) belong in separate passes.
+    """
+
+    def __init__(self, pairs: Sequence[Tuple[str, str]]):
+        self.mapping: Dict[str, str] = {}
+        for old, new in pairs:
+            self.mapping.setdefault(old, new)
+        keys = sorted(self.mapping, key=len, reverse=True)
+        self.pattern = re.compile('|'.join(map(re.escape, keys))) if keys else None
+
+    def __call__(self, text: str) -> str:
+        if self.pattern is None:
+            return text
+        return self.pattern.sub(lambda m: self.mapping[m.group(0)], text)
+
+    def __len__(self) -> int:
+        return len(self.mapping)
+
+
+# =============================================================================
+# Pass registry
+# =============================================================================
+
+@dataclass
+class LatexPass:
+    script: str                  # Registering script, e.g. 'fix_latex_refs'
+    name: str
+    func: Callable[[str], str]
+    scope: str = 'body'          # 'preamble', 'body' or 'document'
+
+
+PASSES: Dict[str, List[LatexPass]] = {}
+
+
+def latex_pass(script: str, scope: str = 'body'):
+    """Decorator registering func(text) -> text as a pass of script."""
+    def register(func: Callable[[str], str]) -> Callable[[str], str]:
+        PASSES.setdefault(script, []).append(LatexPass(script, func.__name__, func, scope))
+        return func
+    return register
+
+
+def load_passes(scripts: Sequence[str]) -> List[LatexPass]:
+    """Import each script (registering its passes) and return them in order."""
+    passes = []
+    for script in scripts:
+        if script not in PASSES:
+            importlib.import_module(script)
+        if script not in PASSES:
+            raise SystemExit(f"{script} does not register any LaTeX passes")
+        passes.extend(PASSES[script])
+    return passes
+
+
+def run_pipeline(path: str = TEX_PATH, scripts: Optional[Sequence[str]] = None,
+                 dry_run: bool = False) -> bool:
+    """
+    Parse path once, apply the passes of scripts in order, write once.
+
+    Returns True if the document changed.
+    """
+    passes = load_passes(scripts or DEFAULT_SCRIPTS)
+    original = Path(path).read_text()
+    doc = TexDocument.parse(original)
+    for p in passes:
+        doc.apply(p)
+
+    changed = doc.source() != original
+    if changed and not dry_run:
+        doc.save(path)
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply LaTeX fix passes in a single parse.')
+    parser.add_argument('scripts', nargs='*',
+                        help='Scripts whose passes to run, in order (default: all)')
+    parser.add_argument('--tex', default=TEX_PATH, help=f'LaTeX file (default: {TEX_PATH})')
+    parser.add_argument('--list', action='store_true', help='List registered passes and exit')
+    parser.add_argument('--dry-run', action='store_true', help='Run passes without writing')
+    args = parser.parse_args()
+
+    scripts = args.scripts or DEFAULT_SCRIPTS
+    if args.list:
+        for p in load_passes(scripts):
+            print(f"{p.script:<25} {p.name:<35} {p.scope}")
+        return
+
+    changed = run_pipeline(args.tex, scripts, dry_run=args.dry_run)
+    if not changed:
+        print(f"\n{args.tex} already up to date")
+    elif args.dry_run:
+        print(f"\n{args.tex} would change (dry run, not written)")
+    else:
+        print(f"\n{args.tex} written")
+
+
+if __name__ == '__main__':
+    # Run through the importable module so the fix scripts register their
+    # passes in the same PASSES table that main() reads
+    import latex_pipeline
+    latex_pipeline.main()
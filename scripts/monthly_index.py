@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Monthly necessity / discretionary index engine.
+
+compute_necessity_discretionary() compounds one average rate per decade,
+so the published figure has four segments and nothing between its
+breakpoints. This engine builds the same three indices (Necessities,
+Discretionary, Overall) month by month from CPI component series:
+
+    component relatives  r[c, t] = level[c, t] / level[c, t - 1]
+    group links          link[g, t] = sum_c W[g, c] r[c, t]   (one matmul)
+    indices              index[g, t] = index[g, t - 1] * link[g, t]  (cumprod)
+
+W holds each component's relative-importance weight within its group,
+renormalized over the components observed in each month. The Overall
+link mixes the two group links with the same 70/30 split the paper uses.
+
+The engine keeps the last component levels and index values, so
+update() appends a new month in O(components) without recomputing from
+1990, and save()/load() carry that state between runs.
+
+interpolate_rates() is the monthly counterpart of the published
+decade-rate construction: each annual rate is spread evenly over the
+months of its period, which matches compute_necessity_discretionary() at
+every breakpoint.
+
+Usage:
+    engine = NecessityEngine.from_store(SeriesStore())
+    engine.update(202501, {'CUUR0000SAH1': 412.3, ...})
+    engine.panel().to_dicts()
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from index_series import IndexPanel
+from novel_metrics import (
+    discretionary_inflation, discretionary_weight, necessity_inflation, necessity_weight,
+)
+from price_panel import month_range
+
+
+GROUPS = ['Necessities', 'Discretionary']
+ROWS = GROUPS + ['Overall']
+
+# CPI-U component series (not seasonally adjusted) by group, with
+# approximate December 2023 relative importance
+CPI_COMPONENTS: Dict[str, Tuple[str, float]] = {
+    'CUUR0000SAH1': ('Necessities', 36.2),     # Shelter
+    'CUUR0000SAF1': ('Necessities', 13.4),     # Food
+    'CUUR0000SA0E': ('Necessities', 6.7),      # Energy
+    'CUUR0000SAM': ('Necessities', 6.7),       # Medical care
+    'CUUR0000SAS4': ('Necessities', 6.3),      # Transportation services
+    'CUUR0000SAR': ('Discretionary', 5.4),     # Recreation
+    'CUUR0000SAA': ('Discretionary', 2.5),     # Apparel
+    'CUUR0000SAE': ('Discretionary', 5.1),     # Education and communication
+    'CUUR0000SAG': ('Discretionary', 3.2),     # Other goods and services
+}
+
+
+def _last_finite(block: np.ndarray, fallback: np.ndarray) -> np.ndarray:
+    """Last finite value in each row of block (fallback for rows with none)."""
+    finite = np.isfinite(block)
+    last = block.shape[1] - 1 - np.argmax(finite[:, ::-1], axis=1)
+    values = block[np.arange(block.shape[0]), last]
+    return np.where(finite.any(axis=1), values, fallback)
+
+
+class NecessityEngine:
+    """Necessity, discretionary and overall indices built one month at a time."""
+
+    def __init__(self, components: Dict[str, Tuple[str, float]] = CPI_COMPONENTS,
+                 group_weights: Tuple[float, float] = (necessity_weight, discretionary_weight),
+                 base: float = 100.0):
+        self.components = list(components)
+        self.base = base
+        self.weights = np.zeros((len(GROUPS), len(self.components)))
+        for j, (group, weight) in enumerate(components.values()):
+            self.weights[GROUPS.index(group), j] = weight
+        self.group_weights = np.asarray(group_weights, dtype=float)
+
+        self.months: List[int] = []
+        self._blocks: List[np.ndarray] = []         # ROWS x months index blocks
+        self._last_levels: Optional[np.ndarray] = None
+        self._last_index = np.full(len(ROWS), base)
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+    def _links(self, relatives: np.ndarray) -> np.ndarray:
+        """
+        ROWS x months links from components x months relatives. A group
+        with no observed component in a month links at 1 (its index is
+        carried forward).
+        """
+        observed = np.isfinite(relatives)
+        mass = self.weights @ observed
+        with np.errstate(invalid='ignore', divide='ignore'):
+            groups = (self.weights @ np.where(observed, relatives, 0.0)) / mass
+        groups = np.where(mass > 0, groups, 1.0)
+        return np.vstack([groups, self.group_weights @ groups])
+
+    def extend(self, months: Sequence[int], levels: np.ndarray):
+        """
+        Append consecutive months of component levels (components x months).
+
+        The first month ever added is the base period (every index = base).
+        A component missing (NaN) in a month drops out of that month's and
+        the next month's links, with its group's weights renormalized; a
+        group with none of its components carries its last index forward.
+        """
+        levels = np.asarray(levels, dtype=float).reshape(len(self.components), -1)
+        months = [int(m) for m in months]
+        if levels.shape[1] != len(months):
+            raise ValueError(f"{len(months)} months but {levels.shape[1]} columns of levels")
+        if self.months and months and months[0] <= self.months[-1]:
+            raise ValueError(f"month {months[0]} is not after {self.months[-1]}")
+        if not months:
+            return
+
+        if self._last_levels is None:
+            previous = np.concatenate([levels[:, :1], levels[:, :-1]], axis=1)
+        else:
+            previous = np.concatenate([self._last_levels[:, None], levels[:, :-1]], axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            links = self._links(levels / previous)
+
+        block = self._last_index[:, None] * np.cumprod(links, axis=1)
+        self.months.extend(months)
+        self._blocks.append(block)
+        self._last_levels = levels[:, -1]
+        self._last_index = _last_finite(block, self._last_index)
+
+    def update(self, month: int, levels: Dict[str, float]) -> Dict[str, float]:
+        """Add one month of {component: level}; return that month's indices."""
+        column = np.array([levels.get(c, np.nan) for c in self.components])
+        self.extend([month], column[:, None])
+        return dict(zip(ROWS, self._last_index.tolist()))
+
+    def panel(self) -> IndexPanel:
+        """Necessities, Discretionary and Overall over every month added."""
+        if len(self._blocks) > 1:
+            self._blocks = [np.concatenate(self._blocks, axis=1)]
+        values = self._blocks[0] if self._blocks else np.empty((len(ROWS), 0))
+        return IndexPanel(ROWS, self.months, values)
+
+    def save(self, path: str):
+        panel = self.panel()
+        np.savez(path, components=np.array(self.components), months=panel.periods,
+                 values=panel.values, last_levels=self._last_levels,
+                 weights=self.weights, group_weights=self.group_weights, base=self.base)
+
+    @classmethod
+    def load(cls, path: str) -> 'NecessityEngine':
+        data = np.load(path)
+        engine = cls(components={}, group_weights=tuple(data['group_weights']),
+                     base=float(data['base']))
+        engine.components = data['components'].tolist()
+        engine.weights = data['weights']
+        engine.months = data['months'].tolist()
+        engine._blocks = [data['values']]
+        engine._last_levels = data['last_levels']
+        engine._last_index = _last_finite(data['values'], np.full(len(ROWS), engine.base))
+        return engine
+
+    @classmethod
+    def from_store(cls, store, components: Dict[str, Tuple[str, float]] = CPI_COMPONENTS,
+                   start: Optional[int] = None, **kwargs) -> 'NecessityEngine':
+        """Engine over every month the store has for any component."""
+        engine = cls(components, **kwargs)
+        series = {c: store.monthly(c) for c in components if c in store}
+        if not series:
+            raise ValueError("store has none of the component series")
+        first = min(int(s.periods[0]) for s in series.values())
+        months = month_range(max(first, start or first),
+                             max(int(s.periods[-1]) for s in series.values()))
+        levels = np.full((len(components), months.size), np.nan)
+        for j, c in enumerate(components):
+            if c in series:
+                keep = series[c].periods >= months[0]
+                levels[j, np.searchsorted(months, series[c].periods[keep])] = series[c].values[keep]
+        engine.extend(months, levels)
+        return engine
+
+
+def interpolate_rates(
+        necessity_rates: Dict[Tuple[int, int], float] = necessity_inflation,
+        discretionary_rates: Dict[Tuple[int, int], float] = discretionary_inflation,
+        weights: Tuple[float, float] = (necessity_weight, discretionary_weight),
+        base: float = 100.0) -> IndexPanel:
+    """
+    Monthly indices from annual percentage rates keyed by (start, end) year.
+
+    Month codes run from January of the first start year to January of the
+    last end year, so every breakpoint year appears as its January value.
+    """
+    periods = sorted(necessity_rates)
+    months = month_range(periods[0][0] * 100 + 1, periods[-1][1] * 100 + 1)
+    annual = np.zeros((len(ROWS), months.size - 1))
+    for start, end in periods:
+        span = (months[1:] > start * 100 + 1) & (months[1:] <= end * 100 + 1)
+        annual[0, span] = necessity_rates[(start, end)]
+        annual[1, span] = discretionary_rates[(start, end)]
+    annual[2] = np.asarray(weights) @ annual[:2]
+    links = (1 + annual / 100) ** (1 / 12)
+    ones = np.ones((len(ROWS), 1))
+    return IndexPanel(ROWS, months, base * np.cumprod(np.hstack([ones, links]), axis=1))
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Mortgage-aware housing affordability across regions and rate scenarios.
+
+compute_housing_affordability() counts the hours of work behind a 20%
+down payment but not the mortgage that follows it. This engine adds the
+monthly payment on the rest of the price, from the standard annuity
+formula
+
+    payment = loan * r / (1 - (1 + r) ** -n),  r = annual rate / 12,  n = 12 * term
+
+evaluated as one broadcast over scenarios x regions x periods, and
+reports it as a share of monthly full-time income and as hours of work
+per month. Remaining balances after any number of payments follow from
+the same closed form, so amortization schedules never loop over months.
+
+MortgageEngine keeps the regional prices and wages fixed and caches the
+result of each rate scenario by name, so sweeping scenarios re-evaluates
+only the new ones; sweep() evaluates a stack of rate paths in one pass.
+
+Usage:
+    engine = MortgageEngine()                         # national series
+    engine.scenario('Historical').burden              # scenarios x regions x years
+    engine.sweep(np.linspace(0.03, 0.08, 51))         # 51 flat-rate scenarios
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from index_series import IndexPanel, IndexSeries, align_periods
+from novel_metrics import ANNUAL_WORK_HOURS, home_price_series, wage_series
+
+
+# Freddie Mac PMMS 30-year fixed rate, annual averages (percent)
+MORTGAGE_RATE_30Y = {
+    1990: 10.13,
+    1995: 7.93,
+    2000: 8.05,
+    2005: 5.87,
+    2010: 4.69,
+    2015: 3.85,
+    2020: 3.11,
+    2024: 6.72,
+}
+
+historical_rates = IndexSeries.from_dict(MORTGAGE_RATE_30Y, '30-Year Fixed') / 100
+
+DEFAULT_SCENARIOS: Dict[str, Union[float, IndexSeries]] = {
+    'Historical': historical_rates,
+    'Historical +1pp': historical_rates + 0.01,
+    'Historical -1pp': historical_rates - 0.01,
+    'Held at 3%': 0.03,
+    'Held at 7%': 0.07,
+}
+
+
+def monthly_payment(loan, annual_rate, term_years: float = 30):
+    """Level monthly payment on loan; every argument broadcasts."""
+    r = np.asarray(annual_rate, dtype=float) / 12
+    n = term_years * 12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = np.where(r == 0, 1 / n, r / (1 - (1 + r) ** -n))
+    return np.asarray(loan, dtype=float) * factor
+
+
+def remaining_balance(loan, annual_rate, term_years: float = 30, payments_made=0):
+    """Balance left after payments_made level payments; every argument broadcasts."""
+    r = np.asarray(annual_rate, dtype=float) / 12
+    n = term_years * 12
+    k = np.asarray(payments_made, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = np.where(r == 0, 1 - k / n,
+                         ((1 + r) ** n - (1 + r) ** k) / ((1 + r) ** n - 1))
+    return np.asarray(loan, dtype=float) * share
+
+
+@dataclass
+class Affordability:
+    """Mortgage metrics on scenarios x regions x periods arrays."""
+    scenarios: List[str]
+    regions: List[str]
+    periods: np.ndarray
+    rates: np.ndarray            # Annual rate as a fraction
+    payment: np.ndarray          # Monthly principal and interest ($)
+    burden: np.ndarray           # Payment / monthly full-time income
+    hours: np.ndarray            # Hours of work per month to cover the payment
+    total_interest: np.ndarray   # Interest over the full term ($)
+
+    def panel(self, metric: str, scenario: str) -> IndexPanel:
+        """Regions x periods view of one metric under one scenario."""
+        values = getattr(self, metric)[self.scenarios.index(scenario)]
+        return IndexPanel(self.regions, self.periods, values)
+
+
+class MortgageEngine:
+    """Payment burden of buying the median home, cached per rate scenario."""
+
+    def __init__(self, prices: Union[IndexSeries, IndexPanel] = home_price_series,
+                 wages: Union[IndexSeries, IndexPanel] = wage_series,
+                 down_payment_pct: float = 0.20, term_years: float = 30,
+                 scenarios: Optional[Dict[str, Union[float, IndexSeries]]] = None):
+        """
+        prices and wages are regions x periods panels (hourly wages), or
+        national series; a wage series is shared by every region.
+        """
+        if isinstance(prices, IndexSeries):
+            prices = IndexPanel.from_series([prices])
+        if isinstance(wages, IndexSeries):
+            wages = IndexPanel([wages.name], wages.periods, wages.values[None, :])
+        self.periods, ip, iw = align_periods(prices.periods, wages.periods)
+        self.regions = prices.labels
+        self.prices = prices.values[:, ip]
+        self.wages = wages.values[:, iw]
+        if self.wages.shape[0] not in (1, self.prices.shape[0]):
+            raise ValueError("wages need one row, or one row per price region")
+        self.down_payment_pct = down_payment_pct
+        self.term_years = term_years
+        self.scenarios = dict(DEFAULT_SCENARIOS if scenarios is None else scenarios)
+        self._results: Dict[str, Affordability] = {}
+
+    def _rate_path(self, rates: Union[float, IndexSeries, IndexPanel]) -> np.ndarray:
+        """
+        A scenario's rates as a (1 or regions) x periods array; a rate
+        series or panel must cover every engine period (KeyError if not).
+        """
+        if isinstance(rates, IndexSeries):
+            return rates.at(self.periods).values[None, :]
+        if isinstance(rates, IndexPanel):
+            common, _, ir = align_periods(self.periods, rates.periods)
+            if common.size != self.periods.size:
+                missing = np.setdiff1d(self.periods, common)
+                raise KeyError(f"rate panel has no values for periods {missing.tolist()}")
+            return rates.values[:, ir]
+        return np.full((1, self.periods.size), float(rates))
+
+    def _evaluate(self, names: Sequence[str], rates: np.ndarray) -> Affordability:
+        """Metrics for a scenarios x (1 or regions) x periods rate array."""
+        loan = self.prices * (1 - self.down_payment_pct)
+        payment = monthly_payment(loan[None], rates, self.term_years)
+        income = self.wages * ANNUAL_WORK_HOURS / 12
+        payment = np.broadcast_to(payment, (len(names),) + self.prices.shape)
+        return Affordability(
+            scenarios=list(names),
+            regions=list(self.regions),
+            periods=self.periods,
+            rates=np.broadcast_to(rates, payment.shape),
+            payment=payment,
+            burden=payment / income[None],
+            hours=payment / self.wages[None],
+            total_interest=payment * self.term_years * 12 - loan[None])
+
+    def add_scenario(self, name: str, rates: Union[float, IndexSeries, IndexPanel]):
+        """Register (or replace) a named rate scenario."""
+        self.scenarios[name] = rates
+        self._results.pop(name, None)
+
+    def scenario(self, name: str) -> Affordability:
+        """Metrics under one named scenario, computed once and cached."""
+        if name not in self._results:
+            rates = self._rate_path(self.scenarios[name])
+            self._results[name] = self._evaluate([name], rates[None])
+        return self._results[name]
+
+    def compare(self, names: Optional[Sequence[str]] = None) -> Affordability:
+        """Several named scenarios stacked on the scenario axis."""
+        names = list(self.scenarios) if names is None else list(names)
+        results = [self.scenario(n) for n in names]
+        return Affordability(
+            scenarios=names, regions=list(self.regions), periods=self.periods,
+            **{field: np.concatenate([getattr(r, field) for r in results])
+               for field in ('rates', 'payment', 'burden', 'hours', 'total_interest')})
+
+    def sweep(self, rates) -> Affordability:
+        """
+        Uncached evaluation of many rate scenarios at once.
+
+        rates is a 1-D array of flat annual rates, or scenarios x periods /
+        scenarios x regions x periods rate paths.
+        """
+        rates = np.asarray(rates, dtype=float)
+        if rates.ndim == 1:
+            rates = np.broadcast_to(rates[:, None, None], (rates.size, 1, self.periods.size))
+        elif rates.ndim == 2:
+            rates = rates[:, None, :]
+        names = [f'Scenario {i}' for i in range(rates.shape[0])]
+        return self._evaluate(names, rates)
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Novel Inflation Metrics: computation layer.
+
+Data and pure computation for the metrics proposed in Section 6 of
+"Measuring What Matters". Nothing here imports matplotlib or touches the
+filesystem, so services and batch jobs can compute index variants without
+paying for figure rendering. novel_metrics_analysis.py draws the figures
+on top of these functions.
+
+Every compute_* function takes its inputs as keyword arguments that
+default to the published series, and returns an IndexPanel: use
+`.values` for the raw array or `.to_dicts()` for {row: {year: value}}
+records.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from index_series import IndexPanel, IndexSeries, compound
+
+# =============================================================================
+# DATA: Compiled from BLS, FRED, and other public sources
+# =============================================================================
+
+# Years for analysis
+years = [1990, 1995, 2000, 2005, 2010, 2015, 2020, 2024]
+
+# Median hourly wage (all workers, nominal dollars)
+# Source: BLS Current Population Survey / FRED
+median_hourly_wage = {
+    1990: 10.01,
+    1995: 11.43,
+    2000: 13.74,
+    2005: 15.57,
+    2010: 16.71,
+    2015: 17.98,
+    2020: 19.33,
+    2024: 23.53  # Q3 2024 estimate
+}
+
+# Average prices for common goods (BLS Average Price Data)
+# Milk (per gallon)
+milk_price = {
+    1990: 2.15,
+    1995: 2.48,
+    2000: 2.78,
+    2005: 3.24,
+    2010: 3.32,
+    2015: 3.42,
+    2020: 3.54,
+    2024: 4.05
+}
+
+# Eggs (per dozen, Grade A large)
+egg_price = {
+    1990: 1.01,
+    1995: 1.16,
+    2000: 0.96,
+    2005: 1.35,
+    2010: 1.79,
+    2015: 2.03,
+    2020: 1.48,
+    2024: 3.20  # Elevated due to avian flu
+}
+
+# Ground beef (per pound)
+beef_price = {
+    1990: 1.63,
+    1995: 1.54,
+    2000: 1.63,
+    2005: 2.30,
+    2010: 2.89,
+    2015: 4.24,
+    2020: 4.17,
+    2024: 5.44
+}
+
+# Gasoline (per gallon, regular)
+gas_price = {
+    1990: 1.16,
+    1995: 1.15,
+    2000: 1.51,
+    2005: 2.30,
+    2010: 2.79,
+    2015: 2.43,
+    2020: 2.17,
+    2024: 3.31
+}
+
+# Median home price (existing single-family)
+# Source: Federal Reserve, NAR
+home_price = {
+    1990: 95500,
+    1995: 113100,
+    2000: 139000,
+    2005: 219600,
+    2010: 173100,
+    2015: 223900,
+    2020: 296500,
+    2024: 412300
+}
+
+# S&P 500 index (year-end)
+sp500 = {
+    1990: 330,
+    1995: 616,
+    2000: 1320,
+    2005: 1248,
+    2010: 1258,
+    2015: 2044,
+    2020: 3756,
+    2024: 5881
+}
+
+# Case-Shiller National Home Price Index (Jan 2000 = 100)
+case_shiller = {
+    1990: 63.0,  # Estimated backcast
+    1995: 72.4,  # Estimated backcast
+    2000: 100.0,
+    2005: 151.3,
+    2010: 126.7,
+    2015: 152.5,
+    2020: 199.6,
+    2024: 318.0
+}
+
+# CPI-U (1982-84 = 100)
+cpi_u = {
+    1990: 130.7,
+    1995: 152.4,
+    2000: 172.2,
+    2005: 195.3,
+    2010: 218.1,
+    2015: 237.0,
+    2020: 258.8,
+    2024: 314.5
+}
+
+# CPI component weights (approximate, 2024)
+# Necessities: shelter, food, energy, medical care, transportation (basic)
+# Discretionary: recreation, apparel, education/communication, other
+necessity_weight = 0.70  # ~70% of CPI is necessities
+discretionary_weight = 0.30
+
+# Approximate necessity vs discretionary inflation rates by period
+# Based on BLS component data showing necessities rose faster 2020-2024
+necessity_inflation = {
+    (1990, 2000): 2.8,  # Annual %
+    (2000, 2010): 2.6,
+    (2010, 2020): 1.9,
+    (2020, 2024): 5.8   # Higher due to shelter, food, energy
+}
+
+discretionary_inflation = {
+    (1990, 2000): 2.1,
+    (2000, 2010): 1.8,
+    (2010, 2020): 0.9,
+    (2020, 2024): 3.2
+}
+
+# Array-backed views of the series above on the shared `years` axis
+wage_series = IndexSeries.from_dict(median_hourly_wage, 'Median Hourly Wage')
+goods_prices = IndexPanel.from_dicts({
+    'Gallon of Milk': milk_price,
+    'Dozen Eggs': egg_price,
+    'Pound of Ground Beef': beef_price,
+    'Gallon of Gasoline': gas_price,
+}, periods=years)
+home_price_series = IndexSeries.from_dict(home_price, 'Median Home Price')
+cpi_series = IndexSeries.from_dict(cpi_u, 'CPI-U')
+case_shiller_series = IndexSeries.from_dict(case_shiller, 'Case-Shiller')
+sp500_series = IndexSeries.from_dict(sp500, 'S&P 500')
+
+# Series IDs of the published inputs in BLS/FRED exports, with the
+# calendar-year aggregation and unit scale used to match the dicts above.
+# Loaded through series_store.SeriesStore by store_inputs().
+SERIES_SOURCES = {
+    'wage_series': ('LES1252881600Q', 'mean', 1 / 40),   # weekly earnings -> hourly
+    'Gallon of Milk': ('APU0000709112', 'mean', 1.0),
+    'Dozen Eggs': ('APU0000708111', 'mean', 1.0),
+    'Pound of Ground Beef': ('APU0000703112', 'mean', 1.0),
+    'Gallon of Gasoline': ('APU000074714', 'mean', 1.0),
+    'home_price_series': ('MSPUS', 'mean', 1.0),
+    'cpi_series': ('CPIAUCNS', 'mean', 1.0),
+    'case_shiller_series': ('CSUSHPINSA', 'mean', 1.0),
+    'sp500_series': ('SP500', 'last', 1.0),              # year-end close
+}
+
+
+def store_inputs(store, periods: Optional[Sequence[int]] = None) -> Dict[str, object]:
+    """
+    Annual inputs read from a series_store.SeriesStore instead of the dicts.
+
+    Returns {'wage_series', 'goods_prices', 'home_price_series', 'cpi_series',
+    'case_shiller_series', 'sp500_series'} shaped like the module-level
+    values, for passing to the compute_* functions. Inputs whose series is
+    not in the store keep their published values; stored series are
+    restricted to periods (calendar years) if given. goods_prices covers
+    the years all four goods share.
+    """
+    def load(key: str, default: IndexSeries) -> IndexSeries:
+        series_id, how, scale = SERIES_SOURCES[key]
+        if series_id not in store:
+            return default
+        series = store.annual(series_id, how=how) * scale
+        series.name = default.name
+        return series if periods is None else series.at(periods)
+
+    inputs: Dict[str, object] = {
+        'wage_series': load('wage_series', wage_series),
+        'home_price_series': load('home_price_series', home_price_series),
+        'cpi_series': load('cpi_series', cpi_series),
+        'case_shiller_series': load('case_shiller_series', case_shiller_series),
+        'sp500_series': load('sp500_series', sp500_series),
+    }
+    inputs['goods_prices'] = IndexPanel.from_series(
+        [load(label, goods_prices.row(label)) for label in goods_prices.labels])
+    return inputs
+
+
+# =============================================================================
+# METRIC 1: Time-Cost Index
+# Minutes of median-wage work to purchase one unit of each good
+# =============================================================================
+
+def compute_time_cost(prices: IndexPanel = goods_prices,
+                      wage: IndexSeries = wage_series) -> IndexPanel:
+    """Minutes of work needed to purchase one unit of each good (goods x years)."""
+    return prices.ratio(wage, scale=60)
+
+# =============================================================================
+# METRIC 2: Necessity vs Discretionary CPI
+# Separate indices for essential vs optional spending
+# =============================================================================
+
+def compute_necessity_discretionary(
+        necessity_rates: Dict[Tuple[int, int], float] = necessity_inflation,
+        discretionary_rates: Dict[Tuple[int, int], float] = discretionary_inflation,
+        weights: Tuple[float, float] = (necessity_weight, discretionary_weight),
+        base: float = 100.0) -> IndexPanel:
+    """
+    Compound period rates into necessity, discretionary and overall indices.
+
+    Rates are annual percentages keyed by (start, end) period; the overall
+    index compounds the weighted average of the two rates. Rows are
+    'Necessities', 'Discretionary' and 'Overall'.
+    """
+    periods = sorted(necessity_rates)
+    breakpoints = [periods[0][0]] + [end for _, end in periods]
+
+    nec = np.array([necessity_rates[p] for p in periods]) / 100
+    disc = np.array([discretionary_rates[p] for p in periods]) / 100
+    overall = weights[0] * nec + weights[1] * disc
+
+    indices = compound(breakpoints, np.vstack([nec, disc, overall]), base=base)
+    return IndexPanel(['Necessities', 'Discretionary', 'Overall'],
+                      indices.periods, indices.values)
+
+# =============================================================================
+# METRIC 3: Asset-Adjusted Inflation Index
+# CPI augmented with financial and housing asset prices
+# =============================================================================
+
+def compute_asset_adjusted(weights: Sequence[float] = (0.70, 0.20, 0.10),
+                           base_year: int = 2000,
+                           cpi: IndexSeries = cpi_series,
+                           housing: IndexSeries = case_shiller_series,
+                           equities: IndexSeries = sp500_series) -> IndexPanel:
+    """
+    CPI, housing and equity prices rebased to base_year = 100, plus their
+    weighted combination.
+
+    Rows are 'CPI', 'Housing', 'Equities' and 'Asset-Adjusted'.
+    """
+    components = IndexPanel.from_series([cpi, housing, equities]).rebase(base_year)
+    adjusted = components.weighted_sum(weights)
+    return IndexPanel(['CPI', 'Housing', 'Equities', 'Asset-Adjusted'], components.periods,
+                      np.vstack([components.values, adjusted.values]))
+
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+HISTOGRAM_BINS = 4096
+
+
+def _draw_chunks(values: np.ndarray, alpha: np.ndarray, rng: np.random.Generator,
+                 n_draws: int, chunk_size: int):
+    """Years x draws blocks of index values for successive chunks of weight draws."""
+    for lo in range(0, n_draws, chunk_size):
+        draws = rng.dirichlet(alpha, size=min(chunk_size, n_draws - lo))
+        yield values.T @ draws.T
+
+
+def _lerp(a: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """np.percentile's linear interpolation between neighbouring order statistics."""
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
+def _streamed_percentiles(values: np.ndarray, alpha: np.ndarray, rng: np.random.Generator,
+                          n_draws: int, chunk_size: int, percentiles: Sequence[float],
+                          bins: int = HISTOGRAM_BINS) -> np.ndarray:
+    """
+    The same percentiles as np.percentile over all draws, holding one
+    chunk at a time.
+
+    The draws are replayed from the same generator state in three passes:
+    the first finds each year's range, the second counts draws into fixed
+    bins over it, and the third keeps only the values in the bins holding
+    the order statistics the percentiles need (as distinct values and
+    their counts), which are then picked exactly.
+    """
+    n_years = values.shape[1]
+    rows = np.arange(n_years)[:, None]
+    state = rng.bit_generator.state
+
+    low, high = np.full(n_years, np.inf), np.full(n_years, -np.inf)
+    for block in _draw_chunks(values, alpha, rng, n_draws, chunk_size):
+        low, high = np.minimum(low, block.min(axis=1)), np.maximum(high, block.max(axis=1))
+    width = np.where(high > low, (high - low) / bins, 1.0)
+
+    def bin_of(block, y=rows):
+        return np.clip(((block - low[y]) / width[y]).astype(np.int64), 0, bins - 1)
+
+    rng.bit_generator.state = state
+    counts = np.zeros(n_years * bins, dtype=np.int64)
+    for block in _draw_chunks(values, alpha, rng, n_draws, chunk_size):
+        counts += np.bincount((bin_of(block) + rows * bins).ravel(), minlength=n_years * bins)
+    counts = counts.reshape(n_years, bins)
+    below = np.cumsum(counts, axis=1) - counts          # Draws in lower bins
+
+    # Order statistics either side of each percentile's position
+    position = np.asarray(percentiles, dtype=float) / 100 * (n_draws - 1)
+    k0 = np.floor(position).astype(np.int64)
+    ranks = np.concatenate([k0, np.minimum(k0 + 1, n_draws - 1)])
+    target = np.stack([np.searchsorted(below[y], ranks, side='right') - 1
+                       for y in range(n_years)])       # years x ranks -> bin
+    wanted = np.zeros((n_years, bins), dtype=bool)
+    wanted[rows, target] = True
+
+    rng.bit_generator.state = state
+    kept = [(np.empty(0), np.empty(0, dtype=np.int64)) for _ in range(n_years)]
+    for block in _draw_chunks(values, alpha, rng, n_draws, chunk_size):
+        mask = wanted[rows, bin_of(block)]
+        for y in range(n_years):
+            found = np.concatenate([kept[y][0], block[y, mask[y]]])
+            weight = np.concatenate([kept[y][1], np.ones(int(mask[y].sum()), dtype=np.int64)])
+            distinct, inverse = np.unique(found, return_inverse=True)
+            kept[y] = distinct, np.bincount(inverse, weights=weight).astype(np.int64)
+
+    picked = np.empty((n_years, ranks.size))
+    for y in range(n_years):
+        distinct, weight = kept[y]
+        in_bin = bin_of(distinct, y)
+        for j, (rank, b) in enumerate(zip(ranks, target[y])):
+            here = in_bin == b
+            ends = np.cumsum(weight[here])
+            picked[y, j] = distinct[here][np.searchsorted(ends, rank - below[y, b], side='right')]
+    return _lerp(picked[:, :k0.size], picked[:, k0.size:], position - k0).T
+
+
+def compute_asset_adjusted_bands(n_draws: int = 100_000,
+                                 weights: Sequence[float] = (0.70, 0.20, 0.10),
+                                 concentration: float = 50.0,
+                                 percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                                 chunk_size: Optional[int] = None,
+                                 seed: Optional[int] = 0,
+                                 base_year: int = 2000,
+                                 cpi: IndexSeries = cpi_series,
+                                 housing: IndexSeries = case_shiller_series,
+                                 equities: IndexSeries = sp500_series) -> IndexPanel:
+    """
+    Percentile bands of the Asset-Adjusted index under uncertain weights.
+
+    Weight vectors are drawn from Dirichlet(concentration * weights), so
+    they average to the published weights and concentrate around them as
+    concentration grows. Each chunk of draws is evaluated as one
+    (draws x 3) @ (3 x years) product. Without chunk_size every draw's
+    result is kept and the percentiles are taken directly; with
+    chunk_size the draws are streamed twice (see _streamed_percentiles)
+    and peak memory scales with chunk_size, not n_draws, for the same
+    bands. Rows are labelled 'P5', 'P50' and so on.
+    """
+    components = IndexPanel.from_series([cpi, housing, equities]).rebase(base_year)
+    alpha = concentration * np.asarray(weights, dtype=float) / np.sum(weights)
+    rng = np.random.default_rng(seed)
+
+    if chunk_size is None or chunk_size >= n_draws:
+        results = next(_draw_chunks(components.values, alpha, rng, n_draws, n_draws))
+        bands = np.percentile(results, percentiles, axis=1, overwrite_input=True)
+    else:
+        bands = _streamed_percentiles(components.values, alpha, rng, n_draws, chunk_size,
+                                      percentiles)
+    return IndexPanel([f'P{p:g}' for p in percentiles], components.periods, bands)
+
+# =============================================================================
+# METRIC 4: First-Time Buyer Affordability Index
+# Hours of median-wage work for 20% down payment on median home
+# =============================================================================
+
+ANNUAL_WORK_HOURS = 2080  # 40 hrs/week * 52 weeks
+
+
+def compute_housing_affordability(down_payment_pct: float = 0.20,
+                                  prices: IndexSeries = home_price_series,
+                                  wage: IndexSeries = wage_series) -> IndexPanel:
+    """
+    Work needed for a down payment on the median home.
+
+    Rows are 'Hours' of median-wage work and 'Years of Work' at full time.
+    """
+    hours = (prices * down_payment_pct).ratio(wage)
+    return IndexPanel(['Hours', 'Years of Work'], hours.periods,
+                      np.vstack([hours.values, hours.values / ANNUAL_WORK_HOURS]))
+
+# =============================================================================
+# METRIC 5: Grocery Basket Time-Cost Over Time
+# Composite index for a basic grocery basket
+# =============================================================================
+
+# Approximate weekly needs for family of 4 (simplified for demonstration)
+GROCERY_BASKET = {
+    'Gallon of Milk': 2,
+    'Dozen Eggs': 2,
+    'Pound of Ground Beef': 3,
+}
+
+
+def compute_grocery_basket(basket: Dict[str, float] = GROCERY_BASKET,
+                           prices: IndexPanel = goods_prices,
+                           wage: IndexSeries = wage_series) -> IndexPanel:
+    """
+    Dollar cost and minutes of work for a basket of goods.
+
+    basket maps good names in prices to quantities; goods not listed get
+    zero weight. Rows are 'Dollar Cost' and 'Minutes of Work'.
+    """
+    cost = prices.weighted_sum({label: basket.get(label, 0) for label in prices.labels})
+    minutes = cost.ratio(wage, scale=60)
+    return IndexPanel(['Dollar Cost', 'Minutes of Work'], cost.periods,
+                      np.vstack([cost.values, minutes.values]))
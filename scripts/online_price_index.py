@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Streaming daily online-price index from scraped price snapshots.
+
+fig3 compares official CPI with Truflation, a daily index built from
+online prices in the style of the Billion Prices Project. This module
+builds such an index from local snapshot files, one per day:
+
+    snapshots/2024-03-01.csv     item_id,price[,...]
+    snapshots/2024-03-02.csv     (only items whose price was scraped that day)
+
+The index is a chained daily Jevons over matched items, as in Cavallo
+and Rigobon (2016): each item's price is carried forward until it is
+scraped again, so items without a new price contribute a relative of 1
+and the day's link is
+
+    link = exp( sum over changed items of log(p_new / p_old) / matched items )
+
+Only the items in a day's snapshot are touched, so an update costs
+O(items in the snapshot), not O(catalog). Items not scraped for
+max_stale_days drop out of the active set (tracked in per-day buckets,
+so expiring them is also proportional to the items expired).
+
+The state (last price per item, index level, monthly running means and
+the snapshots already read) is pickled between runs; each run reads only
+new snapshot files. A daily YoY rate is kept alongside the level with the
+streaming operator from inflation_rates.py; monthly_means() and
+compare_with_cpi() give the monthly averages and the YoY comparison fig3
+plots.
+
+Usage:
+    python online_price_index.py snapshots/
+    python online_price_index.py snapshots/ --cpi CPIAUCNS --tail 30
+"""
+
+import argparse
+import csv
+import math
+import pickle
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from atomic_write import write_atomic
+from index_series import IndexPanel, IndexSeries
+from inflation_rates import YoY, day_ordinal, yoy_comparison
+
+
+# Pickled state from another version of OnlinePriceIndex is discarded on load
+STATE_VERSION = 3
+
+STATE_FILENAME = '.online_index.pickle'
+SNAPSHOT_NAME = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})\.csv$')
+MAX_STALE_DAYS = 60
+DAYS_PER_YEAR = 365
+
+
+def snapshot_day(path: Path) -> Optional[int]:
+    """YYYYMMDD day code from a snapshot file name, or None."""
+    match = SNAPSHOT_NAME.search(path.name)
+    return int(''.join(match.groups())) if match else None
+
+
+def read_snapshot(path: Path) -> Iterable[Tuple[str, float]]:
+    """Stream (item_id, price) rows from one snapshot, skipping bad prices."""
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            try:
+                price = float(row['price'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if price > 0:
+                yield row['item_id'], price
+
+
+class OnlinePriceIndex:
+    """Chained daily Jevons index updated from per-day price snapshots."""
+
+    def __init__(self, base: float = 100.0, max_stale_days: int = MAX_STALE_DAYS):
+        self.max_stale_days = max_stale_days
+        self.level = base
+        self.last_price: Dict[str, float] = {}
+        self.last_seen: Dict[str, int] = {}          # item -> ordinal day
+        self._seen_on: Dict[int, Set[str]] = {}      # ordinal day -> items last seen then
+        self.days: List[int] = []
+        self.levels: List[float] = []
+        self._month_sums: Dict[int, List[float]] = {}  # YYYYMM -> [sum, count]
+        # The level holds on days without a snapshot, so a missing day a
+        # year back is read as the last level before it
+        self._yoy = YoY(DAYS_PER_YEAR, day_ordinal, carry_forward=True)
+        self.yoy: List[Optional[float]] = []             # Daily YoY %, None for year one
+        self.read_files: Set[str] = set()
+
+    # -------------------------------------------------------------------------
+    # Updating
+    # -------------------------------------------------------------------------
+
+    def _expire(self, today: int):
+        """Drop items last seen more than max_stale_days before today."""
+        cutoff = today - self.max_stale_days
+        for day in [d for d in self._seen_on if d < cutoff]:
+            for item in self._seen_on.pop(day):
+                del self.last_price[item]
+                del self.last_seen[item]
+
+    def add_day(self, day: int, observations: Iterable[Tuple[str, float]]) -> float:
+        """Apply one day's (item, price) observations; return the index level."""
+        if self.days and day <= self.days[-1]:
+            raise ValueError(f"day {day} is not after {self.days[-1]}")
+        today = day_ordinal(day)
+        self._expire(today)
+
+        matched = len(self.last_price)
+        log_change = 0.0
+        for item, price in observations:
+            old = self.last_price.get(item)
+            if old is not None:
+                log_change += math.log(price / old)
+                self._seen_on[self.last_seen[item]].discard(item)
+            self.last_price[item] = price
+            self.last_seen[item] = today
+            self._seen_on.setdefault(today, set()).add(item)
+
+        # Items first seen today have no relative yet; they join the
+        # matched set from tomorrow
+        if matched:
+            self.level *= math.exp(log_change / matched)
+        self.days.append(day)
+        self.levels.append(self.level)
+        self.yoy.append(self._yoy.push(self.level, day))
+        month = self._month_sums.setdefault(day // 100, [0.0, 0])
+        month[0] += self.level
+        month[1] += 1
+        return self.level
+
+    def read_directory(self, directory: str) -> List[int]:
+        """Apply every snapshot in directory not read before; return the new days."""
+        pending = sorted((snapshot_day(p), p) for p in Path(directory).glob('*.csv')
+                         if snapshot_day(p) and p.name not in self.read_files)
+        added = []
+        for day, path in pending:
+            if self.days and day <= self.days[-1]:
+                print(f"Skipping {path.name}: not after {self.days[-1]}")
+                continue
+            self.add_day(day, read_snapshot(path))
+            self.read_files.add(path.name)
+            added.append(day)
+        return added
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'OnlinePriceIndex':
+        """Load pickled state from path, or start a new index."""
+        try:
+            with open(path, 'rb') as f:
+                version, index = pickle.load(f)
+            if version == STATE_VERSION:
+                return index
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError,
+                AttributeError, ImportError):
+            pass
+        return cls(**kwargs)
+
+    def save(self, path: str):
+        write_atomic(path, pickle.dumps((STATE_VERSION, self), protocol=pickle.HIGHEST_PROTOCOL))
+
+    # -------------------------------------------------------------------------
+    # Views
+    # -------------------------------------------------------------------------
+
+    def daily(self) -> IndexSeries:
+        return IndexSeries(self.days, self.levels, 'Online')
+
+    def monthly_means(self) -> IndexSeries:
+        """Average daily level per YYYYMM month."""
+        months = sorted(self._month_sums)
+        return IndexSeries(months, [self._month_sums[m][0] / self._month_sums[m][1]
+                                    for m in months], 'Online')
+
+
+def compare_with_cpi(index: OnlinePriceIndex, cpi: IndexSeries) -> IndexPanel:
+    """YoY % of the online index's monthly means and of monthly CPI, as fig3 plots."""
+    return yoy_comparison(cpi, index.monthly_means(), lag=12, rows=('Official CPI', 'Online'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Update a daily online-price index.')
+    parser.add_argument('snapshots', help='Directory of YYYY-MM-DD.csv price snapshots')
+    parser.add_argument('--state', help=f'State file (default: SNAPSHOTS/{STATE_FILENAME})')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore saved state')
+    parser.add_argument('--tail', type=int, default=10, help='Days to print (default: 10)')
+    parser.add_argument('--cpi', metavar='SERIES_ID',
+                        help='Compare YoY with this monthly series from the series store')
+    args = parser.parse_args()
+
+    state = args.state or str(Path(args.snapshots) / STATE_FILENAME)
+    index = OnlinePriceIndex() if args.rebuild else OnlinePriceIndex.load(state)
+    added = index.read_directory(args.snapshots)
+    index.save(state)
+    print(f"Read {len(added)} new snapshots; {len(index.days)} days, "
+          f"{len(index.last_price)} active items")
+
+    for day, level in list(zip(index.days, index.levels))[-args.tail:]:
+        print(f"  {day}  {level:10.3f}")
+
+    if args.cpi:
+        from series_store import SeriesStore
+        comparison = compare_with_cpi(index, SeriesStore().monthly(args.cpi))
+        print(f"\n{'Month':<8}{'CPI YoY':>10}{'Online YoY':>12}")
+        for month, (cpi, online) in zip(comparison.periods.tolist(), comparison.values.T):
+            print(f"{month:<8}{cpi:>10.2f}{online:>12.2f}")
+
+
+if __name__ == '__main__':
+    # Run through the importable module so pickled state references
+    # online_price_index.OnlinePriceIndex rather than __main__
+    import online_price_index
+    online_price_index.main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Post-render optimization of the PNG figures.
+
+matplotlib writes 32-bit RGBA PNGs at a moderate compression level. The
+figures are flat-colored charts, so a 256-color palette holds them
+without visible loss, and a palette PNG is a fraction of the size. Each
+figure is rewritten in place as the smallest of
+
+    palette   quantized to COLORS colors (median cut; octree when the
+              image has transparency), no dithering, maximum compression
+    lossless  the original pixels at maximum compression
+
+and left alone when neither is smaller. --lossless skips quantization.
+
+Results are cached by the hash of the rendered file: the optimized bytes
+are kept under figures/.png_cache/, and a manifest maps each source hash
+to its result, so an unchanged figure that is rendered again (e.g. with
+--force) is restored from the cache instead of being re-quantized, and a
+file that is already optimized is skipped. Figure-cache entries
+(figure_cache.py) are carried over to the optimized files, so
+optimizing a figure does not make it look stale to the renderer.
+
+Usage:
+    python scripts/png_optimize.py                  # every PNG in figures/
+    python scripts/png_optimize.py -j 0 --lossless  # all cores, no quantizing
+    python scripts/generate_figures.py --optimize   # render, then optimize
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from atomic_write import write_atomic
+from figure_cache import FigureCache
+
+
+# Results cached under another version (e.g. another quantizer) are redone
+CACHE_VERSION = 1
+
+CACHE_DIR = 'figures/.png_cache'
+MANIFEST_NAME = 'manifest.json'
+COLORS = 256
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _encode(img: Image.Image, info: dict) -> bytes:
+    buf = io.BytesIO()
+    kwargs = {'dpi': info['dpi']} if 'dpi' in info else {}
+    img.save(buf, format='PNG', optimize=True, **kwargs)
+    return buf.getvalue()
+
+
+def quantize(img: Image.Image, colors: int = COLORS) -> Image.Image:
+    """Palette image of img without dithering (alpha kept when it is used)."""
+    if img.mode != 'RGBA':
+        img = img.convert('RGB')
+    elif img.getextrema()[3][0] == 255:
+        img = img.convert('RGB')
+    method = Image.Quantize.MEDIANCUT if img.mode == 'RGB' else Image.Quantize.FASTOCTREE
+    return img.quantize(colors=colors, method=method, dither=Image.Dither.NONE)
+
+
+def optimize_bytes(data: bytes, colors: Optional[int] = COLORS) -> Tuple[bytes, str]:
+    """
+    Smallest encoding of a PNG and the method that produced it ('palette',
+    'lossless' or 'original'). colors=None skips quantization.
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        candidates = [(data, 'original'), (_encode(img, img.info), 'lossless')]
+        if colors:
+            candidates.append((_encode(quantize(img, colors), img.info), 'palette'))
+    return min(candidates, key=lambda c: len(c[0]))
+
+
+def _optimize_file(path: str, source_hash: str, colors: Optional[int],
+                   cache_dir: str) -> Tuple[str, str, Dict[str, object]]:
+    """Worker: optimize one file in place and store the result under cache_dir."""
+    data = Path(path).read_bytes()
+    optimized, method = optimize_bytes(data, colors)
+    write_atomic(Path(cache_dir) / f'{source_hash}-{colors or 0}.png', optimized)
+    if method != 'original':
+        write_atomic(Path(path), optimized)
+    return path, source_hash, {'output_hash': _sha256(optimized), 'method': method,
+                               'bytes_in': len(data), 'bytes_out': len(optimized)}
+
+
+class PngOptimizer:
+    """Palette-quantizes and recompresses PNGs, cached by source hash."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, colors: Optional[int] = COLORS):
+        self.cache_dir = Path(cache_dir)
+        self.colors = colors
+        self.manifest_path = self.cache_dir / MANIFEST_NAME
+        self.entries = self._load()
+
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.manifest_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        return data.get('results', {})
+
+    def _save(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.manifest_path, json.dumps({'version': CACHE_VERSION, 'results': self.entries},
+                                                    indent=2, sort_keys=True))
+
+    def _key(self, source_hash: str) -> str:
+        return f'{source_hash}-{self.colors or 0}'
+
+    def optimize(self, paths: Sequence[str], jobs: int = 1) -> Dict[str, Dict[str, object]]:
+        """
+        Optimize each PNG in place; return {path: result} where result has
+        'status' ('optimized', 'restored' or 'current') and byte counts.
+        jobs > 1 quantizes in a process pool (jobs <= 0: one worker per CPU
+        core); cache lookups and restores happen in this process.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        done_hashes = {entry['output_hash'] for entry in self.entries.values()}
+        results: Dict[str, Dict[str, object]] = {}
+        rewritten: List[Tuple[str, str]] = []
+        pending = []
+
+        for path in paths:
+            data = Path(path).read_bytes()
+            source_hash = _sha256(data)
+            entry = self.entries.get(self._key(source_hash))
+            blob = self.cache_dir / f'{self._key(source_hash)}.png'
+            if (entry is None and source_hash in done_hashes
+                    or entry is not None and entry['output_hash'] == source_hash):
+                results[path] = {'status': 'current', 'bytes_in': len(data), 'bytes_out': len(data)}
+            elif entry is not None and blob.exists():
+                # Rendered again from unchanged content: reuse the stored result
+                write_atomic(Path(path), blob.read_bytes())
+                rewritten.append((path, source_hash))
+                results[path] = {'status': 'restored', **entry}
+            else:
+                pending.append((path, source_hash))
+
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        jobs = max(1, min(jobs, len(pending)))
+        args = [(path, h, self.colors, str(self.cache_dir)) for path, h in pending]
+        if jobs == 1:
+            outcomes = [_optimize_file(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                outcomes = list(pool.map(_optimize_file, *zip(*args)))
+
+        for path, source_hash, entry in outcomes:
+            self.entries[self._key(source_hash)] = entry
+            results[path] = {'status': 'optimized', **entry}
+            if entry['output_hash'] != source_hash:
+                rewritten.append((path, source_hash))
+
+        self._save()
+        _carry_over_figure_cache(rewritten)
+        return results
+
+
+def _carry_over_figure_cache(rewritten: Sequence[Tuple[str, str]]):
+    """Keep figure-cache entries current for files rewritten from their rendered bytes."""
+    if not rewritten:
+        return
+    cache = FigureCache()
+    for path, source_hash in rewritten:
+        cache.rewritten(path, source_hash)
+    cache.save()
+
+
+def optimize_figures(paths: Sequence[str], jobs: int = 1, lossless: bool = False):
+    """Optimize paths and print one line per file plus the total saving."""
+    optimizer = PngOptimizer(colors=None if lossless else COLORS)
+    results = optimizer.optimize(paths, jobs=jobs)
+    total_in = total_out = 0
+    for path, result in results.items():
+        total_in += result['bytes_in']
+        total_out += result['bytes_out']
+        method = f" ({result['method']})" if 'method' in result else ''
+        print(f"  {result['status']:<10} {path}  {result['bytes_in']:,} -> "
+              f"{result['bytes_out']:,} bytes{method}")
+    if total_in:
+        print(f"  PNG total: {total_in:,} -> {total_out:,} bytes "
+              f"({(1 - total_out / total_in) * 100:.0f}% smaller)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Quantize and recompress figure PNGs.')
+    parser.add_argument('paths', nargs='*', default=['figures'],
+                        help='PNG files or directories (default: figures)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Worker processes; 0 = one per CPU core (default: 1)')
+    parser.add_argument('--lossless', action='store_true',
+                        help='Only recompress; do not quantize to a palette')
+    args = parser.parse_args()
+
+    paths = []
+    for arg in args.paths:
+        if Path(arg).is_dir():
+            paths.extend(str(f) for f in sorted(Path(arg).glob('*.png')))
+        else:
+            paths.append(arg)
+    optimize_figures(paths, jobs=args.jobs, lossless=args.lossless)
+
+
+if __name__ == '__main__':
+    main()
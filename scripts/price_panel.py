@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped region x item x month price panel.
+
+The Time-Cost and grocery-basket metrics are defined per good and per
+period, so they apply unchanged to item-level CPI microdata, only at a
+scale (hundreds of items, dozens of areas, decades of months) where a
+dict per good no longer fits. PricePanel keeps such data in one dense
+float array on disk, values.npy, with shape (regions, items, months) and
+NaN for missing observations, plus meta.json naming each axis. Opening a
+panel memory-maps the array; selections index the map, so only the
+slices a metric asks for are read from disk.
+
+Regions are the outer axis, so one region's items x months block (what
+the metrics consume) is contiguous. Months are YYYYMM integer codes, the
+same period axis series_store.SeriesStore uses.
+
+Panels are written once, either from long-format rows or from the BLS
+average-price series (APU + 4-character area + item code) in a
+SeriesStore:
+
+    panel = PricePanel.from_series_store(SeriesStore(), 'data/apu_panel')
+    panel = PricePanel.open('data/apu_panel')
+    milk = panel.index_panel('0000', items=['709112'], start=200001)
+    compute_time_cost(prices=milk, wage=monthly_wage)
+
+Usage:
+    python price_panel.py build data/apu_panel     # from the series store
+    python price_panel.py info data/apu_panel
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from atomic_write import write_atomic
+from index_series import IndexPanel, IndexSeries
+
+
+# On-disk layout; open() refuses panels written with another
+PANEL_VERSION = 1
+
+APU_PREFIX = 'APU'
+APU_AREA_LENGTH = 4
+
+# Items per block when reducing over a whole region
+BLOCK_ITEMS = 256
+
+
+def month_range(start: int, end: int) -> np.ndarray:
+    """Every YYYYMM month code from start to end inclusive."""
+    first = (start // 100) * 12 + start % 100 - 1
+    last = (end // 100) * 12 + end % 100 - 1
+    months = np.arange(first, last + 1)
+    return (months // 12) * 100 + months % 12 + 1
+
+
+class PricePanel:
+    """Prices on a (regions, items, months) memory-mapped array."""
+
+    def __init__(self, path: str, regions: Sequence[str], items: Sequence[str],
+                 months: Sequence[int], values: np.ndarray):
+        self.path = Path(path)
+        self.regions = list(regions)
+        self.items = list(items)
+        self.months = np.asarray(months, dtype=np.int64)
+        self.values = values
+        self._region_index = {r: i for i, r in enumerate(self.regions)}
+        self._item_index = {item: i for i, item in enumerate(self.items)}
+
+    # -------------------------------------------------------------------------
+    # Creating and opening
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def create(cls, path: str, regions: Sequence[str], items: Sequence[str],
+               months: Sequence[int], dtype: str = 'float64') -> 'PricePanel':
+        """Allocate an all-NaN panel on disk, opened for writing."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        shape = (len(regions), len(items), len(months))
+        values = np.lib.format.open_memmap(path / 'values.npy', mode='w+',
+                                           dtype=dtype, shape=shape)
+        values[:] = np.nan
+        meta = {'version': PANEL_VERSION, 'regions': list(regions), 'items': list(items),
+                'months': [int(m) for m in months]}
+        write_atomic(path / 'meta.json', json.dumps(meta))
+        return cls(path, regions, items, months, values)
+
+    @classmethod
+    def open(cls, path: str, writable: bool = False) -> 'PricePanel':
+        path = Path(path)
+        meta = json.loads((path / 'meta.json').read_text())
+        if meta.get('version') != PANEL_VERSION:
+            raise ValueError(f"{path}: panel version {meta.get('version')}, "
+                             f"expected {PANEL_VERSION}; rebuild it")
+        values = np.load(path / 'values.npy', mmap_mode='r+' if writable else 'r')
+        return cls(path, meta['regions'], meta['items'], meta['months'], values)
+
+    @classmethod
+    def from_rows(cls, path: str, rows: Iterable[Tuple[str, str, int, float]],
+                  dtype: str = 'float64', chunk_rows: int = 1_000_000) -> 'PricePanel':
+        """
+        Build a panel from long-format (region, item, month, price) rows.
+
+        rows must be re-iterable (a list, or an object whose __iter__
+        re-reads a file): the first pass collects the axes, the second
+        scatters values into the map chunk_rows at a time. A one-shot
+        iterator (e.g. a generator) raises TypeError rather than leaving
+        the second pass with nothing to scatter.
+        """
+        if iter(rows) is rows:
+            raise TypeError("rows is a one-shot iterator; pass a list or a re-iterable "
+                            "object (from_rows reads it twice)")
+        regions, items, months = set(), set(), set()
+        for region, item, month, _ in rows:
+            regions.add(region)
+            items.add(item)
+            months.add(int(month))
+        panel = cls.create(path, sorted(regions), sorted(items),
+                           month_range(min(months), max(months)), dtype)
+
+        batch: List[Tuple[str, str, int, float]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_rows:
+                panel._scatter(batch)
+                batch = []
+        panel._scatter(batch)
+        panel.values.flush()
+        return panel
+
+    def _scatter(self, rows: List[Tuple[str, str, int, float]]):
+        if not rows:
+            return
+        r = np.array([self._region_index[row[0]] for row in rows])
+        i = np.array([self._item_index[row[1]] for row in rows])
+        m = np.searchsorted(self.months, [int(row[2]) for row in rows])
+        self.values[r, i, m] = [row[3] for row in rows]
+
+    @classmethod
+    def from_series_store(cls, store, path: str, dtype: str = 'float64') -> 'PricePanel':
+        """Build a panel from every BLS average-price (APU) series in a SeriesStore."""
+        keys: Dict[str, Tuple[str, str]] = {}
+        for series_id in store.series_ids():
+            if series_id.startswith(APU_PREFIX):
+                code = series_id[len(APU_PREFIX):]
+                keys[series_id] = (code[:APU_AREA_LENGTH], code[APU_AREA_LENGTH:])
+        if not keys:
+            raise ValueError("store has no APU average-price series")
+
+        spans = [store.raw(sid)[0] for sid in keys]
+        months = month_range(min(int(s[0]) for s in spans), max(int(s[-1]) for s in spans))
+        panel = cls.create(path, sorted({a for a, _ in keys.values()}),
+                           sorted({i for _, i in keys.values()}), months, dtype)
+        for series_id, (area, item) in keys.items():
+            codes, values = store.raw(series_id)
+            panel.values[panel._region_index[area], panel._item_index[item],
+                         np.searchsorted(months, codes)] = values
+        panel.values.flush()
+        return panel
+
+    # -------------------------------------------------------------------------
+    # Selection
+    # -------------------------------------------------------------------------
+
+    def __repr__(self) -> str:
+        return (f"PricePanel({len(self.regions)} regions x {len(self.items)} items "
+                f"x {self.months.size} months)")
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.values.shape
+
+    def _month_slice(self, start: Optional[int], end: Optional[int]) -> slice:
+        lo = 0 if start is None else int(np.searchsorted(self.months, start))
+        hi = self.months.size if end is None else int(np.searchsorted(self.months, end, 'right'))
+        return slice(lo, hi)
+
+    def _item_positions(self, items: Optional[Sequence[str]]):
+        if items is None:
+            return slice(None)
+        return [self._item_index[item] for item in items]
+
+    def select(self, region: str, items: Optional[Sequence[str]] = None,
+               start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """
+        Items x months prices for one region, months from start to end
+        inclusive. Without items the result is a view into the map.
+        """
+        block = self.values[self._region_index[region]]
+        return block[self._item_positions(items), self._month_slice(start, end)]
+
+    def series(self, region: str, item: str, start: Optional[int] = None,
+               end: Optional[int] = None) -> IndexSeries:
+        """One item's observed months in one region."""
+        months = self._month_slice(start, end)
+        values = np.asarray(self.values[self._region_index[region],
+                                         self._item_index[item], months])
+        observed = ~np.isnan(values)
+        return IndexSeries(self.months[months][observed], values[observed], item)
+
+    def index_panel(self, region: str, items: Optional[Sequence[str]] = None,
+                    start: Optional[int] = None, end: Optional[int] = None,
+                    labels: Optional[Dict[str, str]] = None) -> IndexPanel:
+        """
+        Items x months IndexPanel for one region, for the compute_* functions.
+
+        labels optionally renames items (e.g. {'709112': 'Gallon of Milk'}).
+        Months where any selected item is missing are dropped.
+        """
+        names = self.items if items is None else list(items)
+        values = np.asarray(self.select(region, items, start, end))
+        complete = ~np.isnan(values).any(axis=0)
+        months = self.months[self._month_slice(start, end)]
+        return IndexPanel([(labels or {}).get(n, n) for n in names],
+                          months[complete], values[:, complete])
+
+    def iter_blocks(self, region: str, start: Optional[int] = None, end: Optional[int] = None,
+                    block_items: int = BLOCK_ITEMS) -> Iterator[Tuple[List[str], np.ndarray]]:
+        """Yield (items, items x months array) in blocks of block_items items."""
+        months = self._month_slice(start, end)
+        block = self.values[self._region_index[region]]
+        for lo in range(0, len(self.items), block_items):
+            hi = min(lo + block_items, len(self.items))
+            yield self.items[lo:hi], np.asarray(block[lo:hi, months])
+
+    def regional_mean(self, items: Optional[Sequence[str]] = None,
+                      start: Optional[int] = None, end: Optional[int] = None) -> IndexPanel:
+        """Items x months mean across regions, ignoring missing observations."""
+        months = self._month_slice(start, end)
+        positions = self._item_positions(items)
+        total = count = 0
+        for r in range(len(self.regions)):
+            block = np.asarray(self.values[r][positions, months])
+            observed = ~np.isnan(block)
+            total = total + np.where(observed, block, 0.0)
+            count = count + observed
+        with np.errstate(invalid='ignore'):
+            mean = total / count
+        return IndexPanel(self.items if items is None else list(items),
+                          self.months[months], mean)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or inspect a memory-mapped price panel.')
+    parser.add_argument('command', choices=['build', 'info'])
+    parser.add_argument('path', help='Panel directory')
+    parser.add_argument('--data-dir', default='data',
+                        help='Series store data directory for build (default: data)')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        from series_store import SeriesStore
+        panel = PricePanel.from_series_store(SeriesStore(args.data_dir), args.path)
+    else:
+        panel = PricePanel.open(args.path)
+
+    observed = 0
+    for region in panel.regions:
+        for _, block in panel.iter_blocks(region):
+            observed += int(np.count_nonzero(~np.isnan(block)))
+    print(f"{panel}: {observed} observations, months "
+          f"{panel.months[0]}-{panel.months[-1]}")
+
+
+if __name__ == '__main__':
+    main()
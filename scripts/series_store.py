@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Columnar local store for BLS and FRED series exports.
+
+The published figures use a handful of benchmark-year values typed into
+novel_metrics.py. To run the same metrics over full monthly histories,
+drop CSV exports into data/ and open a SeriesStore:
+
+    FRED  - a date column (DATE or observation_date) followed by one
+            column per series ID, '.' for missing values
+    BLS   - long format with series_id, year, period (M01-M12, Q01-Q04,
+            S01-S02, A01) and value columns, comma or tab separated
+            (the download.bls.gov flat files and data-finder CSVs);
+            annual averages (M13, S03, Q05, A01) are skipped
+
+The first open parses every CSV once and writes two columns to
+data/.series_store/: periods.npy (int32 YYYYMM month codes) and
+values.npy (float64), with every series stored as one contiguous slice,
+plus index.json recording each series' slice and the size, mtime and
+hash of each source file. Later opens memory-map the columns instead of
+parsing text; a source is re-hashed only when its size or mtime changed,
+and the store is rebuilt only when a CSV is added, removed or changed.
+
+Usage:
+    python series_store.py                      # build if needed, list series
+    python series_store.py show APU0000709112   # annual means of one series
+    python series_store.py --rebuild
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from atomic_write import write_atomic
+from index_series import IndexSeries
+
+
+# Columns and index.json written under another version are rebuilt
+CACHE_VERSION = 3
+
+DATA_DIR = 'data'
+CACHE_DIRNAME = '.series_store'
+
+FRED_DATE_COLUMNS = {'date', 'observation_date'}
+MISSING_VALUES = {'', '.', '-', 'NA', 'N/A', '(NA)'}
+
+Observations = Tuple[List[int], List[float]]
+
+
+# =============================================================================
+# CSV parsing (only on rebuild)
+# =============================================================================
+
+def _month_code(year: int, month: int) -> int:
+    return year * 100 + month
+
+
+def _bls_period_month(period: str) -> int:
+    """First month covered by a BLS period code, or 0 for annual averages."""
+    kind, number = period[0].upper(), int(period[1:])
+    # M13, Q05 and S03 are each frequency's annual average
+    if kind == 'M' and 1 <= number <= 12:
+        return number
+    if kind == 'Q' and 1 <= number <= 4:
+        return 3 * (number - 1) + 1
+    if kind == 'S' and 1 <= number <= 2:
+        return 6 * (number - 1) + 1
+    return 0
+
+
+def _value(text: str):
+    text = text.strip()
+    return None if text in MISSING_VALUES else float(text.replace(',', ''))
+
+
+def read_series_csv(path: Path) -> Dict[str, Observations]:
+    """Parse one FRED or BLS export into {series_id: (month codes, values)}."""
+    with open(path, newline='') as f:
+        sample = f.readline()
+        f.seek(0)
+        reader = csv.reader(f, delimiter='\t' if '\t' in sample else ',')
+        header = [h.strip().lower().replace(' ', '_') for h in next(reader)]
+        series: Dict[str, Observations] = {}
+
+        if header[0] in FRED_DATE_COLUMNS:
+            ids = [h.upper() for h in header[1:]]
+            for row in reader:
+                if not row or not row[0].strip():
+                    continue
+                year, month = int(row[0][:4]), int(row[0][5:7])
+                for sid, cell in zip(ids, row[1:]):
+                    value = _value(cell)
+                    if value is not None:
+                        codes, values = series.setdefault(sid, ([], []))
+                        codes.append(_month_code(year, month))
+                        values.append(value)
+        elif {'series_id', 'year', 'period', 'value'} <= set(header):
+            col = {name: header.index(name) for name in ('series_id', 'year', 'period', 'value')}
+            for row in reader:
+                if len(row) <= col['value']:
+                    continue
+                month = _bls_period_month(row[col['period']].strip())
+                value = _value(row[col['value']])
+                if month and value is not None:
+                    codes, values = series.setdefault(row[col['series_id']].strip(), ([], []))
+                    codes.append(_month_code(int(row[col['year']]), month))
+                    values.append(value)
+        else:
+            raise ValueError(f"{path}: unrecognised header {header}")
+    return series
+
+
+def _file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _hashes(sources: Dict[str, dict]) -> Dict[str, str]:
+    return {name: entry['sha256'] for name, entry in sources.items()}
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+class SeriesStore:
+    """Memory-mapped columns of every series in data_dir's CSV exports."""
+
+    def __init__(self, data_dir: str = DATA_DIR, rebuild: bool = False):
+        self.data_dir = Path(data_dir)
+        self.cache_dir = self.data_dir / CACHE_DIRNAME
+        index = self._read_index()
+        if index is not None and index.get('version') != CACHE_VERSION:
+            index = None
+        known = index['sources'] if index is not None else {}
+        sources = self._sources(known)
+        if rebuild or index is None or _hashes(known) != _hashes(sources):
+            index = self._build(sources)
+        elif known != sources:
+            # Touched but unchanged: record the new stats so they are not re-hashed
+            index['sources'] = sources
+            self._write_index(index)
+        self.index: Dict[str, Tuple[int, int]] = {
+            sid: tuple(span) for sid, span in index['series'].items()}
+        self.sources: Dict[str, dict] = index['sources']
+        if self.index:
+            self.periods = np.load(self.cache_dir / 'periods.npy', mmap_mode='r')
+            self.values = np.load(self.cache_dir / 'values.npy', mmap_mode='r')
+        else:
+            self.periods = np.empty(0, dtype=np.int32)
+            self.values = np.empty(0)
+
+    def _sources(self, known: Dict[str, dict]) -> Dict[str, dict]:
+        """{file name: size, mtime and hash}, hashing only files whose stat changed."""
+        files = sorted(self.data_dir.glob('*.csv')) + sorted(self.data_dir.glob('*.txt'))
+        sources = {}
+        for f in files:
+            st = f.stat()
+            entry = known.get(f.name)
+            if entry is None or (entry['size'], entry['mtime_ns']) != (st.st_size, st.st_mtime_ns):
+                entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': _file_hash(f)}
+            sources[f.name] = entry
+        return sources
+
+    def _read_index(self):
+        try:
+            return json.loads((self.cache_dir / 'index.json').read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_index(self, index: dict):
+        write_atomic(self.cache_dir / 'index.json', json.dumps(index, indent=1))
+
+    def _build(self, sources: Dict[str, dict]) -> dict:
+        """Parse every source CSV and write the columns and index."""
+        parsed: Dict[str, Observations] = {}
+        for name in sources:
+            for sid, obs in read_series_csv(self.data_dir / name).items():
+                if sid in parsed:
+                    print(f"Warning: {sid} appears in several files; using {name}")
+                parsed[sid] = obs
+
+        spans, period_parts, value_parts, offset = {}, [], [], 0
+        for sid in sorted(parsed):
+            codes = np.asarray(parsed[sid][0], dtype=np.int32)
+            values = np.asarray(parsed[sid][1], dtype=np.float64)
+            # Sort by period, keeping the last value given for a repeated period
+            order = np.argsort(codes, kind='stable')
+            codes, values = codes[order], values[order]
+            keep = np.append(codes[1:] != codes[:-1], True)
+            codes, values = codes[keep], values[keep]
+            spans[sid] = [offset, offset + codes.size]
+            period_parts.append(codes)
+            value_parts.append(values)
+            offset += codes.size
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        index = {'version': CACHE_VERSION, 'sources': sources, 'series': spans}
+        if spans:
+            np.save(self.cache_dir / 'periods.npy', np.concatenate(period_parts))
+            np.save(self.cache_dir / 'values.npy', np.concatenate(value_parts))
+        self._write_index(index)
+        print(f"Built series store: {len(spans)} series, {offset} observations "
+              f"from {len(sources)} files")
+        return index
+
+    def __contains__(self, series_id: str) -> bool:
+        return series_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def series_ids(self) -> List[str]:
+        return sorted(self.index)
+
+    def raw(self, series_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(YYYYMM month codes, values) of one series as read-only memmap views."""
+        try:
+            start, stop = self.index[series_id]
+        except KeyError:
+            raise KeyError(f"{series_id} not in {self.data_dir}/ exports") from None
+        return self.periods[start:stop], self.values[start:stop]
+
+    def monthly(self, series_id: str, name: str = '', fill: bool = False) -> IndexSeries:
+        """
+        Series on YYYYMM month codes.
+
+        With fill=True, lower-frequency series (quarterly wages, semiannual
+        prices) are carried forward to every month up to the last observation.
+        """
+        codes, values = self.raw(series_id)
+        if fill and codes.size:
+            ordinals = (codes // 100) * 12 + codes % 100 - 1
+            months = np.arange(ordinals[0], ordinals[-1] + 1)
+            latest = np.searchsorted(ordinals, months, side='right') - 1
+            codes = (months // 12) * 100 + months % 12 + 1
+            values = values[latest]
+        return IndexSeries(codes, values, name or series_id)
+
+    def annual(self, series_id: str, how: str = 'mean', name: str = '') -> IndexSeries:
+        """
+        One value per calendar year: the 'mean' of the year's observations,
+        or its 'first' or 'last' observation.
+        """
+        codes, values = self.raw(series_id)
+        years, starts = np.unique(codes // 100, return_index=True)
+        if how == 'mean':
+            counts = np.diff(np.append(starts, codes.size))
+            annual = np.add.reduceat(values, starts) / counts if codes.size else values
+        elif how == 'first':
+            annual = values[starts]
+        elif how == 'last':
+            annual = values[np.append(starts[1:], codes.size) - 1]
+        else:
+            raise ValueError(f"Unknown annual aggregation: {how}")
+        return IndexSeries(years, annual, name or series_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and inspect the local series store.')
+    parser.add_argument('command', nargs='?', default='list', choices=['list', 'show'])
+    parser.add_argument('series_id', nargs='?', help='Series to show')
+    parser.add_argument('--data-dir', default=DATA_DIR,
+                        help=f'Directory of CSV exports (default: {DATA_DIR})')
+    parser.add_argument('--rebuild', action='store_true', help='Re-parse every CSV')
+    args = parser.parse_args()
+
+    store = SeriesStore(args.data_dir, rebuild=args.rebuild)
+
+    if args.command == 'show':
+        if not args.series_id:
+            parser.error('show needs a series ID')
+        for year, value in store.annual(args.series_id).to_dict().items():
+            print(f"{year}  {value:12.3f}")
+        return
+
+    print(f"{len(store)} series from {len(store.sources)} files in {args.data_dir}/")
+    for sid in store.series_ids():
+        codes, _ = store.raw(sid)
+        print(f"  {sid:<20} {codes[0]}-{codes[-1]}  {codes.size:6d} obs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Time-Cost index across the wage distribution.
+
+compute_time_cost() divides each good's price by the median wage. The
+same ratio for every wage group (wage percentiles, occupations,
+occupation x region cells) is one broadcast division:
+
+    minutes[good, group, period] = 60 * price[good, period] / wage[group, period]
+
+TimeCostCube holds that goods x groups x periods array and answers the
+summary views the paper needs (median across groups, the P10/P90 spread,
+a basket's cost per group, change between two years) through reduce(),
+spread(), basket() and change(). Each caches its result, so repeated
+views of a large cube are computed once; cached arrays are read-only, so
+copy one before editing it.
+
+Wage groups come as an IndexPanel of hourly wages (groups x periods),
+e.g. percentile or occupation series from the series store. Prices are
+either one national goods x periods panel or a PricePanel (regions x
+items x months), in which case each regional or occupation x region
+group is priced at its own region's prices (build(regions=...)).
+percentile_wages() stands in when no wage distribution data is at hand,
+but its output is illustrative only: every group is a fixed multiple of
+the median wage, so each group's slice is the median slice rescaled and
+spread() is the same constant ratio for every good and period. Only a
+panel of observed group wages makes the cross-group views say anything
+about the wage distribution.
+
+Usage:
+    cube = TimeCostCube.build(wages=wages)       # goods x observed wage groups
+    cube = TimeCostCube.build(PricePanel.open('data/apu_panel'), wages,
+                              regions={'Northeast': '0100', 'South': '0300'})
+    cube.reduce('median', axis='groups')         # goods x periods
+    cube.basket(GROCERY_BASKET)                  # groups x periods
+"""
+
+from functools import partial
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from index_series import IndexPanel, IndexSeries, align_periods
+from novel_metrics import goods_prices, wage_series
+from price_panel import PricePanel
+
+
+# Hourly wage at selected percentiles relative to the median (CPS usual
+# weekly earnings of full-time wage and salary workers, 2024 annual
+# averages, rounded), held fixed over time by percentile_wages()
+PERCENTILE_RATIOS = {
+    'P10': 0.58,
+    'P25': 0.76,
+    'P50': 1.00,
+    'P75': 1.46,
+    'P90': 2.15,
+}
+
+# PricePanel region (BLS average-price area code) for groups with no region
+NATIONAL_AREA = '0000'
+
+AXES = ('goods', 'groups', 'periods')
+
+REDUCERS = {
+    'mean': np.nanmean,
+    'median': np.nanmedian,
+    'min': np.nanmin,
+    'max': np.nanmax,
+}
+
+
+def percentile_wages(median: IndexSeries = wage_series,
+                     ratios: Dict[str, float] = PERCENTILE_RATIOS) -> IndexPanel:
+    """
+    Illustrative wage groups x periods panel: the median wage times fixed
+    ratios. Cross-group comparisons on it only restate the ratios.
+    """
+    values = np.outer(list(ratios.values()), median.values)
+    return IndexPanel(list(ratios), median.periods, values)
+
+
+class TimeCostCube:
+    """Minutes of work per unit of each good for each wage group and period."""
+
+    def __init__(self, goods: Sequence[str], groups: Sequence[str], periods,
+                 values: np.ndarray):
+        self.goods = list(goods)
+        self.groups = list(groups)
+        self.periods = np.asarray(periods)
+        self.values = np.asarray(values, dtype=float)
+        if self.values.shape != (len(self.goods), len(self.groups), self.periods.size):
+            raise ValueError(f"values shape {self.values.shape} does not match axes")
+        self._cache: Dict[Tuple, object] = {}
+
+    @classmethod
+    def build(cls, prices: Union[IndexPanel, PricePanel] = goods_prices,
+              wages: Optional[IndexPanel] = None, scale: float = 60.0,
+              regions: Optional[Dict[str, str]] = None,
+              items: Optional[Sequence[str]] = None) -> 'TimeCostCube':
+        """
+        Cube of prices over wages (groups x periods); wages defaults to the
+        illustrative percentile_wages().
+
+        prices is either one goods x periods panel, which every group is
+        priced at, or a PricePanel of regions x items x months. With a
+        PricePanel each group is priced at its own region's prices:
+        regions maps group labels to panel regions, and groups it leaves
+        out (e.g. national wage percentiles) use NATIONAL_AREA. items
+        selects the panel's items (default: all of them).
+        """
+        wages = percentile_wages() if wages is None else wages
+        if isinstance(prices, IndexPanel):
+            periods, ip, iw = align_periods(prices.periods, wages.periods)
+            values = scale * prices.values[:, None, ip] / wages.values[None, :, iw]
+            return cls(prices.labels, wages.labels, periods, values)
+
+        regions = regions or {}
+        periods, ip, iw = align_periods(prices.months, wages.periods)
+        goods = prices.items if items is None else list(items)
+        values = np.empty((len(goods), len(wages.labels), periods.size))
+        blocks: Dict[str, np.ndarray] = {}
+        for g, label in enumerate(wages.labels):
+            region = regions.get(label, NATIONAL_AREA)
+            if region not in blocks:
+                blocks[region] = np.asarray(prices.select(region, items))[:, ip]
+            values[:, g] = scale * blocks[region] / wages.values[g, iw]
+        return cls(goods, wages.labels, periods, values)
+
+    def __repr__(self) -> str:
+        return (f"TimeCostCube({len(self.goods)} goods x {len(self.groups)} groups "
+                f"x {self.periods.size} periods)")
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.values.shape
+
+    def _cached(self, key: Tuple, compute):
+        if key not in self._cache:
+            result = compute()
+            # Shared by every later call, so callers must not edit it in place
+            array = result.values if isinstance(result, IndexPanel) else result
+            array.flags.writeable = False
+            self._cache[key] = result
+        return self._cache[key]
+
+    def _column(self, period) -> int:
+        i = int(np.searchsorted(self.periods, period))
+        if i >= self.periods.size or self.periods[i] != period:
+            raise KeyError(period)
+        return i
+
+    def group(self, label: str) -> IndexPanel:
+        """Goods x periods time cost for one wage group."""
+        return IndexPanel(self.goods, self.periods, self.values[:, self.groups.index(label)])
+
+    def reduce(self, how: str = 'median', axis: str = 'groups',
+               q: Optional[float] = None) -> np.ndarray:
+        """
+        Reduce over one axis ('goods', 'groups' or 'periods') with 'mean',
+        'median', 'min', 'max', or 'percentile' at q. Results are cached.
+        """
+        if axis not in AXES:
+            raise ValueError(f"axis must be one of {AXES}")
+        if how == 'percentile':
+            if q is None:
+                raise ValueError("percentile reduction needs q")
+            compute = partial(np.nanpercentile, self.values, q, axis=AXES.index(axis))
+        elif how in REDUCERS:
+            compute = partial(REDUCERS[how], self.values, axis=AXES.index(axis))
+        else:
+            raise ValueError(f"Unknown reduction: {how}")
+        return self._cached(('reduce', how, axis, q), compute)
+
+    def spread(self, low: str = 'P10', high: str = 'P90') -> IndexPanel:
+        """Goods x periods ratio of the low group's time cost to the high group's."""
+        def compute():
+            ratio = self.values[:, self.groups.index(low)] / self.values[:, self.groups.index(high)]
+            return IndexPanel(self.goods, self.periods, ratio)
+        return self._cached(('spread', low, high), compute)
+
+    def basket(self, basket: Dict[str, float]) -> IndexPanel:
+        """Groups x periods minutes of work for a basket of {good: quantity}."""
+        def compute():
+            quantities = np.array([basket.get(good, 0) for good in self.goods], dtype=float)
+            minutes = np.tensordot(quantities, self.values, axes=(0, 0))
+            return IndexPanel(self.groups, self.periods, minutes)
+        return self._cached(('basket', tuple(sorted(basket.items()))), compute)
+
+    def change(self, start, end, pct: bool = True) -> np.ndarray:
+        """Goods x groups change in time cost from period start to end."""
+        def compute():
+            i, j = (self._column(p) for p in (start, end))
+            rel = self.values[:, :, j] / self.values[:, :, i] - 1.0
+            return rel * 100.0 if pct else rel
+        return self._cached(('change', start, end, pct), compute)